@@ -0,0 +1,249 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# board_canvas.py: includes class BoardCanvas                                                                          #
+# -------------------------------------------------------------------------------------------------------------------- #
+from tkinter import Canvas
+
+
+class BoardCanvas(Canvas):
+    """
+    Inherits from parent class Canvas and draws the 2D chess board as canvas items
+    The squares, the file and rank indexes and one image item per screenshot entry are created once, afterwards the
+    items are only moved, re-coloured and given a new image when the position changes
+    Highlights (square colours) and arrows are drawn as canvas items, too
+
+    ...
+
+    Attributes:
+    -----------
+        images (dict[str, PhotoImage]):
+            images for each piece name of the screenshots (checked kings as 'kw_checked'/'kb_checked')
+
+        square_size (int):
+            size of each square in pixels
+
+        __squares (list[list[int]]):
+            rectangle item of each square
+
+        __piece_items (list[int]):
+            image item of each screenshot entry
+
+        __shown (list[tuple | None]):
+            (image name, row, col) shown by each image item
+
+        __highlighted (list[tuple[int, int]]):
+            squares that are currently highlighted
+
+    Methods:
+    --------
+        show_position(self, screenshot: list[dict], check: str | None) -> None:
+            shows the position of a screenshot on the board
+
+        highlight(self, squares: tuple, colours: tuple) -> None:
+            colours the given squares
+
+        clear_highlights(self) -> None:
+            sets the highlighted squares back to their original colours
+
+        show_arrow(self, src: tuple, dest: tuple) -> None:
+            draws an arrow from src square to dest square
+
+        clear_arrows(self) -> None:
+            removes all arrows from the board
+
+        square_colour(row: int, col: int) -> str:
+            returns the original colour of a square
+
+        __centre(self, row: int, col: int) -> tuple[int, int]:
+            returns the pixel co-ordinates of the centre of a square
+    """
+
+    # original colours of the squares
+    LIGHT = "#EEEED2"
+    DARK = "#47473C"
+
+    def __init__(self, master, images: dict, files: list, ranks: list, square_size: int = 74):
+        """
+        Initializes the canvas and creates the board items
+
+        ...
+
+        Parameters:
+        -----------
+            master (Frame):
+                master of the canvas
+
+            images (dict[str, PhotoImage]):
+                images for each piece name of the screenshots
+
+            files (list[str]):
+                list with the columns of the chess board
+
+            ranks (list[str]):
+                list with the rows of the chess board
+
+            square_size (int) default=74:
+                size of each square in pixels (60 pixels for the image and 7+7 for the padding)
+        """
+        # initialization of parent class (Canvas)
+        super().__init__(master=master, width=8 * square_size, height=8 * square_size, highlightthickness=0, bd=0)
+        self.images = images
+        self.square_size = square_size
+
+        # squares and file/rank indexes --------------------------------------------------------------------------------
+        self.__squares = []
+        for row in range(8):
+            self.__squares.append([])
+            for col in range(8):
+                self.__squares[row].append(self.create_rectangle(col * square_size, row * square_size,
+                                                                 (col + 1) * square_size, (row + 1) * square_size,
+                                                                 fill=self.square_colour(row, col), width=0,
+                                                                 tags="square"))
+        for num in range(8):
+            # rank at the top right corner of the squares of the last column
+            self.create_text(8 * square_size - 3, num * square_size + 1, anchor="ne", text=ranks[7 - num],
+                             font=("consolas", 10, "bold"), tags="index",
+                             fill=self.LIGHT if self.square_colour(num, 7) == self.DARK else self.DARK)
+            # file at the bottom left corner of the squares of the last row
+            self.create_text(num * square_size + 3, 8 * square_size - 1, anchor="sw", text=files[num],
+                             font=("consolas", 10, "bold"), tags="index",
+                             fill=self.LIGHT if self.square_colour(7, num) == self.DARK else self.DARK)
+
+        # piece items (created hidden, one for each screenshot entry) --------------------------------------------------
+        self.__piece_items = [self.create_image(0, 0, state="hidden", tags="piece") for _ in range(64)]
+        self.__shown = [None] * 64
+        # file and rank indexes stay on top of the pieces
+        self.tag_raise("index")
+
+        self.__highlighted = []
+
+    def show_position(self, screenshot: list, check: str | None) -> None:
+        """
+        Shows the position of a screenshot on the board
+        Only the items of the pieces that moved, got captured or changed (promotion, check) get updated
+
+        ...
+
+        Parameters:
+        -----------
+            screenshot (list[dict]):
+                list with the name, row and column of each piece (from GameLoader.screenshots_per_round)
+
+            check (str | None):
+                king being checked in this round ("w"/"b" or None)
+        """
+        for i, piece in enumerate(screenshot):
+            image_name = piece["name"]
+            if image_name[0] == "k" and image_name[1] == check:
+                image_name += "_checked"
+            state = (image_name, piece["row"], piece["col"])
+            previous = self.__shown[i]
+            if previous == state:
+                continue
+
+            item = self.__piece_items[i]
+            if image_name == "  ":
+                # empty square, the item is hidden
+                if previous is None or previous[0] != "  ":
+                    self.itemconfig(item, state="hidden")
+            else:
+                if previous is None or previous[0] != image_name:
+                    self.itemconfig(item, image=self.images[image_name], state="normal")
+                # hidden items are not moved, so they get their co-ordinates when shown again
+                if previous is None or previous[0] == "  " or previous[1:] != state[1:]:
+                    self.coords(item, *self.__centre(piece["row"], piece["col"]))
+            self.__shown[i] = state
+
+        # arrows stay on top of the pieces
+        self.tag_raise("arrow")
+
+    def highlight(self, squares: tuple, colours: tuple) -> None:
+        """
+        Colours the given squares
+
+        ...
+
+        Parameters:
+        -----------
+            squares (tuple[tuple[int, int]]):
+                (row, col) of each square
+
+            colours (tuple[str]):
+                colour of each square
+        """
+        for (row, col), colour in zip(squares, colours):
+            self.itemconfig(self.__squares[row][col], fill=colour)
+            self.__highlighted.append((row, col))
+
+    def clear_highlights(self) -> None:
+        """
+        Sets the highlighted squares back to their original colours
+        """
+        for row, col in self.__highlighted:
+            self.itemconfig(self.__squares[row][col], fill=self.square_colour(row, col))
+        self.__highlighted.clear()
+
+    def show_arrow(self, src: tuple, dest: tuple) -> None:
+        """
+        Draws an arrow from src square to dest square
+
+        ...
+
+        Parameters:
+        -----------
+            src (tuple[int, int]):
+                (row, col) of the source square
+
+            dest (tuple[int, int]):
+                (row, col) of the destination square
+        """
+        self.create_line(*self.__centre(*src), *self.__centre(*dest), arrow="last", width=6, arrowshape=(16, 20, 6),
+                         fill="#9B30FF", capstyle="round", tags="arrow")
+
+    def clear_arrows(self) -> None:
+        """
+        Removes all arrows from the board
+        """
+        self.delete("arrow")
+
+    @staticmethod
+    def square_colour(row: int, col: int) -> str:
+        """
+        Returns the original colour of a square
+
+        ...
+
+        Parameters:
+        -----------
+            row (int):
+                row (0~7) of the square
+
+            col (int):
+                column (0~7) of the square
+
+        Returns:
+        --------
+            (str):
+                colour of the square
+        """
+        return BoardCanvas.LIGHT if (row + col) % 2 == 0 else BoardCanvas.DARK
+
+    def __centre(self, row: int, col: int) -> tuple[int, int]:
+        """
+        Returns the pixel co-ordinates of the centre of a square
+
+        ...
+
+        Parameters:
+        -----------
+            row (int):
+                row (0~7) of the square
+
+            col (int):
+                column (0~7) of the square
+
+        Returns:
+        --------
+            (tuple[int, int]):
+                x and y co-ordinates
+        """
+        return col * self.square_size + self.square_size // 2, row * self.square_size + self.square_size // 2
@@ -0,0 +1,439 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# board_export.py: includes class BoardExporter (headless export of positions as PNG diagrams and animated GIFs)       #
+# -------------------------------------------------------------------------------------------------------------------- #
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from importlib.util import find_spec
+from os import makedirs
+from os.path import join, splitext, basename
+from pygame import Surface, Rect, font, image, draw
+from pgn import FilePGN
+from game_loader import GameLoader
+from board_canvas import BoardCanvas
+from image_registry import ImageRegistry
+from my_exceptions import NoMovesFound, FalseGame, FriendlyCapture
+
+
+class BoardExporter:
+    """
+    Renders the positions of a game into images without any Tk window
+    The board is composited with pygame from the piece icons (same colours, traces and indexes as the board of the GUI
+    window) and saved as one PNG diagram per ply, or as an animated GIF of the whole game (GIFs need Pillow)
+    Whole pgn files can be exported in batch, one game per task of a process pool
+
+    ...
+
+    Attributes:
+    -----------
+        ICON_PATH (str):
+            path of the piece icons (formatted with the piece name)
+
+        TRACE_COLOURS (tuple[str]):
+            colours of the destination and source squares of the last move
+
+        GIF_ERROR (str):
+            message of the ImportError raised when animated GIFs are exported without Pillow
+
+        worker_exporter (BoardExporter | None):
+            exporter of a worker process of export_file (set by init_worker, so the icons and the font are loaded once
+            per process)
+
+        square_size (int):
+            size of each square in pixels
+
+        show_traces (bool):
+            True if the squares of the last move are highlighted
+
+        __icons (dict[str, Surface]):
+            icon of each piece name of the screenshots (checked kings as 'kw_checked'/'kb_checked')
+
+        __font (Font):
+            font of the file and rank indexes
+
+    Methods:
+    --------
+        render(self, game_loader: GameLoader, ply: int) -> Surface:
+            returns the image of the position of a round
+
+        save_position(self, game_loader: GameLoader, ply: int, path: str) -> None:
+            saves the image of the position of a round as PNG
+
+        export_plies(self, game_loader: GameLoader, directory: str) -> list[str]:
+            saves one PNG diagram per round of a game
+
+        export_gif(self, game_loader: GameLoader, path: str, frame_ms: int = 800) -> None:
+            saves an animated GIF of a game
+
+        @staticmethod
+        gif_supported() -> bool:
+            returns True if animated GIFs can be exported
+
+        @staticmethod
+        init_worker() -> None:
+            prepares a worker process of export_file
+
+        @staticmethod
+        load_game(list_of_moves: list) -> tuple[GameLoader, Exception | None]:
+            replays a game as far as possible
+
+        @staticmethod
+        export_game(list_of_moves: list, path: str, gif: bool = False) -> str | None:
+            exports one game (task of the process pool)
+
+        @staticmethod
+        export_file(file_path: str, directory: str, gif: bool = False, workers: int | None = None) -> dict[int, str]:
+            exports every game of a pgn file across a process pool
+    """
+
+    # path of the piece icons (formatted with the piece name)
+    ICON_PATH = "icons\\piece_icons\\{}.png"
+
+    # colours of the destination and source squares of the last move (same as the GUI window)
+    TRACE_COLOURS = ("#A020F0", "#EE82EE")
+
+    # message of the ImportError raised when animated GIFs are exported without Pillow
+    GIF_ERROR = "Pillow is needed to export animated GIFs (pip install pillow)"
+
+    # exporter of a worker process of export_file (set by init_worker)
+    worker_exporter = None
+
+    def __init__(self, square_size: int = 74, show_traces: bool = True):
+        """
+        Initializes the exporter and loads the piece icons
+
+        ...
+
+        Parameters:
+        -----------
+            square_size (int) default=74:
+                size of each square in pixels
+
+            show_traces (bool) default=True:
+                if True, the squares of the last move are highlighted
+        """
+        self.square_size = square_size
+        self.show_traces = show_traces
+
+        self.__icons = {}
+        for name in ImageRegistry.PIECE_NAMES:
+            self.__icons[name] = image.load(self.ICON_PATH.format(name))
+
+        font.init()
+        self.__font = font.Font(None, max(12, square_size // 4))
+
+    def render(self, game_loader: GameLoader, ply: int) -> Surface:
+        """
+        Returns the image of the position of a round (the round of the game loader is not changed)
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                replayed game
+
+            ply (int):
+                round to render (0 ~ plies_loaded)
+
+        Returns:
+        --------
+            (Surface):
+                image of the board
+        """
+        size = self.square_size
+        surface = Surface((8 * size, 8 * size))
+
+        # squares (with the traces of the move that led to this round)
+        colours = {}
+        if self.show_traces and ply > 0:
+            colours = dict(zip(game_loader.background_tracers[ply + 1], self.TRACE_COLOURS))
+        for row in range(8):
+            for col in range(8):
+                colour = colours.get((row, col), BoardCanvas.square_colour(row, col))
+                draw.rect(surface, colour, Rect(col * size, row * size, size, size))
+
+        # pieces
+        check = game_loader.check_per_round[ply]
+        for piece in game_loader.screenshots_per_round[ply]:
+            name = piece["name"]
+            if name == "  ":
+                continue
+            if name[0] == "k" and name[1] == check:
+                name += "_checked"
+            icon = self.__icons[name]
+            surface.blit(icon, icon.get_rect(center=(piece["col"] * size + size // 2, piece["row"] * size + size // 2)))
+
+        # file and rank indexes
+        for num in range(8):
+            rank = self.__font.render(game_loader.ranks[7 - num], True, self.__index_colour(num, 7))
+            surface.blit(rank, rank.get_rect(topright=(8 * size - 3, num * size + 1)))
+            file = self.__font.render(game_loader.files[num], True, self.__index_colour(7, num))
+            surface.blit(file, file.get_rect(bottomleft=(num * size + 3, 8 * size - 1)))
+
+        return surface
+
+    def save_position(self, game_loader: GameLoader, ply: int, path: str) -> None:
+        """
+        Saves the image of the position of a round as PNG
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                replayed game
+
+            ply (int):
+                round to render
+
+            path (str):
+                path of the PNG file
+        """
+        image.save(self.render(game_loader, ply), path)
+
+    def export_plies(self, game_loader: GameLoader, directory: str) -> list[str]:
+        """
+        Saves one PNG diagram per replayed round of a game (ply_000.png is the starting position)
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                replayed game
+
+            directory (str):
+                directory of the diagrams (created if it does not exist)
+
+        Returns:
+        --------
+            (list[str]):
+                paths of the saved diagrams
+        """
+        makedirs(directory, exist_ok=True)
+        paths = []
+        for ply in range(game_loader.plies_loaded + 1):
+            path = join(directory, f"ply_{ply:03}.png")
+            self.save_position(game_loader, ply, path)
+            paths.append(path)
+        return paths
+
+    def export_gif(self, game_loader: GameLoader, path: str, frame_ms: int = 800) -> None:
+        """
+        Saves an animated GIF of the replayed rounds of a game (the final position is shown three times longer)
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                replayed game
+
+            path (str):
+                path of the GIF file
+
+            frame_ms (int) default=800:
+                time each position is shown in milliseconds
+
+        Raises:
+        -------
+            ImportError (Exception):
+                Pillow is not installed
+        """
+        try:
+            from PIL import Image
+        except ImportError:
+            raise ImportError(self.GIF_ERROR)
+
+        frames = []
+        for ply in range(game_loader.plies_loaded + 1):
+            surface = self.render(game_loader, ply)
+            frames.append(Image.frombytes("RGB", surface.get_size(), image.tobytes(surface, "RGB")))
+        durations = [frame_ms] * (len(frames) - 1) + [3 * frame_ms]
+        frames[0].save(path, save_all=True, append_images=frames[1:], duration=durations, loop=0)
+
+    @staticmethod
+    def gif_supported() -> bool:
+        """
+        Returns True if animated GIFs can be exported (Pillow is installed)
+
+        ...
+
+        Returns:
+        --------
+            (bool):
+                True if Pillow is installed
+        """
+        return find_spec("PIL") is not None
+
+    @staticmethod
+    def init_worker() -> None:
+        """
+        Prepares a worker process of export_file: the exporter (piece icons and font) is created once and used for
+        every game of the process
+        """
+        BoardExporter.worker_exporter = BoardExporter()
+
+    @staticmethod
+    def load_game(list_of_moves: list) -> tuple[GameLoader, Exception | None]:
+        """
+        Replays a game as far as possible (games with a false move are exported up to that move)
+
+        ...
+
+        Parameters:
+        -----------
+            list_of_moves (list):
+                list with the moves of the game
+
+        Returns:
+        --------
+            (tuple[GameLoader, Exception | None]):
+                replayed game and the exception raised by the replay (None if the whole game was replayed)
+
+        Raises:
+        -------
+            NoMovesFound (Exception):
+                the game has no moves
+        """
+        game_loader = GameLoader(list_of_moves, lazy=True)
+        try:
+            game_loader.load_plies(game_loader.moves_length)
+        except (FalseGame, FriendlyCapture) as v:
+            return game_loader, v
+        return game_loader, None
+
+    @staticmethod
+    def export_game(list_of_moves: list, path: str, gif: bool = False) -> str | None:
+        """
+        Exports one game, as PNG diagrams in the directory 'path' or as an animated GIF at 'path' (task of the process
+        pool)
+
+        ...
+
+        Parameters:
+        -----------
+            list_of_moves (list):
+                list with the moves of the game
+
+            path (str):
+                output directory of the diagrams or path of the GIF file
+
+            gif (bool) default=False:
+                if True, an animated GIF is saved instead of the PNG diagrams
+
+        Returns:
+        --------
+            (str | None):
+                error message if the game could not be (fully) exported, else None
+        """
+        try:
+            game_loader, error = BoardExporter.load_game(list_of_moves)
+        except NoMovesFound as v:
+            return str(v)
+
+        # the exporter of the worker process, if any (a single game is exported by a new one)
+        exporter = BoardExporter.worker_exporter or BoardExporter()
+        if gif:
+            exporter.export_gif(game_loader, path)
+        else:
+            exporter.export_plies(game_loader, path)
+        return None if error is None else str(error)
+
+    @staticmethod
+    def export_file(file_path: str, directory: str, gif: bool = False, workers: int | None = None) -> dict[int, str]:
+        """
+        Exports every game of a pgn file, to 'game_00001/ply_000.png'... or 'game_00001.gif' etc.
+        The file is parsed once and the games are rendered in parallel by a process pool (only the moves of each game
+        are sent to the processes, each process loads the piece icons and the font once)
+        GIF export checks for Pillow before any game is exported
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of the pgn file
+
+            directory (str):
+                output directory (created if it does not exist)
+
+            gif (bool) default=False:
+                if True, an animated GIF is saved per game instead of the PNG diagrams
+
+            workers (int | None) default=None:
+                number of processes (None for the number of processors)
+
+        Returns:
+        --------
+            (dict[int, str]):
+                error message of each game that could not be (fully) exported, by position in the file (0, 1, 2 etc.)
+
+        Raises:
+        -------
+            ImportError (Exception):
+                'gif' is True and Pillow is not installed
+        """
+        if gif and not BoardExporter.gif_supported():
+            raise ImportError(BoardExporter.GIF_ERROR)
+
+        makedirs(directory, exist_ok=True)
+        pgn_file = FilePGN(file_path)
+        moves = [pgn_file.get_info(game_no)["moves"] for game_no in pgn_file.index_of_games]
+        paths = [join(directory, f"game_{i + 1:05}" + (".gif" if gif else "")) for i in range(len(moves))]
+
+        errors = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=BoardExporter.init_worker) as executor:
+            results = executor.map(BoardExporter.export_game, moves, paths, [gif] * len(moves), chunksize=8)
+            for i, error in enumerate(results):
+                if error is not None:
+                    errors[i] = error
+        return errors
+
+    def __index_colour(self, row: int, col: int) -> str:
+        """
+        Returns the colour of an index drawn on a square (the colour of the other squares)
+
+        ...
+
+        Parameters:
+        -----------
+            row (int):
+                row (0~7) of the square
+
+            col (int):
+                column (0~7) of the square
+
+        Returns:
+        --------
+            (str):
+                colour of the index
+        """
+        return BoardCanvas.LIGHT if BoardCanvas.square_colour(row, col) == BoardCanvas.DARK else BoardCanvas.DARK
+
+
+if __name__ == "__main__":
+    # command line: python board_export.py FILE.pgn OUTPUT_DIR [--game N] [--gif] [--workers N]
+    parser = ArgumentParser(description="Exports the games of a pgn file as PNG diagrams or animated GIFs")
+    parser.add_argument("file", help="pgn file")
+    parser.add_argument("directory", nargs="?", help="output directory (default: name of the pgn file)")
+    parser.add_argument("--game", type=int, help="export only this game (1, 2, 3 etc.)")
+    parser.add_argument("--gif", action="store_true", help="export animated GIFs instead of PNG diagrams")
+    parser.add_argument("--workers", type=int, help="number of processes")
+    args = parser.parse_args()
+
+    if args.gif and not BoardExporter.gif_supported():
+        parser.error(BoardExporter.GIF_ERROR)
+
+    output = args.directory or splitext(basename(args.file))[0]
+    if args.game is not None:
+        makedirs(output, exist_ok=True)
+        pgn = FilePGN(args.file)
+        game_moves = pgn.get_info(pgn.index_of_games[args.game - 1])["moves"]
+        game_path = join(output, f"game_{args.game:05}" + (".gif" if args.gif else ""))
+        message = BoardExporter.export_game(game_moves, game_path, args.gif)
+        failed = {} if message is None else {args.game - 1: message}
+    else:
+        failed = BoardExporter.export_file(args.file, output, args.gif, args.workers)
+    for number, message in sorted(failed.items()):
+        print(f"game {number + 1}: {message}")
@@ -1,7 +1,8 @@
 # -------------------------------------------------------------------------------------------------------------------- #
 # captured_pieces.py: includes class CapturedPieces                                                                    #
 # -------------------------------------------------------------------------------------------------------------------- #
-from tkinter import Frame, Label, PhotoImage
+from tkinter import Frame, Label
+from image_registry import ImageRegistry
 
 
 class CapturedPieces:
@@ -16,8 +17,8 @@ class CapturedPieces:
         *_array (list):
             array for each white/black captured pieces
 
-        *_index (int):
-            index for arrays
+        *_shown (list[str]):
+            text of the value label and image name of each piece label currently shown in each array
 
         *_pawns_frame (Frame):
             frames for each array
@@ -36,6 +37,9 @@ class CapturedPieces:
 
     Methods:
     --------
+        goto(self, ply: int) -> None:
+            shows the captured pieces of any round
+
         forward_captured_piece_frames(self) -> None:
             continues to next move
 
@@ -46,10 +50,10 @@ class CapturedPieces:
             restarts the frames to first round
 
         reset(self) -> None:
-            resets the two lists before each next/previous move
+            resets the two lists to blank labels
 
-        update_item(self, call_sign: str, diff: int) -> None:
-            updates the 'call_sign' piece on the boards based on their difference
+        update_array(self, array: list, shown: list, wanted: list) -> None:
+            reconfigures the labels of an array that differ from the wanted contents
 
         arrays_init(self) -> None:
             processes and fills the arrays with labels
@@ -85,9 +89,9 @@ class CapturedPieces:
         # call signs list for each piece (placed by priority)
         self.call_signs = ('q', 'r', 'n', 'b', 'p')
 
-        # indexes for lists
-        self.w_index: int = 1
-        self.b_index: int = 1
+        # contents currently shown in each array (value label text followed by the image name of each piece label)
+        self.white_shown = [f"{'':4}"] + ["blank"] * 15
+        self.black_shown = [f"{'':4}"] + ["blank"] * 15
 
         # frame initialization -----------------------------------------------------------------------------------------
         self.white_pawns_frame = Frame(master=master, bg="orange", bd=3, relief="raised")
@@ -98,102 +102,105 @@ class CapturedPieces:
         self.black_array = []
         self.arrays_init()
 
-    def forward_captured_piece_frames(self) -> None:
+    def goto(self, ply: int) -> None:
         """
-        Continues to next move
+        Shows the captured pieces of round 'ply'
+        Only the labels whose contents differ from the previous round get reconfigured (none on non-capturing moves)
+
+        ...
+
+        Parameters:
+        -----------
+            ply (int):
+                round (half move) to show
         """
-        self.round += 1
-        self.reset()
-        for call_sign in self.call_signs:
-            # pieces get updated by priority
-            self.update_item(call_sign, self.captured_list[self.round][call_sign])
+        self.round = ply
+        captured = self.captured_list[self.round]
 
-        adv = self.captured_list[self.round]['advantage']
-        # values label update
+        # value labels
+        adv = captured['advantage']
         if adv > 0:
-            self.white_array[0].config(text=f"-{adv:<3}")
-            self.black_array[0].config(text=f"+{adv:<3}")
-            return
-        if adv < 0:
-            adv *= (-1)
-            self.white_array[0].config(text=f"+{adv:<3}")
-            self.black_array[0].config(text=f"-{adv:<3}")
-            return
+            white_wanted = [f"-{adv:<3}"]
+            black_wanted = [f"+{adv:<3}"]
+        elif adv < 0:
+            white_wanted = [f"+{-adv:<3}"]
+            black_wanted = [f"-{-adv:<3}"]
+        else:
+            white_wanted = [f"{'':4}"]
+            black_wanted = [f"{'':4}"]
+
+        # pieces by priority (positive difference for captured white pieces, negative for black)
+        for call_sign in self.call_signs:
+            diff = captured[call_sign]
+            if diff > 0:
+                white_wanted += [call_sign] * diff
+            elif diff < 0:
+                black_wanted += [call_sign] * (-diff)
+        # remaining labels are blank
+        white_wanted += ["blank"] * (16 - len(white_wanted))
+        black_wanted += ["blank"] * (16 - len(black_wanted))
+
+        self.update_array(self.white_array, self.white_shown, white_wanted)
+        self.update_array(self.black_array, self.black_shown, black_wanted)
+
+    def forward_captured_piece_frames(self) -> None:
+        """
+        Continues to next move
+        """
+        self.goto(self.round + 1)
 
     def backwards_captured_piece_frames(self) -> None:
         """
         Goes one move back
         """
-        self.round -= 2
-        self.forward_captured_piece_frames()
+        self.goto(self.round - 1)
 
     def restart_captured_piece_frames(self) -> None:
         """
         Restarts the frames to first round
         """
-        self.round = -1
-        self.forward_captured_piece_frames()
+        self.goto(0)
 
     def reset(self) -> None:
         """
-        Resets the two lists before each next/previous move
+        Resets the two lists to blank labels
         """
-        # indexes reset
-        self.w_index = 1
-        self.b_index = 1
-        self.white_array[0].config(text=f"{'':4}")
-        self.black_array[0].config(text=f"{'':4}")
-        # lists reset
-        for i in range(1, 16):
-            self.white_array[i].config(image=self.images["blank"])
-            self.black_array[i].config(image=self.images["blank"])
+        self.update_array(self.white_array, self.white_shown, [f"{'':4}"] + ["blank"] * 15)
+        self.update_array(self.black_array, self.black_shown, [f"{'':4}"] + ["blank"] * 15)
 
-    def update_item(self, call_sign: str, diff: int) -> None:
+    def update_array(self, array: list, shown: list, wanted: list) -> None:
         """
-        Updates the 'call_sign' piece on the boards based on their difference
-        (call signs are initialized in the self.call_signs tuple)
+        Reconfigures the labels of an array whose contents differ from the wanted contents
 
         ...
 
         Parameters:
         ----------
-            call_sign (str):
-                the first letter of each piece ('q', 'b' etc.)
-
-            diff (int):
-                the difference in pieces (positive number if more captured white pieces, negative for black)
-        """
-        # white piece got captured
-        if diff > 0:
-            # adding the current list index
-            diff += self.w_index
-            # adding the right amount of pieces captured
-            for i in range(self.w_index, diff):
-                self.white_array[i].config(image=self.images[call_sign])
-            # index gets updated for following pieces
-            self.w_index = diff
-            return
-
-        # black piece got captured
-        if diff < 0:
-            # multiplied by (-1) to become a positive entity
-            diff *= -1
-            # adding the current list index
-            diff += self.b_index
-            # adding the right amount of pieces captured
-            for i in range(self.b_index, diff):
-                self.black_array[i].config(image=self.images[call_sign])
-            # index gets updated for following pieces
-            self.b_index = diff
-            return
+            array (list[Label]):
+                value label followed by the 15 piece labels
+
+            shown (list[str]):
+                contents currently shown (value label text followed by the image name of each piece label)
+
+            wanted (list[str]):
+                contents to show (same format as 'shown')
+        """
+        if shown[0] != wanted[0]:
+            array[0].config(text=wanted[0])
+            shown[0] = wanted[0]
+        # more than 15 captured pieces cannot be shown
+        for i in range(1, 16):
+            if shown[i] != wanted[i]:
+                array[i].config(image=self.images[wanted[i]])
+                shown[i] = wanted[i]
 
     def arrays_init(self) -> None:
         """
         Method that processes and fills the arrays with labels
         """
         # appending one label for showing difference in piece (arithmetic value)
-        self.white_array.append(Label(master=self.white_pawns_frame, bg="orange", font="consolas"))
-        self.black_array.append(Label(master=self.black_pawns_frame, bg="orange", font="consolas"))
+        self.white_array.append(Label(master=self.white_pawns_frame, bg="orange", font="consolas", text=f"{'':4}"))
+        self.black_array.append(Label(master=self.black_pawns_frame, bg="orange", font="consolas", text=f"{'':4}"))
         self.white_array[0].grid(row=0, column=0)
         self.black_array[0].grid(row=0, column=0)
         for _ in range(1, 16):
@@ -205,7 +212,7 @@ class CapturedPieces:
     @staticmethod
     def image_dictionary_init(master) -> dict:
         """
-        Static method that returns the images dictionary
+        Static method that returns the images dictionary (from the process-wide image registry)
 
         ...
 
@@ -219,9 +226,5 @@ class CapturedPieces:
             (dict):
                 dictionary with the PhotoImages of pieces
         """
-        return {"p": PhotoImage(master=master, file="icons\\basic\\pawn.png"),
-                "n": PhotoImage(master=master, file="icons\\basic\\knight.png"),
-                "b": PhotoImage(master=master, file="icons\\basic\\bishop.png"),
-                "r": PhotoImage(master=master, file="icons\\basic\\rook.png"),
-                "q": PhotoImage(master=master, file="icons\\basic\\queen.png"),
-                "blank": PhotoImage(master=master, file="icons\\basic\\blank.png")}
+        # the images are decoded once by the image registry and shared by every window
+        return ImageRegistry.captured_piece_images(master)
@@ -0,0 +1,360 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# duplicate_finder.py: includes class DuplicateFinder                                                                  #
+# -------------------------------------------------------------------------------------------------------------------- #
+from argparse import ArgumentParser
+from collections.abc import Iterator
+from hashlib import blake2b
+from os import walk
+from os.path import join, relpath
+from re import compile as compile_regex
+from pgn import FilePGN, PGNBlocks
+
+
+class DuplicateFinder:
+    """
+    Finds the games that appear more than once in a set of pgn files and writes a pgn file without them
+    Every game is normalised (the tag values of the seven tag roster are compared without case, punctuation spacing and
+    unknown values, the moves without move numbers, comments, variations, annotations and result) and hashed into a
+    64-bit digest of its tags and moves and another one of its moves only:
+        - exact duplicates have the same tags and moves
+        - near duplicates have the same moves and different tags (e.g. the same game with the players written
+          differently), only games with at least min_plies moves are compared this way, shorter games (forfeits, quick
+          draws) share their moves too often
+    The files are read in one streaming pass and only the digests of the unique games are kept (along with the place of
+    the first game of each one in its file), so the memory grows with the number of unique games, not with the size of
+    the files
+    The deduplicated file is written with the original text of the kept games, copied from their files
+
+    ...
+
+    Attributes:
+    -----------
+        ROSTER (tuple[str]):
+            tags compared
+
+        min_plies (int):
+            minimum number of moves of the games compared as near duplicates
+
+        files (list[str]):
+            addresses of the files scanned so far
+
+        games (int):
+            number of games scanned
+
+        unique (dict[int, tuple[int, int, int, int]]):
+            location (file, game number, start and end byte) of the first game of each tags and moves digest
+
+        moves (dict[int, int]):
+            tags and moves digest of the first game of each moves digest
+
+        near (set[int]):
+            tags and moves digests of the unique games that are near duplicates of an earlier game
+
+    Methods:
+    --------
+        @staticmethod
+        read_games(file_path: str) -> Iterator[tuple[int, int, str, str]]:
+            yields the byte range, information and moves of the games of a pgn file
+
+        @staticmethod
+        normalise_tags(header: str) -> str:
+            returns the normalised values of the tags of a game
+
+        @staticmethod
+        normalise_moves(game_moves: str) -> list[str]:
+            returns the normalised moves of a game
+
+        @staticmethod
+        digest(text: str) -> int:
+            returns the 64-bit digest of a text
+
+        scan(self, file_paths: list[str]) -> Iterator[tuple[str, tuple, tuple]]:
+            scans pgn files and yields every duplicate found
+
+        write(self, output_path: str, near: bool = False) -> int:
+            writes the unique games into a pgn file
+
+        describe(self, location: tuple[int, int, int, int]) -> str:
+            returns the file and number of a game
+    """
+
+    # tags compared (the seven tag roster)
+    ROSTER = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+    # parts of the movetext that are not moves (comments, NAGs, move numbers and results)
+    __COMMENT = compile_regex(r"\{[^}]*}|;[^\n]*")
+    __VARIATION = compile_regex(r"\([^()]*\)")
+    __NOT_MOVES = compile_regex(r"\$\d+|\d+\.(\.\.)?|1-0|0-1|1/2-1/2|\*")
+    # spaces after punctuation and repeated spaces in the tag values ('Karpov,A.' and 'Karpov, A.' are the same)
+    __SPACES = compile_regex(r"(?<=[,.])\s+|\s+(?=[,.])")
+
+    def __init__(self, min_plies: int = 10):
+        """
+        Initializes the finder (no file has been scanned yet)
+
+        ...
+
+        Parameters:
+        -----------
+            min_plies (int) default=10:
+                minimum number of moves of the games compared as near duplicates
+        """
+        self.min_plies = min_plies
+        self.files = []
+        self.games = 0
+        self.unique = {}
+        self.moves = {}
+        self.near = set()
+
+    @staticmethod
+    def read_games(file_path: str) -> Iterator[tuple[int, int, str, str]]:
+        """
+        Yields the games of a pgn file one by one while the file is read, split into blocks like FilePGN.read_blocks
+        (the file is read in binary mode and each block decoded like PGNBlocks, so files with another encoding are
+        read, too)
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of a pgn file
+
+        Yields:
+        -------
+            (tuple[int, int, str, str]):
+                start and end byte of the game in the file, information and moves of the game
+        """
+        with open(file_path, "rb") as pgn:
+            position = 0
+            block = []
+            block_start = 0
+            header = None
+            game_start = 0
+            for line in pgn:
+                if line in (b"\n", b"\r\n"):
+                    if block:
+                        # end of a block, the information and the moves of the games come in turn
+                        text = PGNBlocks.decode(b"".join(block))
+                        if header is None:
+                            header, game_start = text, block_start
+                        else:
+                            yield game_start, position, header, text
+                            header = None
+                        block = []
+                else:
+                    if not block:
+                        block_start = position
+                    block.append(line)
+                position += len(line)
+
+            # if the file doesn't end on an empty line, the final moves are yielded
+            if block and header is not None:
+                yield game_start, position, header, PGNBlocks.decode(b"".join(block))
+
+    @staticmethod
+    def normalise_tags(header: str) -> str:
+        """
+        Returns the values of the seven tag roster of a game in a form that does not depend on how they were written
+        (case, spaces around punctuation, '?' or missing for unknown values)
+
+        ...
+
+        Parameters:
+        -----------
+            header (str):
+                information of a game as read from the pgn file
+
+        Returns:
+        --------
+            (str):
+                normalised tag values, one per line
+        """
+        tags = FilePGN.parse_tags(header)
+        values = []
+        for tag in DuplicateFinder.ROSTER:
+            value = " ".join(DuplicateFinder.__SPACES.sub("", tags.get(tag, "")).split()).casefold()
+            values.append("" if set(value) <= {"?", "."} or value == "[no info]" else value)
+        return "\n".join(values)
+
+    @staticmethod
+    def normalise_moves(game_moves: str) -> list[str]:
+        """
+        Returns the moves of a game without move numbers, comments, variations, NAGs, annotations ('!', '?', '+',
+        '#') and result, so that the same game written differently gives the same list
+
+        ...
+
+        Parameters:
+        -----------
+            game_moves (str):
+                moves of a game as read from the pgn file
+
+        Returns:
+        --------
+            (list[str]):
+                moves of the game
+        """
+        text = DuplicateFinder.__COMMENT.sub(" ", game_moves)
+        # nested variations are removed from the innermost out
+        while "(" in text:
+            text, removed = DuplicateFinder.__VARIATION.subn(" ", text)
+            if not removed:
+                break
+        text = DuplicateFinder.__NOT_MOVES.sub(" ", text)
+        return [move for move in (item.rstrip("!?+#") for item in text.split()) if move]
+
+    @staticmethod
+    def digest(text: str) -> int:
+        """
+        Returns the 64-bit digest of a text
+
+        ...
+
+        Parameters:
+        -----------
+            text (str):
+                text to hash
+
+        Returns:
+        --------
+            (int):
+                digest of the text
+        """
+        return int.from_bytes(blake2b(text.encode(), digest_size=8).digest(), "big")
+
+    def scan(self, file_paths: list) -> Iterator[tuple[str, tuple, tuple]]:
+        """
+        Scans pgn files (in one streaming pass) and yields every duplicate game found, the games of the files scanned
+        before are taken into account, too
+
+        ...
+
+        Parameters:
+        -----------
+            file_paths (list[str]):
+                addresses of the pgn files
+
+        Yields:
+        -------
+            (tuple[str, tuple[int, int, int, int], tuple[int, int, int, int]]):
+                'exact' or 'near', location of the duplicate and of the first game found with the same moves (see
+                describe)
+
+        Raises:
+        -------
+            OSError (Exception):
+                a file could not be read
+        """
+        for file_path in file_paths:
+            file_index = len(self.files)
+            self.files.append(file_path)
+            for number, (start, end, header, game_moves) in enumerate(self.read_games(file_path)):
+                self.games += 1
+                location = (file_index, number, start, end)
+                moves = " ".join(self.normalise_moves(game_moves))
+                game_key = self.digest(self.normalise_tags(header) + "\n" + moves)
+
+                original = self.unique.get(game_key)
+                if original is not None:
+                    yield "exact", location, original
+                    continue
+                self.unique[game_key] = location
+
+                if moves.count(" ") + 1 < self.min_plies:
+                    continue
+                moves_key = self.digest(moves)
+                first = self.moves.get(moves_key)
+                if first is None:
+                    self.moves[moves_key] = game_key
+                else:
+                    self.near.add(game_key)
+                    yield "near", location, self.unique[first]
+
+    def write(self, output_path: str, near: bool = False) -> int:
+        """
+        Writes the unique games into a pgn file, in the order they were found (the original text of each game is
+        copied from its file)
+
+        ...
+
+        Parameters:
+        -----------
+            output_path (str):
+                address of the new pgn file
+
+            near (bool) default=False:
+                if True, the near duplicates are left out, too
+
+        Returns:
+        --------
+            (int):
+                number of games written
+
+        Raises:
+        -------
+            OSError (Exception):
+                a file could not be read or written
+        """
+        written = 0
+        files = {}
+        try:
+            with open(output_path, "wb") as output:
+                for game_key, (file_index, _, start, end) in self.unique.items():
+                    if near and game_key in self.near:
+                        continue
+                    source = files.get(file_index)
+                    if source is None:
+                        source = files[file_index] = open(self.files[file_index], "rb")
+                    source.seek(start)
+                    output.write(source.read(end - start).rstrip(b"\r\n") + b"\n\n")
+                    written += 1
+        finally:
+            for source in files.values():
+                source.close()
+        return written
+
+    def describe(self, location: tuple) -> str:
+        """
+        Returns the file and number of a game (e.g. 'Karpov (3500+).pgn #12')
+
+        ...
+
+        Parameters:
+        -----------
+            location (tuple[int, int, int, int]):
+                index of the file, number of the game in the file (from 0), start and end byte of the game
+
+        Returns:
+        --------
+            (str):
+                file and number of the game (from 1)
+        """
+        return f"{self.files[location[0]]} #{location[1] + 1}"
+
+
+if __name__ == "__main__":
+    # command line: python duplicate_finder.py [DIRECTORY] [--output FILE] [--near] [--quiet]
+    parser = ArgumentParser(description="Finds the duplicate games of the pgn files of a directory")
+    parser.add_argument("directory", nargs="?", default="pgn_files", help="directory with the pgn files")
+    parser.add_argument("--output", help="pgn file to write the unique games into")
+    parser.add_argument("--near", action="store_true", help="leave out the near duplicates from the output, too")
+    parser.add_argument("--quiet", action="store_true", help="only show the totals")
+    args = parser.parse_args()
+
+    library_files = []
+    for folder, _, file_names in walk(args.directory):
+        for file_name in sorted(file_names):
+            if file_name[-4:].lower() == ".pgn":
+                library_files.append(join(folder, file_name))
+
+    finder = DuplicateFinder()
+    found = {"exact": 0, "near": 0}
+    for kind, duplicate, first_game in finder.scan(library_files):
+        found[kind] += 1
+        if not args.quiet:
+            print(f"{kind:6}{relpath(finder.describe(duplicate), args.directory)} = "
+                  f"{relpath(finder.describe(first_game), args.directory)}")
+    print(f'{finder.games} games, {found["exact"]} exact duplicates, {found["near"]} near duplicates')
+    if args.output:
+        print(f"{finder.write(args.output, near=args.near)} games written to {args.output}")
@@ -0,0 +1,383 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# file_loader.py: includes classes CancelToken, FileLoader and BackgroundTask                                          #
+# -------------------------------------------------------------------------------------------------------------------- #
+from queue import Queue, Empty
+from threading import Thread, Event
+from pgn import PGNBlocks
+from my_exceptions import PossibleCorruptFile
+
+
+class CancelToken:
+    """
+    Thread-safe flag that tells a worker to stop its work
+
+    ...
+
+    Attributes:
+    -----------
+        __event (Event):
+            set when the work gets cancelled
+
+    Methods:
+    --------
+        cancel(self) -> None:
+            cancels the work
+
+        @property
+        cancelled(self) -> bool:
+            True if the work has been cancelled
+    """
+    def __init__(self):
+        """
+        Initializes the (not cancelled) token
+        """
+        self.__event = Event()
+
+    def cancel(self) -> None:
+        """
+        Cancels the work
+        """
+        self.__event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        """
+        True if the work has been cancelled
+        """
+        return self.__event.is_set()
+
+
+class FileLoader:
+    """
+    Reads a pgn file in a worker thread and streams its games to the Tk thread in batches
+    The worker puts the blocks read by PGNBlocks.read_blocks (binary mode, so files that are not valid in the preferred
+    encoding are read, too) into a thread-safe queue, which is polled on the Tk thread through after(), so the
+    callbacks are always called on the Tk thread
+    The worker checks its CancelToken before every block, so a cancelled file stops being read at once
+    An optional header function is applied to the information of every game in the worker, too (e.g. to compute the
+    search tokens of the games), its results are sent along with each batch
+
+    ...
+
+    Attributes:
+    -----------
+        BATCH_SIZE (int):
+            number of games sent to the Tk thread at once
+
+        POLL_MS (int):
+            time between two polls of the queue in milliseconds
+
+        master (Misc):
+            widget used to poll the queue
+
+        file_path (str):
+            address of the pgn file
+
+        on_batch (Callable[[list[str], list | None], None]):
+            called with the blocks of each batch (information and moves of the games, in turn) and the results of the
+            header function for each game of the batch (None if there is no header function)
+
+        on_done (Callable[[], None] | None):
+            called when the whole file has been read
+
+        on_error (Callable[[Exception], None] | None):
+            called with the exception if the file could not be read
+
+        header_function (Callable[[str], Any] | None):
+            function applied to the information of every game in the worker thread
+
+        token (CancelToken):
+            cancellation token of the worker
+
+        __queue (Queue):
+            messages of the worker: ("batch", (blocks, results)), ("done", None) or ("error", exception)
+
+        __poll_id (str | None):
+            id of the scheduled poll
+
+    Methods:
+    --------
+        start(self) -> None:
+            starts the worker and the polling of the queue
+
+        cancel(self) -> None:
+            stops the worker and the polling, no more callbacks are called
+
+        __read(self) -> None:
+            reads the file (worker thread)
+
+        __poll(self) -> None:
+            passes the messages of the worker to the callbacks (Tk thread)
+    """
+
+    # number of games sent to the Tk thread at once
+    BATCH_SIZE = 500
+
+    # time between two polls of the queue in milliseconds
+    POLL_MS = 50
+
+    def __init__(self, master, file_path: str, on_batch, on_done=None, on_error=None, header_function=None):
+        """
+        Initializes the loader (the file is not read before start is called)
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                widget used to poll the queue
+
+            file_path (str):
+                address of the pgn file
+
+            on_batch (Callable[[list[str], list | None], None]):
+                called with the blocks of each batch and the results of the header function
+
+            on_done (Callable[[], None] | None) default=None:
+                called when the whole file has been read
+
+            on_error (Callable[[Exception], None] | None) default=None:
+                called with the exception if the file could not be read
+
+            header_function (Callable[[str], Any] | None) default=None:
+                function applied to the information of every game in the worker thread
+        """
+        self.master = master
+        self.file_path = file_path
+        self.on_batch = on_batch
+        self.on_done = on_done
+        self.on_error = on_error
+        self.header_function = header_function
+
+        self.token = CancelToken()
+        self.__queue = Queue()
+        self.__poll_id = None
+
+    def start(self) -> None:
+        """
+        Starts the worker and the polling of the queue
+        """
+        Thread(target=self.__read, daemon=True).start()
+        self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
+
+    def cancel(self) -> None:
+        """
+        Stops the worker (before its next block) and the polling, no more callbacks are called
+        """
+        self.token.cancel()
+        if self.__poll_id is not None:
+            self.master.after_cancel(self.__poll_id)
+            self.__poll_id = None
+
+    def __read(self) -> None:
+        """
+        Reads the file and puts its blocks in the queue in batches (runs in the worker thread)
+        """
+        batch = []
+        results = None if self.header_function is None else []
+        count = 0
+        try:
+            for block in PGNBlocks.read_blocks(self.file_path):
+                if self.token.cancelled:
+                    return
+                # blocks with even count are the information of the games
+                if results is not None and count % 2 == 0:
+                    results.append(self.header_function(block))
+                batch.append(block)
+                count += 1
+                # information and moves of BATCH_SIZE games
+                if len(batch) == 2 * self.BATCH_SIZE:
+                    self.__queue.put(("batch", (batch, results)))
+                    batch = []
+                    results = None if results is None else []
+        except (OSError, ValueError) as e:
+            # file could not be read
+            self.__queue.put(("error", e))
+            return
+
+        if batch:
+            self.__queue.put(("batch", (batch, results)))
+        if count % 2 != 0:
+            # some error occurred while reading the file
+            self.__queue.put(("error", PossibleCorruptFile('Length of list should be even number, not ' + str(count))))
+        else:
+            self.__queue.put(("done", None))
+
+    def __poll(self) -> None:
+        """
+        Passes the messages of the worker to the callbacks and polls again until the file has been read (runs in the Tk
+        thread)
+        """
+        self.__poll_id = None
+        while not self.token.cancelled:
+            try:
+                message, data = self.__queue.get_nowait()
+            except Empty:
+                break
+            if message == "batch":
+                self.on_batch(*data)
+            elif message == "done":
+                if self.on_done is not None:
+                    self.on_done()
+                return
+            else:
+                if self.on_error is not None:
+                    self.on_error(data)
+                return
+
+        if not self.token.cancelled:
+            self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
+
+
+class BackgroundTask:
+    """
+    Runs a function in a worker thread and passes its result to the Tk thread (polled through after()), e.g. to load
+    the index of a pgn file without blocking the window
+
+    ...
+
+    Attributes:
+    -----------
+        POLL_MS (int):
+            time between two polls of the result in milliseconds
+
+        master (Misc):
+            widget used to poll the result
+
+        function (Callable[[], Any]):
+            function called in the worker thread
+
+        on_done (Callable[[Any], None]):
+            called with the result of the function
+
+        on_error (Callable[[Exception], None] | None):
+            called with the exception if the function raised one
+
+        on_progress (Callable[..., None] | None):
+            called with the arguments of every report of the function
+
+        token (CancelToken):
+            cancellation token of the task (the function may check it to stop early)
+
+        __queue (Queue):
+            messages of the worker: ("progress", arguments), then ("done", result) or ("error", exception)
+
+        __poll_id (str | None):
+            id of the scheduled poll
+
+    Methods:
+    --------
+        start(self) -> None:
+            starts the worker and the polling of the result
+
+        cancel(self) -> None:
+            stops the polling, the result is dropped
+
+        report(self, *args) -> None:
+            passes the progress of the function to on_progress (worker thread)
+
+        __run(self) -> None:
+            calls the function (worker thread)
+
+        __poll(self) -> None:
+            passes the progress and the result of the worker to the callbacks (Tk thread)
+    """
+
+    # time between two polls of the result in milliseconds
+    POLL_MS = 50
+
+    def __init__(self, master, function, on_done, on_error=None, on_progress=None):
+        """
+        Initializes the task (the function is not called before start is called)
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                widget used to poll the result
+
+            function (Callable[[], Any]):
+                function called in the worker thread
+
+            on_done (Callable[[Any], None]):
+                called with the result of the function
+
+            on_error (Callable[[Exception], None] | None) default=None:
+                called with the exception if the function raised one
+
+            on_progress (Callable[..., None] | None) default=None:
+                called with the arguments of every report of the function
+        """
+        self.master = master
+        self.function = function
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+
+        self.token = CancelToken()
+        self.__queue = Queue()
+        self.__poll_id = None
+
+    def start(self) -> None:
+        """
+        Starts the worker and the polling of the result
+        """
+        Thread(target=self.__run, daemon=True).start()
+        self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
+
+    def cancel(self) -> None:
+        """
+        Stops the polling, the result of the function is dropped (the function runs to its end, unless it checks the
+        token)
+        """
+        self.token.cancel()
+        if self.__poll_id is not None:
+            self.master.after_cancel(self.__poll_id)
+            self.__poll_id = None
+
+    def report(self, *args) -> None:
+        """
+        Passes the progress of the function to on_progress on the Tk thread (called by the function in the worker
+        thread)
+
+        ...
+
+        Parameters:
+        -----------
+            *args:
+                arguments of on_progress
+        """
+        self.__queue.put(("progress", args))
+
+    def __run(self) -> None:
+        """
+        Calls the function and puts its result in the queue (runs in the worker thread)
+        """
+        try:
+            self.__queue.put(("done", self.function()))
+        except Exception as e:
+            # any exception is passed to on_error, so the caller is never left waiting for a result
+            self.__queue.put(("error", e))
+
+    def __poll(self) -> None:
+        """
+        Passes the progress and the result of the worker to the callbacks, or polls again (runs in the Tk thread)
+        """
+        self.__poll_id = None
+        while not self.token.cancelled:
+            try:
+                message, data = self.__queue.get_nowait()
+            except Empty:
+                self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
+                return
+            if message == "progress":
+                if self.on_progress is not None:
+                    self.on_progress(*data)
+            elif message == "done":
+                self.on_done(data)
+                return
+            else:
+                if self.on_error is not None:
+                    self.on_error(data)
+                return
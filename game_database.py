@@ -0,0 +1,620 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# game_database.py: includes classes GameDatabase and DatabaseGames                                                    #
+# -------------------------------------------------------------------------------------------------------------------- #
+from argparse import ArgumentParser
+from json import dumps, loads
+from os import makedirs, stat, walk
+from os.path import join, relpath
+from shlex import split
+from sqlite3 import connect
+from threading import local, RLock
+from zlib import compress, decompress
+from pgn import FilePGN, PGNBlocks
+
+
+class GameDatabase:
+    """
+    SQLite store of the games of the library, so that games are found by player, date, event, result and ECO code
+    through indexes instead of parsing the pgn files
+    Three tables are kept: files (path, size and modification time of every imported pgn file), games (the header tags
+    of every game, the most used ones in indexed columns and all of them as JSON) and moves (the processed moves of
+    every game as a compressed blob)
+    The files are imported in batches, each one inside a single transaction, and a file is imported again only when
+    its size or modification time changes
+    Every thread gets its own connection, so the database can be read by the Tk thread and written by a worker
+
+    ...
+
+    Attributes:
+    -----------
+        BATCH_SIZE (int):
+            number of games inserted in each transaction
+
+        FIELDS (dict[str, str]):
+            column of each field of a query ('player' matches White or Black)
+
+        path (str):
+            path of the database file
+
+        lock (RLock):
+            held while the library is updated (files imported or dropped, positions indexed), so that only one thread
+            updates it at a time
+
+        __local (local):
+            connection of each thread
+
+    Methods:
+    --------
+        @property
+        connection(self) -> Connection:
+            returns the connection of the current thread
+
+        import_file(self, name: str, file_path: str) -> int:
+            imports (or imports again) the games of a pgn file
+
+        sync(self, files: dict[str, str]) -> list[str]:
+            imports the new and changed files and drops the removed ones
+
+        query(self, **criteria) -> list[int]:
+            returns the ids of the games matching every criterion
+
+        @staticmethod
+        parse_query(text: str) -> dict[str, str]:
+            returns the criteria of a query typed as 'field:value' words
+
+        get_header(self, game_id: int) -> dict:
+            returns the header information of a game
+
+        headers(self, game_ids: list[int]) -> list[dict]:
+            returns the header information of many games
+
+        get_info(self, game_id: int) -> dict:
+            returns the information and the moves of a game
+
+        close(self) -> None:
+            closes the connection of the current thread
+
+        __insert_games(self, file_id: int, blocks: list[str], number: int) -> int:
+            inserts a batch of games inside one transaction
+
+        __create_tables(self) -> None:
+            creates the tables and the indexes
+    """
+
+    # number of games inserted in each transaction
+    BATCH_SIZE = 1000
+
+    # column of each field of a query (players, event, site, ECO code, date and file are matched by prefix)
+    FIELDS = {"white": "white", "black": "black", "player": "", "event": "event", "site": "site", "result": "result",
+              "eco": "eco", "year": "year", "date": "date", "file": "path"}
+
+    def __init__(self, directory: str = "library_cache", file_name: str = "games.sqlite"):
+        """
+        Opens the database (created with its tables if it does not exist)
+
+        ...
+
+        Parameters:
+        -----------
+            directory (str) default="library_cache":
+                directory of the database file (created if it does not exist)
+
+            file_name (str) default="games.sqlite":
+                name of the database file
+        """
+        makedirs(directory, exist_ok=True)
+        self.path = join(directory, file_name)
+        self.__local = local()
+        self.lock = RLock()
+        self.__create_tables()
+
+    @property
+    def connection(self):
+        """
+        Returns the connection of the current thread (opened on first use)
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is None:
+            connection = connect(self.path)
+            # write-ahead log: readers are not blocked while a file is being imported
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            connection.execute("PRAGMA foreign_keys=ON")
+            self.__local.connection = connection
+        return connection
+
+    def import_file(self, name: str, file_path: str) -> int:
+        """
+        Imports the games of a pgn file, the games imported before from the same file are replaced
+        The file is read block by block and the games are inserted in batches, each batch inside one transaction
+        (the file is read in binary mode, so files that are not valid in the preferred encoding are imported, too)
+        The lock is held during the import
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                name of the file in the database (e.g. path relative to the library directory)
+
+            file_path (str):
+                address of the pgn file
+
+        Returns:
+        --------
+            (int):
+                number of imported games
+
+        Raises:
+        -------
+            OSError (Exception):
+                the file could not be read
+
+            ValueError (Exception):
+                the file could not be decoded
+        """
+        with self.lock:
+            info = stat(file_path)
+            connection = self.connection
+            with connection:
+                # the games of the file are dropped along with the old row (on delete cascade)
+                connection.execute("DELETE FROM files WHERE path = ?", (name,))
+                # the size and modification time are recorded once the whole file is imported
+                file_id = connection.execute("INSERT INTO files (path, games) VALUES (?, 0)", (name,)).lastrowid
+
+            blocks = []
+            number = 0
+            try:
+                for block in PGNBlocks.read_blocks(file_path):
+                    blocks.append(block)
+                    if len(blocks) == 2 * self.BATCH_SIZE:
+                        number = self.__insert_games(file_id, blocks, number)
+                        blocks = []
+                # a file with an odd count of blocks ends on an incomplete game, which is skipped (as by FilePGN)
+                number = self.__insert_games(file_id, blocks, number)
+            except (OSError, ValueError):
+                # the games imported before the error are dropped, no half imported file is kept
+                with connection:
+                    connection.execute("DELETE FROM files WHERE id = ?", (file_id,))
+                raise
+
+            with connection:
+                connection.execute("UPDATE files SET size = ?, mtime = ?, games = ? WHERE id = ?",
+                                   (info.st_size, info.st_mtime, number, file_id))
+            return number
+
+    def sync(self, files: dict[str, str]) -> list[str]:
+        """
+        Imports the new files and the files whose size or modification time changed, and drops the files that are not
+        given any more (holding the lock, so a concurrent sync waits and then finds the files already imported)
+
+        ...
+
+        Parameters:
+        -----------
+            files (dict[str, str]):
+                address of each file by its name in the database
+
+        Returns:
+        --------
+            (list[str]):
+                names of the files that could not be imported
+        """
+        with self.lock:
+            connection = self.connection
+            imported = {path: (size, mtime) for path, size, mtime in connection.execute("SELECT path, size, mtime "
+                                                                                          "FROM files")}
+            failed = []
+            changed = False
+            for name, file_path in files.items():
+                try:
+                    info = stat(file_path)
+                    if imported.get(name) != (info.st_size, info.st_mtime):
+                        self.import_file(name, file_path)
+                        changed = True
+                except (OSError, ValueError):
+                    failed.append(name)
+
+            removed = [(name,) for name in imported if name not in files]
+            if removed:
+                with connection:
+                    connection.executemany("DELETE FROM files WHERE path = ?", removed)
+                changed = True
+            if changed:
+                # the query planner gets statistics of the indexes
+                connection.execute("PRAGMA optimize")
+            return failed
+
+    def query(self, **criteria) -> list[int]:
+        """
+        Returns the ids of the games matching every criterion, e.g. query(black="Karpov", result="0-1", year=1985)
+        Players, event, site, ECO code, date and file are matched by prefix (ignoring case), result and year exactly
+
+        ...
+
+        Parameters:
+        -----------
+            **criteria:
+                value of each field of FIELDS (None values are ignored)
+
+        Returns:
+        --------
+            (list[int]):
+                ids of the matching games (sorted)
+
+        Raises:
+        -------
+            ValueError (Exception):
+                unknown field or a year that is not a number
+        """
+        conditions = []
+        parameters = []
+        for field, value in criteria.items():
+            if value is None:
+                continue
+            if field not in self.FIELDS:
+                raise ValueError(f"Unknown field '{field}'")
+            if field == "year":
+                conditions.append("year = ?")
+                parameters.append(int(value))
+            elif field == "result":
+                conditions.append("result = ?")
+                parameters.append(str(value))
+            else:
+                # prefix match through the index (the wildcards typed by the user are escaped)
+                pattern = str(value).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+                if field == "player":
+                    conditions.append("(white LIKE ? ESCAPE '\\' OR black LIKE ? ESCAPE '\\')")
+                    parameters.extend((pattern, pattern))
+                elif field == "file":
+                    conditions.append("file_id IN (SELECT id FROM files WHERE path LIKE ? ESCAPE '\\')")
+                    parameters.append(pattern)
+                else:
+                    conditions.append(f"{self.FIELDS[field]} LIKE ? ESCAPE '\\'")
+                    parameters.append(pattern)
+
+        sql = "SELECT id FROM games"
+        if conditions:
+            sql += " WHERE " + " AND ".join(conditions)
+        return [game_id for game_id, in self.connection.execute(sql + " ORDER BY id", parameters)]
+
+    @staticmethod
+    def parse_query(text: str) -> dict[str, str]:
+        """
+        Returns the criteria of a query typed as 'field:value' words, e.g. 'black:Karpov result:0-1 year:1985'
+        Values with spaces are quoted (site:"New York"), words without a field are players
+
+        ...
+
+        Parameters:
+        -----------
+            text (str):
+                query typed by the user
+
+        Returns:
+        --------
+            (dict[str, str]):
+                value of each field
+
+        Raises:
+        -------
+            ValueError (Exception):
+                unknown field or unbalanced quotes
+        """
+        criteria = {}
+        for word in split(text):
+            field, _, value = word.partition(":") if ":" in word else ("player", "", word)
+            field = field.lower()
+            if field not in GameDatabase.FIELDS:
+                raise ValueError(f"Unknown field '{field}'")
+            criteria[field] = value
+        return criteria
+
+    def get_header(self, game_id: int) -> dict[str, str]:
+        """
+        Returns dictionary with the header information of a game (same key-words as FilePGN.get_header)
+
+        ...
+
+        Parameters:
+        -----------
+            game_id (int):
+                id of the game
+
+        Returns:
+        --------
+            (dict):
+                dictionary with game header information
+
+        Raises:
+        -------
+            KeyError (Exception):
+                the game is not in the database (e.g. its file has been imported again)
+        """
+        return self.headers([game_id])[0]
+
+    def headers(self, game_ids: list[int]) -> list[dict[str, str]]:
+        """
+        Returns the header information of many games (same key-words as FilePGN.get_header), in the order of the ids
+
+        ...
+
+        Parameters:
+        -----------
+            game_ids (list[int]):
+                ids of the games
+
+        Returns:
+        --------
+            (list[dict]):
+                dictionary with the header information of each game
+
+        Raises:
+        -------
+            KeyError (Exception):
+                a game is not in the database (e.g. its file has been imported again)
+        """
+        rows = {}
+        connection = self.connection
+        # the ids are looked up in chunks (SQLite limits the number of parameters)
+        for start in range(0, len(game_ids), 500):
+            chunk = game_ids[start:start + 500]
+            for row in connection.execute("SELECT id, event, site, date, round, white, black, result FROM games "
+                                          f"WHERE id IN ({','.join('?' * len(chunk))})", chunk):
+                rows[row[0]] = dict(zip(("Event", "Site", "Date", "Round", "White", "Black", "Result"), row[1:]))
+        for game_id in game_ids:
+            if game_id not in rows:
+                raise KeyError(f"Game {game_id} is not in the database")
+        return [rows[game_id] for game_id in game_ids]
+
+    def get_info(self, game_id: int) -> dict[str, str | list]:
+        """
+        Returns dictionary with the information of a game (same key-words as FilePGN.get_info) and all its tags
+
+        ...
+
+        Parameters:
+        -----------
+            game_id (int):
+                id of the game
+
+        Returns:
+        --------
+            (dict):
+                dictionary with game information
+
+        Raises:
+        -------
+            KeyError (Exception):
+                the game is not in the database (e.g. its file has been imported again)
+        """
+        row = self.connection.execute("SELECT tags, rounds, data FROM games JOIN moves ON id = game_id WHERE id = ?",
+                                      (game_id,)).fetchone()
+        if row is None:
+            raise KeyError(f"Game {game_id} is not in the database")
+        tags, rounds, data = row
+        game_dict = self.get_header(game_id)
+        game_dict["Tags"] = loads(tags)
+        moves = decompress(data).decode()
+        game_dict["moves"] = moves.split("\n") if moves else []
+        game_dict["RoundsPlayed"] = rounds
+        return game_dict
+
+    def close(self) -> None:
+        """
+        Closes the connection of the current thread
+        """
+        connection = getattr(self.__local, "connection", None)
+        if connection is not None:
+            connection.close()
+            self.__local.connection = None
+
+    def __insert_games(self, file_id: int, blocks: list[str], number: int) -> int:
+        """
+        Inserts a batch of games of a file inside one transaction
+
+        ...
+
+        Parameters:
+        -----------
+            file_id (int):
+                id of the file
+
+            blocks (list[str]):
+                information and moves of the games, in turn
+
+            number (int):
+                position in the file of the first game of the batch
+
+        Returns:
+        --------
+            (int):
+                position in the file of the first game of the next batch
+        """
+        batch = FilePGN("", load=False)
+        batch.add_blocks(blocks)
+        games = []
+        moves = []
+        for game_no in batch.index_of_games:
+            info = batch.get_info(game_no)
+            tags = FilePGN.parse_tags(batch.game_data[game_no])
+            date = info["Date"]
+            games.append((file_id, number, info["Event"], info["Site"], date, info["Round"], info["White"],
+                          info["Black"], info["Result"], tags.get("ECO"),
+                          int(date[:4]) if date[:4].isdigit() else None, info["RoundsPlayed"],
+                          dumps(tags, separators=(",", ":"))))
+            moves.append(compress("\n".join(info["moves"]).encode()))
+            number += 1
+
+        if not games:
+            return number
+        connection = self.connection
+        with connection:
+            # the ids are assigned by SQLite (autoincrement), the id of a deleted game is never given to another one
+            game_ids = [connection.execute("INSERT INTO games (file_id, number, event, site, date, round, white, "
+                                           "black, result, eco, year, rounds, tags) "
+                                           "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", game).lastrowid
+                        for game in games]
+            connection.executemany("INSERT INTO moves (game_id, data) VALUES (?, ?)", zip(game_ids, moves))
+        return number
+
+    def __create_tables(self) -> None:
+        """
+        Creates the tables and the indexes (if they do not exist)
+        The ids of the files and the games are never reused (autoincrement), a database created without it is emptied
+        and created again, so the files get imported again by the next sync
+        """
+        with self.connection as connection:
+            games_table = connection.execute("SELECT sql FROM sqlite_master WHERE name = 'games'").fetchone()
+            if games_table is not None and "AUTOINCREMENT" not in games_table[0]:
+                # the games, and the positions, moves and signatures of the indexes, are deleted along with the files
+                connection.execute("DELETE FROM files")
+                connection.executescript("DROP TABLE moves; DROP TABLE games; DROP TABLE files;")
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS files (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    path TEXT UNIQUE NOT NULL,
+                    size INTEGER,
+                    mtime REAL,
+                    games INTEGER);
+                CREATE TABLE IF NOT EXISTS games (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+                    number INTEGER,
+                    event TEXT COLLATE NOCASE,
+                    site TEXT COLLATE NOCASE,
+                    date TEXT,
+                    round TEXT,
+                    white TEXT COLLATE NOCASE,
+                    black TEXT COLLATE NOCASE,
+                    result TEXT,
+                    eco TEXT COLLATE NOCASE,
+                    year INTEGER,
+                    rounds TEXT,
+                    tags TEXT);
+                CREATE TABLE IF NOT EXISTS moves (
+                    game_id INTEGER PRIMARY KEY REFERENCES games (id) ON DELETE CASCADE,
+                    data BLOB);
+                CREATE INDEX IF NOT EXISTS games_file ON games (file_id);
+                CREATE INDEX IF NOT EXISTS games_white ON games (white);
+                CREATE INDEX IF NOT EXISTS games_black ON games (black);
+                CREATE INDEX IF NOT EXISTS games_date ON games (date);
+                CREATE INDEX IF NOT EXISTS games_year ON games (year);
+                CREATE INDEX IF NOT EXISTS games_event ON games (event);
+                CREATE INDEX IF NOT EXISTS games_result ON games (result);
+                CREATE INDEX IF NOT EXISTS games_eco ON games (eco);
+            """)
+
+
+class DatabaseGames:
+    """
+    Games returned by a query of the GameDatabase, with the attributes and methods of FilePGN used by the game lists,
+    so that a game list runs off a query instead of a parsed file
+
+    ...
+
+    Attributes:
+    -----------
+        database (GameDatabase):
+            database of the games
+
+        file_path (str):
+            path of the database file (used along with the ids as the key of the games, e.g. by the thumbnails)
+
+        index_of_games (list[int]):
+            ids of the games
+
+    Methods:
+    --------
+        get_header(self, game_no: int) -> dict:
+            returns dict with the header information of a game
+
+        get_info(self, game_no: int) -> dict:
+            returns dict with the information of a game
+    """
+
+    def __init__(self, database: GameDatabase, game_ids: list[int]):
+        """
+        Initializes the games of a query
+
+        ...
+
+        Parameters:
+        -----------
+            database (GameDatabase):
+                database of the games
+
+            game_ids (list[int]):
+                ids of the games (from GameDatabase.query)
+        """
+        self.database = database
+        self.file_path = database.path
+        self.index_of_games = game_ids
+
+    def get_header(self, game_no: int) -> dict[str, str]:
+        """
+        Returns dictionary with the header information of a game
+
+        ...
+
+        Parameters:
+        -----------
+            game_no (int):
+                id of the game (from index_of_games attribute)
+
+        Returns:
+        --------
+            (dict):
+                dictionary with game header information
+
+        Raises:
+        -------
+            KeyError (Exception):
+                the game is not in the database any more
+        """
+        return self.database.get_header(game_no)
+
+    def get_info(self, game_no: int) -> dict[str, str | list]:
+        """
+        Returns dictionary with information of a game
+
+        ...
+
+        Parameters:
+        -----------
+            game_no (int):
+                id of the game (from index_of_games attribute)
+
+        Returns:
+        --------
+            (dict):
+                dictionary with game information
+
+        Raises:
+        -------
+            KeyError (Exception):
+                the game is not in the database any more
+        """
+        return self.database.get_info(game_no)
+
+
+if __name__ == "__main__":
+    # command line: python game_database.py import [DIRECTORY] | python game_database.py query "black:Karpov year:1985"
+    parser = ArgumentParser(description="Imports the pgn library into the game database and queries it")
+    parser.add_argument("command", choices=("import", "query"))
+    parser.add_argument("argument", nargs="?", help="library directory (import) or query text (query)")
+    args = parser.parse_args()
+
+    game_database = GameDatabase()
+    if args.command == "import":
+        library = args.argument or "pgn_files"
+        library_files = {}
+        for folder, _, file_names in walk(library):
+            for file_name in file_names:
+                if file_name[-4:].lower() == ".pgn":
+                    library_files[relpath(join(folder, file_name), library)] = join(folder, file_name)
+        for failed_name in game_database.sync(library_files):
+            print(f"{failed_name}: could not be imported")
+    else:
+        for found in game_database.headers(game_database.query(**GameDatabase.parse_query(args.argument or ""))):
+            print(f'{found["White"]} vs {found["Black"]} ({found["Result"]}) {found["Event"]} {found["Date"]}')
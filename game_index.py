@@ -0,0 +1,203 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# game_index.py: includes class GameIndex                                                                              #
+# -------------------------------------------------------------------------------------------------------------------- #
+from bisect import bisect_left
+from re import findall
+from pgn import FilePGN
+
+
+class GameIndex:
+    """
+    Inverted index over the header information of the games of a pgn file, used to filter the game lists as the user
+    types
+    Every game is split into lower case tokens (the words and the whitespace separated parts of its players, event,
+    site, date and result), each token keeps the sorted list of the games it appears in, and the sorted list of all
+    tokens is searched by prefix with bisect, so a query never scans the games themselves
+
+    ...
+
+    Attributes:
+    -----------
+        FIELDS (tuple[str]):
+            header fields that get indexed
+
+        size (int):
+            number of games in the index
+
+        __postings (dict[str, list[int]]):
+            indexes of the games containing each token (sorted)
+
+        __tokens (list[str]):
+            all tokens, sorted (rebuilt on the first search after games were added)
+
+        __cache (dict[str, set[int]]):
+            games matching each recently searched prefix (cleared when games are added)
+
+    Methods:
+    --------
+        @staticmethod
+        tokens(header: dict) -> set[str]:
+            returns the tokens of the header information of a game
+
+        @staticmethod
+        header_tokens(header: str) -> set[str]:
+            returns the tokens of the header of a game as read from the pgn file
+
+        add_games(self, game_tokens: list[set[str]]) -> None:
+            adds the tokens of the next games to the index
+
+        search(self, query: str) -> list[int]:
+            returns the indexes of the games matching every word of the query
+
+        __matching(self, prefix: str) -> set[int]:
+            returns the indexes of the games containing a token that starts with prefix
+    """
+
+    # header fields that get indexed
+    FIELDS = ("White", "Black", "Event", "Site", "Date", "Result")
+
+    def __init__(self):
+        """
+        Initializes the (empty) index
+        """
+        self.size = 0
+        self.__postings: dict[str, list[int]] = {}
+        self.__tokens: list[str] = []
+        self.__cache: dict[str, set[int]] = {}
+
+    @staticmethod
+    def tokens(header: dict) -> set[str]:
+        """
+        Returns the tokens of the header information of a game
+        e.g. White "Kasparov, Garry" gives 'kasparov,', 'kasparov' and 'garry', Result "1/2-1/2" gives '1/2-1/2', '1'
+        and '2'
+
+        ...
+
+        Parameters:
+        -----------
+            header (dict):
+                header information of a game (from FilePGN.parse_header)
+
+        Returns:
+        --------
+            (set[str]):
+                lower case tokens of the game
+        """
+        tokens = set()
+        for field in GameIndex.FIELDS:
+            value = header.get(field, "[no info]").lower()
+            if value == "[no info]":
+                continue
+            tokens.update(value.split())
+            tokens.update(findall(r"\w+", value))
+        return tokens
+
+    @staticmethod
+    def header_tokens(header: str) -> set[str]:
+        """
+        Returns the tokens of the header of a game as read from the pgn file (used as the header function of a
+        FileLoader)
+
+        ...
+
+        Parameters:
+        -----------
+            header (str):
+                information of a game (a block yielded by FilePGN.read_blocks)
+
+        Returns:
+        --------
+            (set[str]):
+                lower case tokens of the game
+        """
+        return GameIndex.tokens(FilePGN.parse_header(header))
+
+    def add_games(self, game_tokens: list[set[str]]) -> None:
+        """
+        Adds the tokens of the next games to the index (the games get the next indexes in order)
+
+        ...
+
+        Parameters:
+        -----------
+            game_tokens (list[set[str]]):
+                tokens of each game (from GameIndex.tokens)
+        """
+        postings = self.__postings
+        for game, tokens in enumerate(game_tokens, start=self.size):
+            for token in tokens:
+                posting = postings.get(token)
+                if posting is None:
+                    postings[token] = [game]
+                else:
+                    posting.append(game)
+        self.size += len(game_tokens)
+
+        # the sorted tokens and the cached prefixes are out of date
+        self.__tokens = []
+        self.__cache.clear()
+
+    def search(self, query: str) -> list[int]:
+        """
+        Returns the indexes of the games matching every word of the query (each word is the prefix of a token)
+        An empty query matches every game
+
+        ...
+
+        Parameters:
+        -----------
+            query (str):
+                words typed by the user
+
+        Returns:
+        --------
+            (list[int]):
+                indexes of the matching games (sorted)
+        """
+        words = query.lower().split()
+        if not words:
+            return list(range(self.size))
+
+        # the rarest word is matched first, so the intersection stays small
+        games = None
+        for matching in sorted((self.__matching(word) for word in set(words)), key=len):
+            games = matching.copy() if games is None else games.intersection(matching)
+            if not games:
+                break
+        return sorted(games)
+
+    def __matching(self, prefix: str) -> set[int]:
+        """
+        Returns the indexes of the games containing a token that starts with prefix
+
+        ...
+
+        Parameters:
+        -----------
+            prefix (str):
+                lower case word of the query
+
+        Returns:
+        --------
+            (set[int]):
+                indexes of the games
+        """
+        games = self.__cache.get(prefix)
+        if games is not None:
+            return games
+
+        if not self.__tokens and self.__postings:
+            self.__tokens = sorted(self.__postings)
+
+        games = set()
+        # the tokens starting with prefix are next to each other in the sorted list
+        i = bisect_left(self.__tokens, prefix)
+        while i < len(self.__tokens) and self.__tokens[i].startswith(prefix):
+            games.update(self.__postings[self.__tokens[i]])
+            i += 1
+        # the cache is kept small, a query only needs the prefixes typed recently
+        if len(self.__cache) >= 64:
+            self.__cache.clear()
+        self.__cache[prefix] = games
+        return games
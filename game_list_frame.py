@@ -0,0 +1,205 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# game_list_frame.py: includes class GameListFrame                                                                     #
+# -------------------------------------------------------------------------------------------------------------------- #
+from bisect import bisect_left
+from tkinter import Frame, StringVar
+from game_index import GameIndex
+
+
+class GameListFrame(Frame):
+    """
+    Inherits from parent class Frame and keeps the games of a pgn file shown in a game list, filtered through a search
+    index as the user types in a filter entry
+    Base class of the frames that show the games of a file (the subclass creates the game list and the filter entry)
+
+    ...
+
+    Attributes:
+    -----------
+        root (Tk):
+            master window
+
+        pgn_file (FilePGN | DatabaseGames | None):
+            the loaded pgn file (its games get added in batches while it is being read), or the games of a query
+
+        file_loader (FileLoader | BackgroundTask | None):
+            reads the pgn file in a worker thread
+
+        game_dict_collection (dict[int, dict]):
+            header dictionaries of the games shown so far (by game index, parsed when a row is first shown)
+
+        game_index (GameIndex):
+            search index over the header information of the games of the file
+
+        shown_games (list[int] | None):
+            indexes of the games matching the filter (None if there is no filter)
+
+        filter_var (StringVar):
+            text of the filter entry
+
+        game_listbox (VirtualListbox):
+            list of the games of the file (created by the subclass)
+
+    Methods:
+    --------
+        clear_games(self) -> None:
+            empties the game list
+
+        games_loaded(self, blocks: list[str], game_tokens: list[set[str]]) -> None:
+            adds a batch of games to the game list and the search index
+
+        file_loaded(self) -> None:
+            resumes the indexing of the library once the file has been read
+
+        apply_filter(self, *args) -> None:
+            shows only the games matching the filter
+
+        game_of_row(self, i: int) -> int:
+            returns the index of the game shown in a row of the game list
+
+        game_row_text(self, i: int) -> str:
+            returns the text of a row of the game list
+    """
+    def __init__(self, root):
+        """
+        Initializes the frame with an empty game list
+
+        ...
+
+        Parameters:
+        -----------
+            root (main_program.MainProgram):
+                main window
+        """
+        # initialization of parent class (Frame)
+        super().__init__()
+        self.config(bg="light blue")
+        # master of the frame
+        self.root = root
+        # initialization of the loaded file and the header dictionaries of the games
+        self.pgn_file = None
+        self.game_dict_collection = {}
+        self.file_loader = None
+        # search index of the file and games matching the filter
+        self.game_index = GameIndex()
+        self.shown_games = None
+        # the games are filtered as the user types
+        self.filter_var = StringVar(master=self)
+        self.filter_var.trace_add("write", self.apply_filter)
+
+    def clear_games(self):
+        """
+        Empties the game list, the header dictionaries and the search index
+        """
+        self.pgn_file = None
+        self.game_dict_collection.clear()
+        self.game_index = GameIndex()
+        self.shown_games = None
+        self.game_listbox.set_size(0)
+
+    def games_loaded(self, blocks: list[str], game_tokens: list[set[str]]):
+        """
+        Adds a batch of games of the file being read to the game list and the search index
+
+        ...
+
+        Parameters:
+        -----------
+            blocks (list[str]):
+                information and moves of the games, in turn
+
+            game_tokens (list[set[str]]):
+                search tokens of each game of the batch
+        """
+        self.pgn_file.add_blocks(blocks)
+        self.game_index.add_games(game_tokens[:len(self.pgn_file.index_of_games) - self.game_index.size])
+        self.apply_filter()
+
+    def file_loaded(self):
+        """
+        Resumes the background indexing of the library once the whole file has been read
+        """
+        self.root.indexer.resume()
+
+    def apply_filter(self, *args):
+        """
+        Shows only the games matching every word of the filter entry (looked up in the search index)
+        The selected game stays selected if it still matches
+
+        ...
+
+        Parameters:
+        -----------
+            *args:
+                arguments of the StringVar trace (not used)
+        """
+        if self.pgn_file is None:
+            return
+        selection = self.game_listbox.curselection()
+        selected_game = self.game_of_row(selection[0]) if selection else None
+
+        query = self.filter_var.get()
+        if query.strip():
+            self.shown_games = self.game_index.search(query)
+            size = len(self.shown_games)
+            selected_row = None
+            if selected_game is not None:
+                # the matching games are sorted
+                row = bisect_left(self.shown_games, selected_game)
+                if row < size and self.shown_games[row] == selected_game:
+                    selected_row = row
+        else:
+            self.shown_games = None
+            size = len(self.pgn_file.index_of_games)
+            selected_row = selected_game
+
+        self.game_listbox.selected = selected_row
+        self.game_listbox.set_size(size)
+        if selected_row is not None:
+            self.game_listbox.see(selected_row)
+
+    def game_of_row(self, i: int) -> int:
+        """
+        Returns the index of the game shown in a row of the game list (the rows show the games matching the filter)
+
+        ...
+
+        Parameters:
+        -----------
+            i (int):
+                index of the row
+
+        Returns:
+        --------
+            (int):
+                index of the game in the file
+        """
+        return i if self.shown_games is None else self.shown_games[i]
+
+    def game_row_text(self, i: int) -> str:
+        """
+        Returns the text of a row of the game list (the header of the game is parsed the first time it is shown)
+
+        ...
+
+        Parameters:
+        -----------
+            i (int):
+                index of the row
+
+        Returns:
+        --------
+            (str):
+                text of the row
+        """
+        game = self.game_of_row(i)
+        game_dictionary = self.game_dict_collection.get(game)
+        if game_dictionary is None:
+            try:
+                game_dictionary = self.pgn_file.get_header(self.pgn_file.index_of_games[game])
+            except KeyError:
+                # a game of a query whose file has been imported again since
+                return f'{str(game + 1) + ".":4}game no longer in the library'
+            self.game_dict_collection[game] = game_dictionary
+        return f'{str(game + 1) + ".":4}{game_dictionary["White"]} vs {game_dictionary["Black"]} ' \
+               f'({game_dictionary["Result"]})'
@@ -34,8 +34,23 @@ class GameLoader(PieceMoveChecker):
         captured_diff_per_round (list[dict]):
             list with the captured pieces difference per round
 
+        replay_error (FalseGame | FriendlyCapture | None):
+            exception raised while replaying the game
+
+        plies_loaded (int):
+            number of half moves replayed so far (property)
+
+        fully_loaded (bool):
+            True if every move of the game has been replayed (property)
+
+        last_round (int):
+            index of the final round that can be displayed (property)
+
     Methods:
     --------
+        load_plies(self, count: int) -> int:
+            replays (at most) 'count' more half moves
+
         next_move(self, force: bool=False):
             continues to next move
 
@@ -45,6 +60,9 @@ class GameLoader(PieceMoveChecker):
         restart_game(self):
             restarts the game
 
+        goto(self, ply: int) -> None:
+            jumps straight to any replayed round
+
         __update_captured_piece_dict(self, piece_name: str, advantage: int) -> None:
             updates dictionary with captured pieces
 
@@ -59,23 +77,26 @@ class GameLoader(PieceMoveChecker):
         FriendlyCapture (Exception):
             a piece captures a friendly piece (not legal)
     """
-    def __init__(self, list_of_moves: list):
+    def __init__(self, list_of_moves: list, lazy: bool = False):
         """
         Parameters:
         -----------
             list_of_moves (list):
                 λίστα με τις επεξεργασμένες κινήσεις του αγώνα
 
+            lazy (bool) default=False:
+                if True, no moves are replayed here and load_plies must be called to replay the game in chunks
+
         Raises:
         -------
             NoMovesFound (Exception):
                 the current game has no moves
 
-            PossibleCorruptFile (Exception):
-                game could not be processed
+            FalseGame (Exception):
+                game could not be processed (only if lazy is False)
 
             FriendlyCapture (Exception):
-                a piece captures a friendly piece (not legal)
+                a piece captures a friendly piece (not legal, only if lazy is False)
         """
         # initialization of parent class PieceMoveChecker
         super().__init__(list_of_moves)
@@ -85,10 +106,6 @@ class GameLoader(PieceMoveChecker):
 
         # list with the captured pieces difference per round
         self.captured_diff_per_round = [{"p": 0, "n": 0, "b": 0, "r": 0, "q": 0, "advantage": 0}]
-        # value of each piece
-        values = {'qw': 9, 'qb': -9, 'rw': 5, 'rb': -5, 'bw': 3, 'bb': -3, 'nw': 3, 'nb': -3, 'pw': 1, 'pb': -1}
-        # variable for temporary storing of the current advantage
-        adv: int = 0
 
         # list of booleans for sound playing
         # if False a move sound is played, else a capture sound (first round initialized as False)
@@ -98,6 +115,9 @@ class GameLoader(PieceMoveChecker):
         # if None no mate is active, else "w"/"b" to show which king has mate (first round initialized as None)
         self.check_per_round = [None]
 
+        # exception raised while replaying the game (None if no error occurred so far)
+        self.replay_error: FalseGame | FriendlyCapture | None = None
+
         # 'screenshot' storing -----------------------------------------------------------------------------------------
         # temporary list variable
         current_screenshot = []
@@ -110,18 +130,83 @@ class GameLoader(PieceMoveChecker):
         if self.moves_length == 0:
             raise NoMovesFound
 
+        # the whole game is replayed at once, unless the caller wants to replay it in chunks (see load_plies)
+        if not lazy:
+            self.load_plies(self.moves_length)
+
+    @property
+    def plies_loaded(self) -> int:
+        """
+        Number of half moves (plies) that have been replayed so far
+        """
+        return len(self.screenshots_per_round) - 1
+
+    @property
+    def fully_loaded(self) -> bool:
+        """
+        True if every move of the game has been replayed
+        """
+        return self.plies_loaded == self.moves_length
+
+    @property
+    def last_round(self) -> int:
+        """
+        Index of the final round that can be displayed
+        If the replay failed, the game ends at the last round that was replayed successfully
+        """
+        if self.replay_error is not None:
+            return self.plies_loaded
+        return self.moves_length
+
+    def load_plies(self, count: int) -> int:
+        """
+        Replays (at most) 'count' more half moves and stores their screenshots
+        Used to replay long games in chunks, so that the board can be shown before the whole game is processed
+
+        ...
+
+        Parameters:
+        -----------
+            count (int):
+                maximum number of half moves to replay
+
+        Returns:
+        --------
+            (int):
+                number of half moves that were replayed
+
+        Raises:
+        -------
+            FalseGame (Exception):
+                game could not be processed
+
+            FriendlyCapture (Exception):
+                a piece captures a friendly piece (not legal)
+        """
+        # a failed replay cannot continue, the same exception is raised again
+        if self.replay_error is not None:
+            raise self.replay_error
+
+        # value of each piece
+        values = {'qw': 9, 'qb': -9, 'rw': 5, 'rb': -5, 'bw': 3, 'bb': -3, 'nw': 3, 'nb': -3, 'pw': 1, 'pb': -1}
+        # variable for temporary storing of the current advantage
+        adv: int = 0
+
         # loop through each round to create the screenshot of the chess board
-        for i in range(self.moves_length):
+        loaded = 0
+        while loaded < count and not self.fully_loaded:
             # next move is loaded and the captured piece name is stored temporarily
             captured_piece_name = self.load_next_move()
 
             # load_next_move() method returned None
             if captured_piece_name is None:
-                raise FalseGame(f"{self.round_cnt//2 + 1}. {self.moves[self.round_cnt]}")
+                self.replay_error = FalseGame(f"{self.round_cnt//2 + 1}. {self.moves[self.round_cnt]}")
+                raise self.replay_error
 
             # a friendly capture has been made
             if self.friendly_capture:
-                raise FriendlyCapture(f"{self.round_cnt//2 + 1}. {self.moves[self.round_cnt]}")
+                self.replay_error = FriendlyCapture(f"{self.round_cnt//2 + 1}. {self.moves[self.round_cnt]}")
+                raise self.replay_error
 
             # temporary list variable
             current_screenshot = []
@@ -144,6 +229,10 @@ class GameLoader(PieceMoveChecker):
             # check_per_round list update
             self.check_per_round.append(self.check)
 
+            loaded += 1
+
+        return loaded
+
     def next_move(self, force: bool = False) -> None:
         """
         Continues to the next move
@@ -161,7 +250,7 @@ class GameLoader(PieceMoveChecker):
             PositionReached (Exception):
                 if 2nd to final move is reached
         """
-        if self.round < self.moves_length - 1:
+        if self.round < self.last_round - 1:
             self.round += 1
             return
         if force:
@@ -200,6 +289,26 @@ class GameLoader(PieceMoveChecker):
         """
         self.round = 0
 
+    def goto(self, ply: int) -> None:
+        """
+        Jumps straight to round 'ply' (the screenshots of every round are already stored, so no moves are replayed)
+
+        ...
+
+        Parameters:
+        -----------
+            ply (int):
+                round (half move) to jump to
+
+        Raises:
+        -------
+            IndexError (Exception):
+                if the round has not been replayed (yet) or is out of the game's range
+        """
+        if not 0 <= ply <= min(self.plies_loaded, self.last_round):
+            raise IndexError(f"round {ply} is not available (0 ~ {min(self.plies_loaded, self.last_round)})")
+        self.round = ply
+
     def __update_captured_piece_dict(self, piece_name: str, advantage: int) -> None:
         """
         Updates the dictionary that stores the captured piece difference for each piece type per round
@@ -0,0 +1,191 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# game_loader_cache.py: includes class GameLoaderCache                                                                 #
+# -------------------------------------------------------------------------------------------------------------------- #
+from collections import OrderedDict
+from copy import copy
+from sys import getsizeof
+from game_loader import GameLoader
+from replay_cache import ReplayCache
+
+
+class GameLoaderCache:
+    """
+    Keeps the most recently opened (fully replayed) GameLoader objects in memory, so that reopening a game or flipping
+    between games does not construct a new GameLoader
+    The cache is bounded both by the number of games and by their estimated size in bytes, the least recently used
+    games are dropped first
+    Games that are not found in memory are looked up in the on-disk ReplayCache
+
+    ...
+
+    Attributes:
+    -----------
+        replay_cache (ReplayCache):
+            on-disk cache used when a game is not found in memory
+
+        max_games (int):
+            maximum number of games kept in memory
+
+        max_bytes (int):
+            maximum estimated size of the games kept in memory
+
+        hits (int):
+            number of games found in memory
+
+        misses (int):
+            number of games that were not found in memory
+
+        __game_loaders (OrderedDict[str, GameLoader]):
+            game loaders by the hash of their moves (least recently used first)
+
+        __sizes (dict[str, int]):
+            estimated size of each game loader
+
+    Methods:
+    --------
+        get_game_loader(self, list_of_moves: list) -> GameLoader:
+            returns a GameLoader for the moves list
+
+        store(self, game_loader: GameLoader) -> None:
+            stores a fully replayed GameLoader in memory and on disk
+
+        @staticmethod
+        estimate_size(game_loader: GameLoader) -> int:
+            returns the estimated size of a GameLoader in bytes
+
+        __add(self, key: str, game_loader: GameLoader) -> None:
+            adds a game loader and drops the least recently used ones if the limits are exceeded
+    """
+
+    def __init__(self, replay_cache: ReplayCache, max_games: int = 32, max_bytes: int = 64 * 1024 * 1024):
+        """
+        Initializes the cache
+
+        ...
+
+        Parameters:
+        -----------
+            replay_cache (ReplayCache):
+                on-disk cache used when a game is not found in memory
+
+            max_games (int) default=32:
+                maximum number of games kept in memory
+
+            max_bytes (int) default=64MB:
+                maximum estimated size of the games kept in memory
+        """
+        self.replay_cache = replay_cache
+        self.max_games = max_games
+        self.max_bytes = max_bytes
+
+        # hit/miss counters
+        self.hits = 0
+        self.misses = 0
+
+        self.__game_loaders: OrderedDict[str, GameLoader] = OrderedDict()
+        self.__sizes: dict[str, int] = {}
+
+    def get_game_loader(self, list_of_moves: list) -> GameLoader:
+        """
+        Returns a GameLoader for the moves list
+        If the game is kept in memory, a copy sharing its replayed lists is returned (each window keeps its own round),
+        else the GameLoader is retrieved from the on-disk cache or created (lazy)
+
+        ...
+
+        Parameters:
+        -----------
+            list_of_moves (list):
+                list with the moves of the game
+
+        Returns:
+        --------
+            (GameLoader):
+                game loader object
+
+        Raises:
+        -------
+            NoMovesFound (Exception):
+                the current game has no moves
+        """
+        key = ReplayCache.key(list_of_moves)
+        game_loader = self.__game_loaders.get(key)
+        if game_loader is not None and game_loader.moves == list_of_moves:
+            self.hits += 1
+            # the game becomes the most recently used
+            self.__game_loaders.move_to_end(key)
+            game_loader = copy(game_loader)
+            game_loader.restart_game()
+            return game_loader
+
+        self.misses += 1
+        game_loader = self.replay_cache.get_game_loader(list_of_moves)
+        if game_loader.fully_loaded:
+            # restored from disk
+            self.__add(key, copy(game_loader))
+        return game_loader
+
+    def store(self, game_loader: GameLoader) -> None:
+        """
+        Stores a fully replayed GameLoader in memory and in the on-disk cache
+        Games that could not be replayed are not stored
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                fully replayed game loader
+        """
+        if not game_loader.fully_loaded or game_loader.replay_error is not None:
+            return
+        self.__add(ReplayCache.key(game_loader.moves), copy(game_loader))
+        self.replay_cache.store(game_loader)
+
+    @staticmethod
+    def estimate_size(game_loader: GameLoader) -> int:
+        """
+        Returns the estimated size of the replayed lists of a GameLoader in bytes
+        The size of the first screenshot is measured and multiplied by the number of rounds
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                replayed game loader
+
+        Returns:
+        --------
+            (int):
+                estimated size in bytes
+        """
+        screenshot = game_loader.screenshots_per_round[0]
+        screenshot_size = getsizeof(screenshot) + sum(getsizeof(piece) for piece in screenshot)
+        # captured pieces dictionary, tracer tuples and list slots of the remaining per round lists
+        round_size = screenshot_size + getsizeof(game_loader.captured_diff_per_round[0]) + 200
+        return len(game_loader.screenshots_per_round) * round_size
+
+    def __add(self, key: str, game_loader: GameLoader) -> None:
+        """
+        Adds a game loader as the most recently used and drops the least recently used ones if the limits are exceeded
+
+        ...
+
+        Parameters:
+        -----------
+            key (str):
+                hash of the moves list
+
+            game_loader (GameLoader):
+                fully replayed game loader
+        """
+        self.__game_loaders[key] = game_loader
+        self.__game_loaders.move_to_end(key)
+        self.__sizes[key] = self.estimate_size(game_loader)
+
+        # the least recently used games are dropped (the newest game is always kept)
+        while len(self.__game_loaders) > 1 and \
+                (len(self.__game_loaders) > self.max_games or sum(self.__sizes.values()) > self.max_bytes):
+            old_key, _ = self.__game_loaders.popitem(last=False)
+            del self.__sizes[old_key]
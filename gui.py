@@ -1,32 +1,45 @@
 # -------------------------------------------------------------------------------------------------------------------- #
 # gui.py: includes class GUI                                                                                           #
 # -------------------------------------------------------------------------------------------------------------------- #
-from tkinter import Tk, Menu, PhotoImage, Frame, Label, Button, IntVar, BooleanVar
-from tkinter.messagebox import askyesno, showinfo
-from pygame import mixer
-from my_exceptions import PositionReached
+from tkinter import Toplevel, Menu, Frame, Label, Button, Scale, IntVar, BooleanVar
+from tkinter.messagebox import askyesno, showinfo, showerror, showwarning
+from time import perf_counter
+from sqlite3 import DatabaseError
+from my_exceptions import FalseGame, FriendlyCapture, NoMovesFound
 from info_frame_for_gui import InfoFrame
 from captured_pieces import CapturedPieces
+from board_canvas import BoardCanvas
+from image_registry import ImageRegistry
+from sound_player import SoundPlayer
+from file_loader import BackgroundTask
+from position_index import PositionIndex
+from position_search import PositionSearch
+from opening_panel import OpeningPanel
 
 
-class GUI(Tk):
+class GUI(Toplevel):
     """
-    Opens a new Tkinter window with the 2D chess board and represents the game from start to end using some basic
-    buttons (forwards, backwards etc.)
+    Opens a new window (Toplevel of the main window) with the 2D chess board and represents the game from start to end
+    using some basic buttons (forwards, backwards etc.)
+    All game windows share the Tk interpreter of the main window (and so its images and event loop), any number of
+    them can stay open at once
     The window also includes two frames, one for showing the game info and another one for showing the captured pieces
 
     ...
 
     Attributes:
     -----------
-        *_image (PhotoImage):
-            images for each piece
+        images (dict[str, PhotoImage]):
+            images for each piece name of the screenshots (checked kings as 'kw_checked'/'kb_checked')
 
         game_loader (GameLoader):
             object containing all the info needed for each game
 
-        board (list):
-            the 2D chess board
+        game_cache (GameLoaderCache | None):
+            cache where the game is stored once it has been fully replayed
+
+        board (BoardCanvas):
+            the 2D chess board (canvas)
 
         button_next (Button):
             button for next move
@@ -37,6 +50,12 @@ class GUI(Tk):
         button_restart (Button):
             button for restarting the game
 
+        button_end (Button):
+            button for jumping to the final move
+
+        slider (Scale):
+            slider for jumping to any round
+
         button_frame (Frame):
             frame for buttons
 
@@ -70,20 +89,41 @@ class GUI(Tk):
         __result (str):
             result of the game
 
+        __identifier_for_replay (str):
+            identifier of the after() method that replays the next chunk of moves
+
+        __position_task (BackgroundTask | None):
+            searches the library for the current position in a worker thread
+
+        opening_var (BooleanVar):
+            variable for showing the opening explorer
+
+        opening_panel (OpeningPanel | None):
+            panel with the moves played from the current position by the games of the library
+
+        __tree_task (BackgroundTask | None):
+            updates the opening tree of the library in a worker thread
+
+        __library_updated (bool):
+            True once the library has been updated by this window
+
+        library_label (Label):
+            label with the progress of the library update (shown while the library is being updated)
+
     Methods:
     --------
-        board_config(self) -> None:
-            configures the board by adding background colours and indexes for side squares
-
         update_gui_board(self):
             updates the chess board
 
-        show_traces(self, backwards: bool = False) -> None:
-            show traces of the piece that is to move
+        show_traces(self) -> None:
+            show traces of the move that led to the current round
 
         remove_old_traces(self) -> None:
             removes old traces from the board and sets the background back to original colours
 
+        redraw_traces(self) -> None:
+            shows the traces of the current round again (e.g. after toggling the arrows)
+
         invert_tracer_var(self) -> None:
             inverts the tracer variable for the 'Hide Traces' check-button in file sub-menu
 
@@ -96,8 +136,23 @@ class GUI(Tk):
         restart_game(self):
             restarts the game
 
+        jump_to_end(self):
+            jumps to the final round
+
+        jump_to(self, ply: int, sound: str = "move") -> None:
+            jumps to any round with a single board update
+
+        slider_moved(self, value: str) -> None:
+            jumps to the round selected with the slider
+
+        update_controls(self) -> None:
+            enables/disables the control buttons based on the current round
+
         autoplay(self):
-            auto-plays the game moves per one second until canceled or game ends
+            starts/cancels autoplay
+
+        autoplay_tick(self) -> None:
+            performs the moves that are due and schedules the next deadline
 
         text_config(self) -> str:
             edits and returns string with next move display info
@@ -114,23 +169,87 @@ class GUI(Tk):
         left_key_bind(self, event):
             performs previous move using key event <right-arrow>
 
+        navigate_by_key(self, step: int) -> None:
+            coalesces the arrow key presses into a single jump per frame
+
+        render_key_target(self) -> None:
+            jumps to the round requested through the arrow keys
+
         down_key_bind(self, event):
             restarts the game using key event <down-arrow>
 
+        end_key_bind(self, event):
+            jumps to the final move using key event <End>
+
         up_key_bind(self, event):
             auto-plays next move using key event <up-arrow>
 
-        image_config(self, image_name) -> PhotoImage:
-            configures the image of each piece object
-
         pack_widgets(self) -> None:
             packs the widgets in the window
 
         start_game(self):
             starts the game and initializes the key-bindings for buttons
+
+        replay_next_chunk(self) -> None:
+            replays the next chunk of moves while the window is already shown
+
+        next_move_is_ready(self) -> bool:
+            returns True if the next move has already been replayed
+
+        find_position(self) -> None:
+            searches the library for the games that reached the current position
+
+        @staticmethod
+        update_library(position_index: PositionIndex, files: dict[str, str], task: BackgroundTask) -> list[str]:
+            updates the game database, the position index and the opening tree (worker thread)
+
+        @staticmethod
+        search_library(position_index: PositionIndex, files: dict[str, str], key: int,
+                       task: BackgroundTask) -> tuple[list[tuple[int, int]], list[str]]:
+            updates the game database and the position index and searches a position (worker thread)
+
+        position_found(self, result: tuple[list[tuple[int, int]], list[str]]) -> None:
+            shows the games that reached the position
+
+        position_failed(self, error: Exception) -> None:
+            shows why the library could not be searched
+
+        report_failed_files(self, failed: list[str]) -> None:
+            tells the user which files could not be imported
+
+        library_progress(self, done: int, total: int) -> None:
+            shows the progress of the library update
+
+        open_game_at(self, game_id: int, ply: int) -> None:
+            opens a game of the database at a round
+
+        toggle_opening_panel(self) -> None:
+            shows/hides the opening explorer
+
+        tree_updated(self, failed: list[str]) -> None:
+            shows the opening explorer once the library has been updated
+
+        tree_failed(self, error: Exception) -> None:
+            shows why the opening tree could not be updated
+
+        show_opening_moves(self) -> None:
+            shows the moves played from the current position in the opening explorer
     """
 
-    def __init__(self, game_loader_obj, game_dict: dict):
+    # number of half moves replayed per after() call while the window is open
+    REPLAY_CHUNK = 4
+
+    # autoplay speeds (label, milliseconds per move)
+    AUTOPLAY_SPEEDS = (("50 moves/s", 20), ("25 moves/s", 40), ("10 moves/s", 100), ("5 moves/s", 200),
+                       ("2 moves/s", 600), ("1 moves/s", 1200), ("0.5 moves/s", 2100))
+
+    # autoplay plays the move sounds only if the moves are at least this many seconds apart
+    SOUND_MIN_INTERVAL = 0.15
+
+    # milliseconds between two renders of the rounds requested through the arrow keys
+    KEY_FRAME_MS = 16
+
+    def __init__(self, master, game_loader_obj, game_dict: dict, game_cache=None):
         """
         Initializes the new window
 
@@ -138,14 +257,21 @@ class GUI(Tk):
 
         Parameters:
         -----------
+            master (Tk):
+                main window of the app
+
             game_loader_obj (game_loader.GameLoader):
                 object with the game screenshots and other useful stored information
+                (the moves that have not been replayed yet are replayed in chunks after the window is shown)
 
             game_dict (dict):
                 dictionary containing the basic game information (player names, event name, result etc. and the moves)
+
+            game_cache (game_loader_cache.GameLoaderCache) default=None:
+                cache where the game is stored once it has been fully replayed
         """
-        # initialization of parent class (Tk)
-        super().__init__()
+        # initialization of parent class (Toplevel)
+        super().__init__(master=master)
         # initialization of window -------------------------------------------------------------------------------------
         self.focus_force()
         # title and icon
@@ -157,6 +283,7 @@ class GUI(Tk):
 
         # initialization of GameLoader object --------------------------------------------------------------------------
         self.game_loader = game_loader_obj
+        self.game_cache = game_cache
 
         self.__result = game_dict["Result"]
 
@@ -169,13 +296,19 @@ class GUI(Tk):
         self.file_menu = Menu(menubar, tearoff=0)
         # sub-menu addition to main menu
         menubar.add_cascade(label="  File  ", menu=self.file_menu)
+        # initialization of radiobutton variable (milliseconds per move)
+        self.radiobutton_var = IntVar(master=self.file_menu, value=1200)
         # options
         self.file_menu.add_checkbutton(label="Autoplay", command=self.autoplay)
-        self.file_menu.add_radiobutton(label="2 moves/s", value=600)
-        self.file_menu.add_radiobutton(label="1 moves/s", value=1200)
-        self.file_menu.add_radiobutton(label="0.5 moves/s", value=2100)
+        for label, value in self.AUTOPLAY_SPEEDS:
+            self.file_menu.add_radiobutton(label=label, value=value, variable=self.radiobutton_var)
         self.file_menu.add_separator()
         self.file_menu.add_checkbutton(label="Hide Traces", command=self.invert_tracer_var)
+        self.file_menu.add_checkbutton(label="Show Arrows", command=self.redraw_traces)
+        self.file_menu.add_checkbutton(label="Sound")
+        self.file_menu.add_separator()
+        self.file_menu.add_command(label="Find Position", command=self.find_position)
+        self.file_menu.add_checkbutton(label="Opening Explorer", command=self.toggle_opening_panel)
         self.file_menu.add_separator()
         self.file_menu.add_command(label="Exit", command=self.exit)
 
@@ -186,45 +319,29 @@ class GUI(Tk):
         # options
         help_menu.add_command(label="Help", command=self.show_controls)
 
-        # pygame mixer initialization ----------------------------------------------------------------------------------
-        mixer.init()
-
         # image initialization -----------------------------------------------------------------------------------------
-        # blank image for empty squares
-        self.blank = self.image_config(image_name="BLANK_ICON")
-
-        # images for black pieces
-        self.rb_image = self.image_config(image_name="rb")
-        self.nb_image = self.image_config(image_name="nb")
-        self.bb_image = self.image_config(image_name="bb")
-        self.qb_image = self.image_config(image_name="qb")
-        self.kb_image = self.image_config(image_name="kb")
-        self.pb_image = self.image_config(image_name="pb")
-
-        # images for white pieces
-        self.rw_image = self.image_config(image_name="rw")
-        self.nw_image = self.image_config(image_name="nw")
-        self.bw_image = self.image_config(image_name="bw")
-        self.qw_image = self.image_config(image_name="qw")
-        self.kw_image = self.image_config(image_name="kw")
-        self.pw_image = self.image_config(image_name="pw")
-
-        # checked king images
-        self.kb_checked = self.image_config(image_name="kb_checked")
-        self.kw_checked = self.image_config(image_name="kw_checked")
+        # direct map from the piece name of the screenshots to its image (decoded once by the image registry)
+        self.images = ImageRegistry.piece_images(self)
 
         # chess board initialization -----------------------------------------------------------------------------------
         self.board_frame = Frame(self, bd=10, relief="raised")
 
-        # lists with the file and rank indexes
-        self.__col_labels = []
-        self.__row_labels = []
-        # creation of 2D board with labels
-        self.board = [[Label(self.board_frame, bd=7) for _col in range(8)] for _row in range(8)]
-        self.board_config()
+        # 2D board drawn on a single canvas
+        self.board = BoardCanvas(self.board_frame, self.images, self.game_loader.files, self.game_loader.ranks)
+        self.board.pack()
 
         # variable to control whether the move traces are shown or not
         self.show_traces_var = BooleanVar(self, value=True)
+        # variable to control whether the move traces are also shown as arrows
+        self.show_arrows_var = BooleanVar(self, value=False)
+        self.file_menu.entryconfig("Show Arrows", variable=self.show_arrows_var)
+        # variable to control whether the sound effects are played (the mixer is only initialized when needed)
+        self.sound_var = BooleanVar(self, value=True)
+        self.file_menu.entryconfig("Sound", variable=self.sound_var)
+        # variable to control whether the opening explorer is shown (the panel is created the first time it is shown)
+        self.opening_var = BooleanVar(self, value=False)
+        self.file_menu.entryconfig("Opening Explorer", variable=self.opening_var)
+        self.opening_panel = None
 
         # auxiliary variables
         self.__starting_move = True
@@ -236,43 +353,71 @@ class GUI(Tk):
         self.file_menu.entryconfig(0, variable=self.checkbutton_var)
         # string that stores the self.after() method identifier to cancel if necessary
         self.__identifier_for_after_method = ""
-
-        # initialization of radiobutton variable
-        self.radiobutton_var = IntVar(master=self.file_menu, value=1200)
-        self.file_menu.entryconfig(1, variable=self.radiobutton_var)
-        self.file_menu.entryconfig(2, variable=self.radiobutton_var)
-        self.file_menu.entryconfig(3, variable=self.radiobutton_var)
+        # string that stores the identifier of the after() method replaying the game in chunks
+        self.__identifier_for_replay = ""
+        # search of the current position in the library
+        self.__position_task = None
+        # update of the opening tree of the library (the library is updated once per window)
+        self.__tree_task = None
+        self.__library_updated = False
+        self.library_label = Label(self, background="light grey", font=("consolas", 10))
+        # round requested through the arrow keys (None if no request is pending) and identifier of the next render
+        self.__key_target = None
+        self.__identifier_for_key_render = ""
+        # autoplay timing (time and round autoplay started from, milliseconds per move)
+        self.__autoplay_start_time = 0.0
+        self.__autoplay_start_round = 0
+        self.__autoplay_interval = 0
 
         # initialization of button frame and buttons -------------------------------------------------------------------
         self.button_frame = Frame(master=self, bg="light blue")
 
         self.button_next = Button(self.button_frame,
-                                  text="---->",
+                                  text="--->",
                                   state="normal",
                                   font=("consolas", 13, "bold"),
                                   background="light green",
                                   activebackground="green",
-                                  width=12,
+                                  width=8,
                                   command=self.load_next)
 
         self.button_prev = Button(self.button_frame,
-                                  text="<----",
+                                  text="<---",
                                   state="disabled",
                                   font=("consolas", 13, "bold"),
                                   background="light green",
                                   activebackground="green",
-                                  width=12,
+                                  width=8,
                                   command=self.load_previous)
 
         self.button_restart = Button(self.button_frame,
-                                     text="||<---",
+                                     text="||<-",
                                      state="disabled",
                                      font=("consolas", 13, "bold"),
                                      background="light green",
                                      activebackground="green",
-                                     width=10,
+                                     width=6,
                                      command=self.restart_game)
 
+        self.button_end = Button(self.button_frame,
+                                 text="->||",
+                                 state="normal",
+                                 font=("consolas", 13, "bold"),
+                                 background="light green",
+                                 activebackground="green",
+                                 width=6,
+                                 command=self.jump_to_end)
+
+        # slider to jump to any round ----------------------------------------------------------------------------------
+        self.slider = Scale(master=self,
+                            from_=0,
+                            to=self.game_loader.moves_length,
+                            orient="horizontal",
+                            showvalue=False,
+                            background="light grey",
+                            highlightthickness=0,
+                            command=self.slider_moved)
+
         # next move display label initialization -----------------------------------------------------------------------
         self.label_frame = Frame(master=self, bg="light grey")
         self.next_move_display = Label(self.label_frame,
@@ -281,7 +426,7 @@ class GUI(Tk):
                                        width=28, height=2)
 
         # initialization of InfoFrame with the game info ---------------------------------------------------------------
-        self.info_frame = InfoFrame(self, game_dict)
+        self.info_frame = InfoFrame(self, game_dict, command=self.jump_to)
 
         # initialization of CapturedPieceFrame with captured pieces ----------------------------------------------------
         self.captured_pieces = CapturedPieces(self, self.game_loader.captured_diff_per_round)
@@ -291,233 +436,214 @@ class GUI(Tk):
 
     def update_gui_board(self):
         """
-        Updates the chess board after every move
+        Updates the chess board after every move (only the pieces that changed get updated)
         """
         # the screenshots_per_round list attribute of game_loader contains lists with the positions of each piece
         # for each round
-        # each dictionary is looped through and the board gets updated with the new piece positions
-        for piece in self.game_loader.screenshots_per_round[self.game_loader.round]:
-            match piece["name"]:
-                case "  ":
-                    self.board[piece["row"]][piece["col"]].config(image=self.blank)
-                case "pb":
-                    self.board[piece["row"]][piece["col"]].config(image=self.pb_image)
-                case "pw":
-                    self.board[piece["row"]][piece["col"]].config(image=self.pw_image)
-                case "rb":
-                    self.board[piece["row"]][piece["col"]].config(image=self.rb_image)
-                case "nb":
-                    self.board[piece["row"]][piece["col"]].config(image=self.nb_image)
-                case "bb":
-                    self.board[piece["row"]][piece["col"]].config(image=self.bb_image)
-                case "qb":
-                    self.board[piece["row"]][piece["col"]].config(image=self.qb_image)
-                case "rw":
-                    self.board[piece["row"]][piece["col"]].config(image=self.rw_image)
-                case "nw":
-                    self.board[piece["row"]][piece["col"]].config(image=self.nw_image)
-                case "bw":
-                    self.board[piece["row"]][piece["col"]].config(image=self.bw_image)
-                case "qw":
-                    self.board[piece["row"]][piece["col"]].config(image=self.qw_image)
-                case "kb":
-                    if self.game_loader.check_per_round[self.game_loader.round] == "b":
-                        self.board[piece["row"]][piece["col"]].config(image=self.kb_checked)
-                    else:
-                        self.board[piece["row"]][piece["col"]].config(image=self.kb_image)
-                case "kw":
-                    if self.game_loader.check_per_round[self.game_loader.round] == "w":
-                        self.board[piece["row"]][piece["col"]].config(image=self.kw_checked)
-                    else:
-                        self.board[piece["row"]][piece["col"]].config(image=self.kw_image)
-
-    def show_traces(self, backwards: bool = False) -> None:
-        """
-        Show the traces of the piece that is to move, if going to previous move, the backwards arg must be activated
-
-        ...
+        self.board.show_position(self.game_loader.screenshots_per_round[self.game_loader.round],
+                                 self.game_loader.check_per_round[self.game_loader.round])
 
-        Parameters:
-        -----------
-            backwards (bool) default=False:
-                if True, the traces of previous move will be shown
+    def show_traces(self) -> None:
+        """
+        Shows the traces (source and destination square) of the move that led to the current round
         """
+        # self.game_loader.background_tracers[self.game_loader.round + 1] is a tuple containing tuples with dest and
+        # src co-ordinates of the piece that moved (empty tuple in the first round)
+        tracers = self.game_loader.background_tracers[self.game_loader.round + 1]
         # only show traces if the traces var is set as true
         if self.show_traces_var.get():
-            # removing old traces from board
-            self.remove_old_traces()
-            # if going backwards, the traces shown must be from previous round
-            index_ = 0 if backwards else 2
             # colours for dest and source square
-            colour = ('purple', 'violet')
-            # index (used to change colour)
-            i = 0
-            try:
-                for tuple_ in self.game_loader.background_tracers[self.game_loader.round + index_]:
-                    row = tuple_[0]
-                    col = tuple_[1]
-                    self.board[row][col].config(bg=colour[i])
-                    if row == 7:
-                        self.__row_labels[col].config(bg=colour[i])
-                    if col == 7:
-                        self.__col_labels[row].config(bg=colour[i])
-                    i += 1
-            except IndexError:
-                # index error is raised when going backwards to first move, where no traces can be retrieved from
-                # previous rounds (because there are not any)
-                pass
+            self.board.highlight(tracers, ('purple', 'violet'))
+        if self.show_arrows_var.get() and tracers:
+            self.board.show_arrow(src=tracers[1], dest=tracers[0])
 
     def remove_old_traces(self) -> None:
         """
         Removes old traces from the board and sets the background back to original colours
         """
-        # self.game_loader.background_tracers[self.game_loader.round + 1] is a tuple containing tuples with src and dest
-        # co-ordinates of the piece that moved
-        # the co-ordinates of the previous move are set back to original colours
-        for tuple_ in self.game_loader.background_tracers[self.game_loader.round + 1]:
-            row = tuple_[0]
-            col = tuple_[1]
-            if (row + col) % 2 == 0:
-                self.board[row][col].config(bg="#EEEED2")
-                # if file and rank indexes were changed, they get their original colour, too
-                if col == 7:
-                    self.__col_labels[row].config(bg="#EEEED2")
-                if row == 7:
-                    self.__row_labels[col].config(bg="#EEEED2")
-            else:
-                self.board[row][col].config(bg="#47473C")
-                # if file and rank indexes were changed, they get their original colour, too
-                if col == 7:
-                    self.__col_labels[row].config(bg="#47473C")
-                if row == 7:
-                    self.__row_labels[col].config(bg="#47473C")
+        self.board.clear_highlights()
+        self.board.clear_arrows()
+
+    def redraw_traces(self) -> None:
+        """
+        Removes the traces of the current round and shows them again based on the traces/arrows variables
+        """
+        self.remove_old_traces()
+        self.show_traces()
 
     def invert_tracer_var(self) -> None:
         """
         Inverts the tracer variable for the 'Hide Traces' check-button in file sub-menu
         """
         self.show_traces_var.set(not self.show_traces_var.get())
-        self.remove_old_traces()
+        self.redraw_traces()
 
     def load_next(self):
         """
-        Continues to the next move and enables/disables control buttons based on the current round
+        Continues to the next move, if it has already been replayed
         """
-        # showing new tracers on the board
-        self.show_traces()
-        # previous move and restart buttons get activated (if previously disabled)
-        self.button_prev.config(state="normal")
-        self.button_restart.config(state="normal")
-        self.__starting_move = False
-
-        try:
-            # advance to next move
-            self.game_loader.next_move()
-        except PositionReached:
-            self.game_loader.next_move(force=True)
-            # next move button and autoplay checkbutton get disabled
-            self.button_next.config(state="disabled")
-            self.checkbutton_var.set(0)
-            self.file_menu.entryconfig(index=0, state="disabled")
-            self.__ending_move = True
-
-        # sound playback
-        if self.game_loader.captures_per_round[self.game_loader.round]:
-            mixer.music.load('sound_effects\\capture_sound.mp3')
-            mixer.music.play(loops=0)
-        else:
-            mixer.music.load('sound_effects\\move_sound.mp3')
-            mixer.music.play(loops=0)
-
-        # board gets updated
-        self.update_gui_board()
-
-        # next move display gets updated
-        self.next_move_display.config(text=self.text_config(),
-                                      width=28,
-                                      fg="red" if self.__ending_move else "black")
-
-        # cap frame gets updated
-        self.captured_pieces.forward_captured_piece_frames()
+        # the next move has not been replayed yet (the button gets enabled again by replay_next_chunk)
+        if self.__ending_move or not self.next_move_is_ready():
+            return
+        self.jump_to(self.game_loader.round + 1)
 
     def load_previous(self):
         """
-        Goes back to previous move and enables/disables control buttons based on the current round
+        Goes back to previous move
         """
-        self.show_traces(backwards=True)
-        # next move button and autoplay checkbutton get activated (if previously disabled)
-        self.button_next.config(state="normal")
-        self.file_menu.entryconfig(index=0, state="normal")
+        if self.__starting_move:
+            return
         # autoplay stops if the previous move button is pressed
         self.checkbutton_var.set(0)
-        self.__ending_move = False
+        self.jump_to(self.game_loader.round - 1, sound="previous")
 
-        try:
-            # revert to previous move
-            self.game_loader.previous_move()
-        except PositionReached:
-            self.game_loader.previous_move(force=True)
-            # previous move and restart button get disabled
-            self.button_prev.config(state="disabled")
-            self.button_restart.config(state="disabled")
-            self.__starting_move = True
-
-        # sound playback
-        mixer.music.load('sound_effects\\previous_move.mp3')
-        mixer.music.play(loops=0, fade_ms=200)
+    def restart_game(self):
+        """
+        Restarts the game
+        """
+        self.checkbutton_var.set(0)
+        self.jump_to(0, sound="restart")
 
-        # board gets updated
-        self.update_gui_board()
+    def jump_to_end(self):
+        """
+        Jumps to the final round (or to the last round replayed so far)
+        """
+        self.jump_to(self.game_loader.last_round)
 
-        # next move display gets updated
-        self.next_move_display.config(text=self.text_config(), fg="black")
+    def jump_to(self, ply: int, sound: str = "move") -> None:
+        """
+        Jumps straight to round 'ply' and renders the target position with a single board update
+        The round is limited to the moves that have been replayed so far
 
-        # cap frame gets updated
-        self.captured_pieces.backwards_captured_piece_frames()
+        ...
 
-    def restart_game(self):
-        """
-        Restarts the game and enables/disables control buttons based on the current round
+        Parameters:
+        -----------
+            ply (int):
+                round (half move) to jump to
+
+            sound (str) default="move":
+                sound to play ("move" plays the move/capture sound of the target round, "previous", "restart" or ""
+                for no sound)
         """
+        ply = max(0, min(ply, self.game_loader.plies_loaded, self.game_loader.last_round))
+        if ply == self.game_loader.round:
+            # nothing to render, the slider is set back to the current round
+            self.slider.set(ply)
+            return
+
+        # traces of the current round get removed and the traces of the target round are shown
         self.remove_old_traces()
-        # round gets set to zero
-        self.game_loader.restart_game()
-
-        # button adjustment
-        self.button_next.config(state="normal")
-        self.button_prev.config(state="disabled")
-        self.button_restart.config(state="disabled")
-        self.file_menu.entryconfig(index=0, state="normal")
-        self.checkbutton_var.set(0)
-        self.__ending_move = False
-        self.__starting_move = True
+        self.game_loader.goto(ply)
+        self.show_traces()
 
-        # sound playback
-        mixer.music.load('sound_effects\\restart.mp3')
-        mixer.music.play(loops=0)
+        # buttons get enabled/disabled based on the new round
+        self.update_controls()
+
+        # sound playback (the sound effects are preloaded in memory by the sound player)
+        if self.sound_var.get():
+            if sound == "move":
+                SoundPlayer.play("capture" if self.game_loader.captures_per_round[ply] else "move")
+            elif sound == "previous":
+                SoundPlayer.play("previous", fade_ms=200)
+            elif sound == "restart":
+                SoundPlayer.play("restart")
 
         # board gets updated
         self.update_gui_board()
 
         # next move display gets updated
-        self.next_move_display.config(text=self.text_config(), width=28, fg="black")
+        self.next_move_display.config(text=self.text_config(), width=28, fg="red" if self.__ending_move else "black")
+
+        # cap frame, moves list and slider get updated
+        self.captured_pieces.goto(ply)
+        self.info_frame.highlight_move(ply)
+        self.slider.set(ply)
+        self.show_opening_moves()
+
+    def slider_moved(self, value: str) -> None:
+        """
+        Jumps to the round selected with the slider
 
-        # cap frame gets updated
-        self.captured_pieces.restart_captured_piece_frames()
+        ...
+
+        Parameters:
+        -----------
+            value (str):
+                value of the slider
+        """
+        self.jump_to(int(value))
+
+    def update_controls(self) -> None:
+        """
+        Enables/disables the control buttons and the autoplay checkbutton based on the current round
+        """
+        self.__starting_move = self.game_loader.round == 0
+        self.__ending_move = self.game_loader.round == self.game_loader.last_round
+
+        self.button_prev.config(state="disabled" if self.__starting_move else "normal")
+        self.button_restart.config(state="disabled" if self.__starting_move else "normal")
+        if self.__ending_move:
+            # next move buttons and autoplay checkbutton get disabled
+            self.button_next.config(state="disabled")
+            self.button_end.config(state="disabled")
+            self.checkbutton_var.set(0)
+            self.file_menu.entryconfig(index=0, state="disabled")
+        else:
+            self.button_next.config(state="normal" if self.next_move_is_ready() else "disabled")
+            self.button_end.config(state="normal" if self.next_move_is_ready() else "disabled")
+            self.file_menu.entryconfig(index=0, state="normal")
 
     def autoplay(self):
         """
-        Performs next move every one second until canceled or a previous move button is pressed
+        Starts autoplay (if the autoplay checkbutton is active) or cancels it
         """
         # if checkbutton is set to 1 (active)...
         if self.checkbutton_var.get() == 1:
-            # ... the next move is performed ...
-            self.load_next()
-            # ... and then again after 1200 milliseconds
-            self.__identifier_for_after_method = self.after(self.radiobutton_var.get(), self.autoplay)
+            # ... a pending tick of a previous autoplay gets canceled ...
+            if self.__identifier_for_after_method:
+                self.after_cancel(self.__identifier_for_after_method)
+            # ... and the timing starts from the current round, the first move is performed immediately
+            self.__autoplay_interval = 0
+            self.autoplay_tick()
         # if checkbutton is off and an after() method is active, it gets canceled
         elif self.__identifier_for_after_method:
             self.after_cancel(self.__identifier_for_after_method)
+            self.__identifier_for_after_method = ""
+
+    def autoplay_tick(self) -> None:
+        """
+        Performs the moves that are due since autoplay started and schedules itself for the next deadline
+        The deadlines are computed from the time autoplay started (the time spent rendering does not add up), and if the
+        window falls behind, the intermediate rounds are skipped and only the due round is rendered
+        """
+        self.__identifier_for_after_method = ""
+        if self.checkbutton_var.get() != 1:
+            return
+
+        now = perf_counter()
+        if self.radiobutton_var.get() != self.__autoplay_interval:
+            # autoplay started or the speed changed, the timing starts again from the current round
+            self.__autoplay_interval = self.radiobutton_var.get()
+            self.__autoplay_start_time = now - self.__autoplay_interval / 1000
+            self.__autoplay_start_round = self.game_loader.round
+        interval = self.__autoplay_interval / 1000
+
+        # round that is due by now (limited to the moves that have been replayed)
+        due = self.__autoplay_start_round + int((now - self.__autoplay_start_time) / interval)
+        if due > self.game_loader.round and self.next_move_is_ready():
+            # the move sound is only played for single steps at normal speeds
+            single_step = due == self.game_loader.round + 1 and interval >= self.SOUND_MIN_INTERVAL
+            self.jump_to(due, sound="move" if single_step else "")
+        if self.__ending_move:
+            # autoplay stops at the final move
+            return
+
+        # next deadline
+        next_due = max(due, self.game_loader.round) + 1
+        deadline = self.__autoplay_start_time + (next_due - self.__autoplay_start_round) * interval
+        delay = max(1, round((deadline - perf_counter()) * 1000))
+        self.__identifier_for_after_method = self.after(delay, self.autoplay_tick)
 
     def text_config(self) -> str:
         """
@@ -535,9 +661,11 @@ class GUI(Tk):
             to_play = "White to play: " if cur_round % 2 == 0 else "Black to play: "
             self.__ending_move = False
             return to_play + str((cur_round // 2) + 1) + ". " + self.game_loader.moves[cur_round]
-        else:
-            # if in ending move, the game result gets displayed
-            return self.__result
+        if self.game_loader.replay_error is not None:
+            # the game could not be replayed further, the error gets displayed instead of the result
+            return str(self.game_loader.replay_error)
+        # if in ending move, the game result gets displayed
+        return self.__result
 
     def show_controls(self):
         """
@@ -545,11 +673,15 @@ class GUI(Tk):
         """
         showinfo(master=self,
                  title="Help",
-                 message="Right arrow (---->) button or <Right-Key> for next move\n"
-                         "Left arrow (<----) button or <Left-Key> for previous move\n"
-                         "Reset arrow (||<--) button or <Down-Key>  to reset the board\n",
+                 message="Right arrow (--->) button or <Right-Key> for next move\n"
+                         "Left arrow (<---) button or <Left-Key> for previous move\n"
+                         "Reset arrow (||<-) button or <Down-Key>/<Home-Key> to reset the board\n"
+                         "End arrow (->||) button or <End-Key> to jump to the final move\n"
+                         "Click on a move or drag the slider to jump to any move\n",
                  detail="You can also toggle autoplay (on/off) from the File menu\n"
-                        "or by using the <Up-Key> (speed selection also available)")
+                        "or by using the <Up-Key> (speed selection also available)\n"
+                        "Find Position (File menu) lists the games of the library that reached the current position\n"
+                        "Opening Explorer (File menu) shows the moves played from it and their results")
 
     def exit(self):
         """
@@ -559,23 +691,67 @@ class GUI(Tk):
             if self.__identifier_for_after_method:
                 # if after() method is active, it gets canceled
                 self.after_cancel(self.__identifier_for_after_method)
+            if self.__identifier_for_replay:
+                # the replay of the remaining moves gets canceled, too
+                self.after_cancel(self.__identifier_for_replay)
+            if self.__identifier_for_key_render:
+                self.after_cancel(self.__identifier_for_key_render)
+            if self.__position_task is not None:
+                self.__position_task.cancel()
+            if self.__tree_task is not None:
+                self.__tree_task.cancel()
+            # the images stay in the registry for the other game windows
             self.destroy()
 
     def right_key_bind(self, event):
         """
         Performs the next move through key-event <right-arrow>, except if in last move
         """
-        if self.__ending_move:
-            return
-        self.load_next()
+        self.navigate_by_key(1)
 
     def left_key_bind(self, event):
         """
         Performs the previous move through key-event <left-arrow>, except if in first move
         """
-        if self.__starting_move:
+        self.navigate_by_key(-1)
+
+    def navigate_by_key(self, step: int) -> None:
+        """
+        Adds a step to the round requested through the arrow keys
+        The first key press is rendered immediately, the presses that arrive while a frame is being shown (e.g. a held
+        key repeating) are coalesced and rendered as a single jump in the next frame
+
+        ...
+
+        Parameters:
+        -----------
+            step (int):
+                +1 for next move, -1 for previous move
+        """
+        base = self.game_loader.round if self.__key_target is None else self.__key_target
+        self.__key_target = max(0, min(base + step, self.game_loader.plies_loaded, self.game_loader.last_round))
+        if not self.__identifier_for_key_render:
+            self.render_key_target()
+
+    def render_key_target(self) -> None:
+        """
+        Jumps to the round requested through the arrow keys (if any) and waits for one frame before rendering the
+        following request
+        """
+        self.__identifier_for_key_render = ""
+        target = self.__key_target
+        self.__key_target = None
+        if target is None or target == self.game_loader.round:
             return
-        self.load_previous()
+
+        step = target - self.game_loader.round
+        if step < 0:
+            # autoplay stops if going backwards
+            self.checkbutton_var.set(0)
+            self.jump_to(target, sound="previous" if step == -1 else "")
+        else:
+            self.jump_to(target, sound="move" if step == 1 else "")
+        self.__identifier_for_key_render = self.after(self.KEY_FRAME_MS, self.render_key_target)
 
     def down_key_bind(self, event):
         """
@@ -585,6 +761,14 @@ class GUI(Tk):
             return
         self.restart_game()
 
+    def end_key_bind(self, event):
+        """
+        Jumps to the final move through key-event <End>, except if in last move
+        """
+        if self.__ending_move:
+            return
+        self.jump_to_end()
+
     def up_key_bind(self, event):
         """
         Activates/Deactivates autoplay function through key-event <up-arrow>, except if in first move
@@ -600,79 +784,21 @@ class GUI(Tk):
             self.checkbutton_var.set(1)
             self.autoplay()
 
-    def board_config(self) -> None:
-        """
-        Configures the board by adding background colours as well as file and rank indexes for side squares
-        The labels containing the indexes for side squares are also added in lists for further modification
-        """
-        # colour setting for background
-        for row in range(8):
-            for col in range(8):
-                self.board[row][col].grid(row=row, column=col)
-                if (row + col) % 2 == 0:
-                    self.board[row][col].config(bg="#EEEED2")
-                else:
-                    self.board[row][col].config(bg="#47473C")
-
-        # file and rank indexes for side squares
-        letters = self.game_loader.files
-        numbers = self.game_loader.ranks
-        # pixel index in frame
-        position = 0
-        for num in range(8):
-            if num % 2 == 0:
-                # label with rank
-                col_l = Label(master=self.board_frame,
-                              bg="#47473C",
-                              fg="#EEEED2",
-                              font=("consolas", 10, "bold"),
-                              text=numbers[7 - num])
-                col_l.place(relx=0.97, y=position)
-                # label with file
-                row_l = Label(master=self.board_frame,
-                              bg="#47473C",
-                              fg="#EEEED2",
-                              font=("consolas", 10, "bold"),
-                              text=letters[num])
-                row_l.place(x=position, rely=0.96)
-            else:
-                # label with rank
-                col_l = Label(master=self.board_frame,
-                              bg="#EEEED2",
-                              fg="#47473C",
-                              font=("consolas", 10, "bold"),
-                              text=numbers[7 - num])
-                col_l.place(relx=0.97, y=position)
-                # label with file
-                row_l = Label(master=self.board_frame,
-                              bg="#EEEED2",
-                              fg="#47473C",
-                              font=("consolas", 10, "bold"),
-                              text=letters[num])
-                row_l.place(x=position, rely=0.96)
-            # appending labels with ranks and files to lists
-            self.__col_labels.append(col_l)
-            self.__row_labels.append(row_l)
-            # pixel position index gets added 74 pixels (60 pixels for the image and 7+7 for the padding)
-            position += 74
-
-    def image_config(self, image_name) -> PhotoImage:
-        """
-        Configures the image of each piece object
-        """
-        return PhotoImage(master=self, file=f"icons\\piece_icons\\{image_name}.png")
-
     def pack_widgets(self) -> None:
         """
         Packs the widgets in the window
         """
         # packing buttons in button frame
+        self.button_end.pack(side="right", fill="both")
         self.button_next.pack(side="right", fill="both")
         self.button_prev.pack(side="right", fill="both")
         self.button_restart.pack(side="left", fill="both")
         # button frame gets placed on grid
         self.button_frame.grid(row=2, column=1, sticky="news")
 
+        # slider gets placed under the board
+        self.slider.grid(row=3, column=0, columnspan=2, sticky="ew")
+
         # label placement
         self.next_move_display.pack(fill="both")
         self.label_frame.grid(row=1, column=1, sticky="ews")
@@ -695,20 +821,337 @@ class GUI(Tk):
         self.bind(sequence='<Left>', func=self.left_key_bind)
         self.bind(sequence="<Down>", func=self.down_key_bind)
         self.bind(sequence="<Up>", func=self.up_key_bind)
+        self.bind(sequence="<Home>", func=self.down_key_bind)
+        self.bind(sequence="<End>", func=self.end_key_bind)
 
-        # activation of next move button and autoplay checkbutton
-        self.button_next.config(state="normal")
-        self.file_menu.entryconfig(index=0, state="normal")
+        # activation of next move buttons and autoplay checkbutton
+        self.update_controls()
 
         # board gets updated
         self.update_gui_board()
 
         # next move display gets updated
-        self.next_move_display.config(text=self.text_config(), fg="black")
+        self.next_move_display.config(text=self.text_config(), fg="red" if self.__ending_move else "black")
+        self.info_frame.highlight_move(self.game_loader.round)
 
         # widget packing
         self.pack_widgets()
         # yes/no window for exit confirmation
         self.protocol("WM_DELETE_WINDOW", self.exit)
-        # window mainloop
-        self.mainloop()
+        # the moves that have not been replayed yet get replayed in chunks, while the window is already shown
+        if not self.game_loader.fully_loaded:
+            self.__identifier_for_replay = self.after(1, self.replay_next_chunk)
+        # the window is run by the mainloop of the main window
+
+    def replay_next_chunk(self) -> None:
+        """
+        Replays the next chunk of moves through the GameLoader object and re-schedules itself until the whole game has
+        been replayed
+        Errors of the replay are reported to the user as soon as they occur
+        """
+        self.__identifier_for_replay = ""
+        try:
+            self.game_loader.load_plies(self.REPLAY_CHUNK)
+        except (FalseGame, FriendlyCapture) as v:
+            # the game ends at the last move that could be replayed
+            self.update_controls()
+            if self.__ending_move:
+                self.next_move_display.config(text=self.text_config(), fg="red")
+            showerror(master=self, title="Error", message=str(v))
+            return
+
+        # the next move is now available
+        self.update_controls()
+
+        if not self.game_loader.fully_loaded:
+            self.__identifier_for_replay = self.after(1, self.replay_next_chunk)
+        elif self.game_cache is not None:
+            # the whole game has been replayed and is stored for the next time it is opened
+            self.game_cache.store(self.game_loader)
+
+    def next_move_is_ready(self) -> bool:
+        """
+        Returns True if the move after the current round has already been replayed
+
+        ...
+
+        Returns:
+        --------
+            (bool):
+                True if the next move can be displayed
+        """
+        return self.game_loader.plies_loaded > self.game_loader.round
+
+    def find_position(self) -> None:
+        """
+        Searches the library for the games that reached the current position (the new and changed files are imported
+        into the game database and their games replayed into the position index first, in a worker thread)
+        """
+        if self.__position_task is not None:
+            # a search is already running
+            return
+        root = self.master
+        ply = self.game_loader.round
+        key = PositionIndex.screenshot_key(self.game_loader.screenshots_per_round[ply], ply)
+        files = {name: root.catalogue.file_path(name) for name in root.catalogue.scan(index=False)}
+
+        self.config(cursor="watch")
+        # the task is stopped between two batches of games if the window is closed
+        task = BackgroundTask(self, lambda: self.search_library(root.position_index, files, key, task),
+                              on_done=self.position_found, on_error=self.position_failed,
+                              on_progress=self.library_progress)
+        self.__position_task = task
+        task.start()
+
+    @staticmethod
+    def search_library(position_index: PositionIndex, files: dict[str, str], key: int,
+                       task: BackgroundTask) -> tuple[list[tuple[int, int]], list[str]]:
+        """
+        Imports the new and changed files into the game database, indexes the positions of their games and returns
+        the games that reached a position (runs in a worker thread)
+
+        ...
+
+        Parameters:
+        -----------
+            position_index (PositionIndex):
+                position index of the game database
+
+            files (dict[str, str]):
+                address of each pgn file of the library by its path relative to the library directory
+
+            key (int):
+                hash of the position
+
+            task (BackgroundTask):
+                task running the search (its token stops the update, the progress is reported through it)
+
+        Returns:
+        --------
+            (tuple[list[tuple[int, int]], list[str]]):
+                id of each game and round it reached the position, and the files that could not be imported
+
+        Raises:
+        -------
+            OSError (Exception):
+                the database could not be read or written
+        """
+        failed = GUI.update_library(position_index, files, task)
+        try:
+            return position_index.search(key), failed
+        except DatabaseError as e:
+            raise OSError(e)
+
+    @staticmethod
+    def update_library(position_index: PositionIndex, files: dict[str, str], task: BackgroundTask) -> list[str]:
+        """
+        Imports the new and changed files into the game database and replays their games into the position index and
+        the opening tree (runs in a worker thread)
+
+        ...
+
+        Parameters:
+        -----------
+            position_index (PositionIndex):
+                position index of the game database
+
+            files (dict[str, str]):
+                address of each pgn file of the library by its path relative to the library directory
+
+            task (BackgroundTask):
+                task running the update (its token stops the update, the progress is reported through it)
+
+        Returns:
+        --------
+            (list[str]):
+                names of the files that could not be imported
+
+        Raises:
+        -------
+            OSError (Exception):
+                the database could not be read or written
+        """
+        try:
+            # both hold the lock of the database, the update only for one batch of games at a time (so the library can
+            # be queried meanwhile)
+            failed = position_index.database.sync(files)
+            position_index.update(token=task.token, on_progress=task.report)
+        except DatabaseError as e:
+            raise OSError(e)
+        return failed
+
+    def position_found(self, result: tuple[list[tuple[int, int]], list[str]]) -> None:
+        """
+        Shows the games that reached the current position in a new window
+
+        ...
+
+        Parameters:
+        -----------
+            result (tuple[list[tuple[int, int]], list[str]]):
+                id of each game and round it reached the position, and the files that could not be imported
+        """
+        self.__position_task = None
+        self.library_label.grid_forget()
+        self.config(cursor="")
+        results, failed = result
+        self.report_failed_files(failed)
+        # the search updated the library, so the opening tree is up to date, too
+        self.__library_updated = True
+        self.show_opening_moves()
+        if not results:
+            showinfo(master=self, title="Find Position", message="No game of the library reached this position")
+            return
+        PositionSearch(self, self.master.database, results, on_open=self.open_game_at)
+
+    def position_failed(self, error: Exception) -> None:
+        """
+        Shows why the library could not be searched
+
+        ...
+
+        Parameters:
+        -----------
+            error (Exception):
+                exception raised while searching
+        """
+        self.__position_task = None
+        self.library_label.grid_forget()
+        self.config(cursor="")
+        showerror(master=self, title="Error", message=f"The library could not be searched\n{error}")
+
+    def report_failed_files(self, failed: list[str]) -> None:
+        """
+        Tells the user which files of the library could not be imported (their games are missing from the searches)
+
+        ...
+
+        Parameters:
+        -----------
+            failed (list[str]):
+                names of the files that could not be imported
+        """
+        if failed:
+            showwarning(master=self, title="Library", message="These files could not be imported, their games are not "
+                                                              "searched:\n" + "\n".join(failed))
+
+    def library_progress(self, done: int, total: int) -> None:
+        """
+        Shows the progress of the library update under the window (hidden once no update of this window is running)
+
+        ...
+
+        Parameters:
+        -----------
+            done (int):
+                number of games indexed so far
+
+            total (int):
+                number of games to index
+        """
+        if done < total and (self.__position_task is not None or self.__tree_task is not None):
+            self.library_label.config(text=f"Indexing library... {done}/{total} games")
+            self.library_label.grid(row=5, column=0, columnspan=2, sticky="ew")
+        else:
+            self.library_label.grid_forget()
+
+    def open_game_at(self, game_id: int, ply: int) -> None:
+        """
+        Opens a game of the game database in a new window at a round (the game is replayed up to that round first)
+
+        ...
+
+        Parameters:
+        -----------
+            game_id (int):
+                id of the game
+
+            ply (int):
+                round to show
+        """
+        try:
+            game_dict = self.master.database.get_info(game_id)
+        except KeyError:
+            # the file of the game has been imported again since the search
+            showerror(master=self, title="Error", message="The game is no longer in the library")
+            return
+        try:
+            game_loader = self.master.game_cache.get_game_loader(game_dict["moves"])
+            game_loader.load_plies(max(0, ply - game_loader.plies_loaded))
+        except (NoMovesFound, FalseGame, FriendlyCapture) as v:
+            showerror(master=self, title="Error", message=str(v))
+            return
+        # the window opens silently at the round of the position
+        GUI(self.master, game_loader, game_dict, game_cache=self.game_cache).jump_to(ply, sound="")
+
+    def toggle_opening_panel(self) -> None:
+        """
+        Shows/hides the opening explorer under the slider, the library is updated (in a worker thread) the first time
+        it is shown
+        """
+        if not self.opening_var.get():
+            if self.opening_panel is not None:
+                self.opening_panel.grid_forget()
+            return
+
+        if self.opening_panel is None:
+            self.opening_panel = OpeningPanel(self, self.master.position_index.tree)
+        self.opening_panel.grid(row=4, column=0, columnspan=2, sticky="ew")
+        if self.__library_updated:
+            self.show_opening_moves()
+        elif self.__tree_task is None:
+            root = self.master
+            files = {name: root.catalogue.file_path(name) for name in root.catalogue.scan(index=False)}
+            self.opening_panel.show_message("Opening explorer: updating the library...")
+            task = BackgroundTask(self, lambda: self.update_library(root.position_index, files, task),
+                                  on_done=self.tree_updated, on_error=self.tree_failed,
+                                  on_progress=self.library_progress)
+            self.__tree_task = task
+            task.start()
+
+    def tree_updated(self, failed: list[str]) -> None:
+        """
+        Shows the opening explorer once the library has been updated
+
+        ...
+
+        Parameters:
+        -----------
+            failed (list[str]):
+                names of the files that could not be imported
+        """
+        self.__tree_task = None
+        self.library_label.grid_forget()
+        self.__library_updated = True
+        self.show_opening_moves()
+        self.report_failed_files(failed)
+
+    def tree_failed(self, error: Exception) -> None:
+        """
+        Shows why the opening tree could not be updated
+
+        ...
+
+        Parameters:
+        -----------
+            error (Exception):
+                exception raised while updating
+        """
+        self.__tree_task = None
+        self.library_label.grid_forget()
+        if self.opening_panel is not None:
+            self.opening_panel.show_message("Opening explorer: the library could not be updated")
+        showerror(master=self, title="Error", message=f"The opening tree could not be updated\n{error}")
+
+    def show_opening_moves(self) -> None:
+        """
+        Shows the moves played from the current position in the opening explorer (if it is shown and up to date)
+        """
+        if self.opening_panel is None or not self.opening_var.get() or not self.__library_updated:
+            return
+        ply = self.game_loader.round
+        key = PositionIndex.screenshot_key(self.game_loader.screenshots_per_round[ply], ply)
+        try:
+            self.opening_panel.show(key, ply)
+        except DatabaseError:
+            self.opening_panel.show_message("Opening explorer: the library could not be read")
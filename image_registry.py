@@ -0,0 +1,213 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# image_registry.py: includes class ImageRegistry                                                                      #
+# -------------------------------------------------------------------------------------------------------------------- #
+from base64 import b64encode
+from math import gcd
+from tkinter import PhotoImage
+
+
+class ImageRegistry:
+    """
+    Process-wide registry of the icons used by the game windows
+    Every icon file is read from disk once per process and every PhotoImage is decoded once per Tk interpreter (and
+    size), so that opening another game window does not load any images again
+    Scaled variants of the piece icons (for different board sizes) are created from the decoded icons on request
+
+    ...
+
+    Attributes:
+    -----------
+        PIECE_NAMES (tuple[str]):
+            names of the piece icons (the names used in the screenshots)
+
+        __data (dict[str, str]):
+            base64 contents of each icon file by path
+
+        __images (dict[tuple, PhotoImage]):
+            decoded images by (Tk interpreter, path, size)
+
+    Methods:
+    --------
+        @classmethod
+        get(cls, master, path: str, size: int | None = None) -> PhotoImage:
+            returns the (scaled) image of an icon file
+
+        @classmethod
+        piece_images(cls, master, size: int = 60) -> dict[str, PhotoImage]:
+            returns the images of the board pieces by piece name
+
+        @classmethod
+        captured_piece_images(cls, master) -> dict[str, PhotoImage]:
+            returns the images of the captured pieces frames
+
+        @classmethod
+        preload(cls, master, sizes: tuple = (60,)) -> None:
+            decodes (and scales) the piece icons before they are needed
+
+        @classmethod
+        release(cls, master) -> None:
+            drops the images of a Tk interpreter that is about to be destroyed
+
+        @staticmethod
+        __read(path: str) -> str:
+            returns the base64 contents of an icon file
+    """
+
+    # names of the piece icons (the names used in the screenshots)
+    PIECE_NAMES = ("rb", "nb", "bb", "qb", "kb", "pb", "rw", "nw", "bw", "qw", "kw", "pw", "kb_checked", "kw_checked")
+
+    __data: dict[str, str] = {}
+    __images: dict[tuple, PhotoImage] = {}
+
+    @classmethod
+    def get(cls, master, path: str, size: int | None = None) -> PhotoImage:
+        """
+        Returns the image of an icon file, decoded once for the Tk interpreter of master
+        If size is given, a variant scaled to size x size pixels is returned
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                any widget of the Tk interpreter that will show the image
+
+            path (str):
+                path of the icon file
+
+            size (int | None) default=None:
+                width/height of the scaled variant (None for the original size)
+
+        Returns:
+        --------
+            (PhotoImage):
+                the decoded image
+        """
+        key = (master.tk, path, size)
+        image = cls.__images.get(key)
+        if image is not None:
+            return image
+
+        if size is None:
+            image = PhotoImage(master=master, data=cls.__read(path))
+        else:
+            original = cls.get(master, path)
+            width = original.width()
+            if width == size:
+                image = original
+            else:
+                # zoom and subsample only accept integers, so the smallest integer ratio is used
+                divisor = gcd(size, width)
+                image = original.zoom(size // divisor).subsample(width // divisor)
+        cls.__images[key] = image
+        return image
+
+    @classmethod
+    def piece_images(cls, master, size: int = 60) -> dict[str, PhotoImage]:
+        """
+        Returns the images of the board pieces by the piece name of the screenshots ("  " for empty squares, checked
+        kings as 'kw_checked'/'kb_checked')
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                any widget of the Tk interpreter that will show the images
+
+            size (int) default=60:
+                width/height of the images
+
+        Returns:
+        --------
+            (dict[str, PhotoImage]):
+                images by piece name
+        """
+        images = {"  ": cls.get(master, "icons\\piece_icons\\BLANK_ICON.png", size)}
+        for name in cls.PIECE_NAMES:
+            images[name] = cls.get(master, f"icons\\piece_icons\\{name}.png", size)
+        return images
+
+    @classmethod
+    def captured_piece_images(cls, master) -> dict[str, PhotoImage]:
+        """
+        Returns the images of the captured pieces frames by the first letter of each piece ("blank" for empty labels)
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                any widget of the Tk interpreter that will show the images
+
+        Returns:
+        --------
+            (dict[str, PhotoImage]):
+                images by piece letter
+        """
+        return {"p": cls.get(master, "icons\\basic\\pawn.png"),
+                "n": cls.get(master, "icons\\basic\\knight.png"),
+                "b": cls.get(master, "icons\\basic\\bishop.png"),
+                "r": cls.get(master, "icons\\basic\\rook.png"),
+                "q": cls.get(master, "icons\\basic\\queen.png"),
+                "blank": cls.get(master, "icons\\basic\\blank.png")}
+
+    @classmethod
+    def preload(cls, master, sizes: tuple = (60,)) -> None:
+        """
+        Decodes (and scales) the piece icons for each of the given sizes, so that no image has to be created when a
+        board of that size is opened
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                any widget of the Tk interpreter that will show the images
+
+            sizes (tuple[int]) default=(60,):
+                width/height of each board size variant
+        """
+        for size in sizes:
+            cls.piece_images(master, size)
+        cls.captured_piece_images(master)
+
+    @classmethod
+    def release(cls, master) -> None:
+        """
+        Drops the images of the Tk interpreter of master (called before the interpreter is destroyed)
+        The file contents are kept for the rest of the process
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                any widget of the Tk interpreter
+        """
+        for key in [key for key in cls.__images if key[0] is master.tk]:
+            del cls.__images[key]
+
+    @staticmethod
+    def __read(path: str) -> str:
+        """
+        Returns the base64 contents of an icon file (the file is read from disk only the first time)
+
+        ...
+
+        Parameters:
+        -----------
+            path (str):
+                path of the icon file
+
+        Returns:
+        --------
+            (str):
+                base64 encoded file contents
+        """
+        data = ImageRegistry.__data.get(path)
+        if data is None:
+            with open(path, "rb") as file:
+                data = b64encode(file.read()).decode()
+            ImageRegistry.__data[path] = data
+        return data
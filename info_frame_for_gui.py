@@ -8,8 +8,27 @@ class InfoFrame(Frame):
     """
     Inherits from parent class Frame and places a Text object inside with the game information
     The information is obtained from the dictionary taken as parameter
+    Clicking on a move calls the command taken as parameter with the round (half move) of that move
+
+    ...
+
+    Attributes:
+    -----------
+        command (Callable[[int], None] | None):
+            function called with the round of a clicked move
+
+        text (Text):
+            text object with the game information and moves
+
+    Methods:
+    --------
+        highlight_move(self, ply: int) -> None:
+            highlights the move that led to round 'ply'
+
+        move_clicked(self, event) -> None:
+            calls the command with the round of the clicked move
     """
-    def __init__(self, master, info_dictionary: dict):
+    def __init__(self, master, info_dictionary: dict, command=None):
         """
         Initializes the frame
 
@@ -22,44 +41,30 @@ class InfoFrame(Frame):
 
             info_dictionary (dict):
                 dictionary with game information
+
+            command (Callable[[int], None]) default=None:
+                function called with the round of a clicked move
         """
         # initialization of parent class (Frame)
         super().__init__(master=master)
         self.config(bg="light grey")
+        self.command = command
 
         # storing the moves in variable 'moves' for easier access
         moves = info_dictionary['moves']
         # initialization of counter
         cnt = 1
-        # initialization of list to store moves and round indexes
+        # initialization of list to store moves and round indexes (with the round each move leads to, None for indexes)
         moves_numbered = []
         # loop through the moves list items
         for i in range(len(moves)):
             if cnt % 1 == 0:
                 # round index added every two moves
-                moves_numbered.append(str(int(cnt)) + ".")
+                moves_numbered.append((str(int(cnt)) + ".", None))
             # move gets added to list
-            moves_numbered.append(moves[i])
+            moves_numbered.append((moves[i], i + 1))
             cnt += 0.5
 
-        # initialization of string to show
-        moves_str = ""
-        number_of_items_per_line = 3
-        start = 0
-        end = number_of_items_per_line
-        # non-ending loop to access all items in list
-        while True:
-            try:
-                for i in range(start, end):
-                    # adding round index and moves in each line
-                    moves_str += moves_numbered[i]
-                    moves_str += "  "
-                moves_str += "\n"
-                start += number_of_items_per_line
-                end += number_of_items_per_line
-            except IndexError:
-                break
-
         # string with game info to show
         text_to_show = f"Event: {info_dictionary['Event']}\n" \
                        f"Site: {info_dictionary['Site']}\n" \
@@ -68,13 +73,66 @@ class InfoFrame(Frame):
                        f"White: {info_dictionary['White']}\n" \
                        f"Black: {info_dictionary['Black']}\n" \
                        f"Result: {info_dictionary['Result']}\n" \
-                       f"Rounds Played: {info_dictionary['RoundsPlayed']}\n" \
-                       f"\n{moves_str + ' ' + info_dictionary['Result']}"
+                       f"Rounds Played: {info_dictionary['RoundsPlayed']}\n\n"
 
         # placing in the frame
-        text = Text(self, background="light grey", relief="flat", width=39, height=38)
-        text.insert(index=0.0, chars=text_to_show)
-        scrollbar = Scrollbar(master=self, command=text.yview)
-        text.config(state="disabled", yscrollcommand=scrollbar.set)
-        text.pack(fill="both", side="left")
+        self.text = Text(self, background="light grey", relief="flat", width=39, height=38)
+        self.text.insert(index="end", chars=text_to_show)
+
+        # adding round indexes and moves (three items in each line), each move gets tagged with its round
+        number_of_items_per_line = 3
+        for i, (item, ply) in enumerate(moves_numbered):
+            if ply is None:
+                self.text.insert("end", item)
+            else:
+                self.text.insert("end", item, ("move", f"ply{ply}"))
+            self.text.insert("end", "  ")
+            if (i + 1) % number_of_items_per_line == 0:
+                self.text.insert("end", "\n")
+        self.text.insert("end", " " + info_dictionary['Result'])
+
+        # moves can be clicked
+        self.text.tag_config("highlighted", background="light green")
+        self.text.tag_bind("move", "<Button-1>", self.move_clicked)
+        self.text.tag_bind("move", "<Enter>", lambda event: self.text.config(cursor="hand2"))
+        self.text.tag_bind("move", "<Leave>", lambda event: self.text.config(cursor=""))
+
+        scrollbar = Scrollbar(master=self, command=self.text.yview)
+        self.text.config(state="disabled", yscrollcommand=scrollbar.set)
+        self.text.pack(fill="both", side="left")
         scrollbar.pack(fill="both", side="right")
+
+    def highlight_move(self, ply: int) -> None:
+        """
+        Highlights the move that led to round 'ply' (no move is highlighted in the first round)
+
+        ...
+
+        Parameters:
+        -----------
+            ply (int):
+                current round
+        """
+        self.text.tag_remove("highlighted", "1.0", "end")
+        ranges = self.text.tag_ranges(f"ply{ply}")
+        if ranges:
+            self.text.tag_add("highlighted", *ranges)
+            self.text.see(ranges[0])
+
+    def move_clicked(self, event) -> None:
+        """
+        Calls the command with the round of the clicked move
+
+        ...
+
+        Parameters:
+        -----------
+            event (<Button-1>):
+                click event on a move
+        """
+        if self.command is None:
+            return
+        for tag in self.text.tag_names("current"):
+            if tag.startswith("ply"):
+                self.command(int(tag[3:]))
+                return
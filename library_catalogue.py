@@ -0,0 +1,407 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# library_catalogue.py: includes class LibraryCatalogue                                                                #
+# -------------------------------------------------------------------------------------------------------------------- #
+from hashlib import sha1
+from json import dump, load
+from os import makedirs, remove, replace, stat, walk
+from os.path import basename, dirname, join, relpath
+from pgn import FilePGN, PGNBlocks
+
+
+class LibraryCatalogue:
+    """
+    Catalogue of the pgn files found in the library directory (and its sub-directories)
+    For every file, the size, the modification time, the number of games and the location of its index (the byte
+    offsets and the header information of the games) are recorded in a catalogue file, so that the file list and the
+    game counts are shown without reading the files again, and an indexed file is opened without being parsed
+    Only new files and files whose size or modification time changed are indexed again when the library is scanned
+    (or by a LibraryIndexer in the background)
+
+    ...
+
+    Attributes:
+    -----------
+        VERSION (int):
+            format version of the catalogue and the index files
+
+        HEADER_TAGS (tuple[str]):
+            header fields of the games stored in the index files
+
+        library (str):
+            path of the library directory
+
+        directory (str):
+            path of the directory with the catalogue and the index files
+
+        entries (dict[str, dict]):
+            size, mtime, games and index of each pgn file by its path relative to the library directory
+
+    Methods:
+    --------
+        scan(self, index: bool = True) -> list[str]:
+            updates the catalogue and returns the pgn files of the library
+
+        is_fresh(self, name: str) -> bool:
+            True if a pgn file is indexed and has not changed since
+
+        file_path(self, name: str) -> str:
+            returns the path of a pgn file of the catalogue
+
+        games(self, name: str) -> int | None:
+            returns the number of games of a pgn file
+
+        offsets(self, name: str) -> list[int] | None:
+            returns the byte offsets of the blocks of a pgn file
+
+        load_index(self, name: str) -> dict | None:
+            returns the byte offsets and the header information of the games of a pgn file
+
+        index_file(self, name: str) -> dict:
+            indexes a pgn file and returns its catalogue entry
+
+        add_entry(self, name: str, entry: dict) -> None:
+            records the entry of a pgn file indexed elsewhere (e.g. by a LibraryIndexer) and saves the catalogue
+
+        @staticmethod
+        index_name(name: str) -> str:
+            returns the name of the index file of a pgn file
+
+        @staticmethod
+        build_index(file_path: str, index_path: str, checkpoint=None) -> dict:
+            indexes a pgn file, writes its index file and returns its catalogue entry
+
+        __load(self) -> None:
+            loads the catalogue file
+
+        __save(self) -> None:
+            saves the catalogue file
+    """
+
+    # format version of the catalogue (catalogues of other versions are built again)
+    VERSION = 2
+
+    # header fields of the games stored in the index files (in this order)
+    HEADER_TAGS = ("Event", "Site", "Date", "Round", "White", "Black", "Result")
+
+    def __init__(self, library: str = "pgn_files", directory: str = "library_cache"):
+        """
+        Initializes the catalogue and loads the catalogue file (the library is not scanned before scan is called)
+
+        ...
+
+        Parameters:
+        -----------
+            library (str) default="pgn_files":
+                path of the library directory
+
+            directory (str) default="library_cache":
+                path of the directory with the catalogue and the index files (created if it does not exist)
+        """
+        self.library = library
+        self.directory = directory
+        self.entries: dict[str, dict] = {}
+        self.__load()
+
+    def scan(self, index: bool = True) -> list[str]:
+        """
+        Walks through the library directory (and its sub-directories), indexes the new and changed pgn files, drops
+        the deleted ones and returns the pgn files of the library
+
+        ...
+
+        Parameters:
+        -----------
+            index (bool) default=True:
+                if False, the new and changed files are not indexed (e.g. a LibraryIndexer indexes them in the
+                background) and are returned too
+
+        Returns:
+        --------
+            (list[str]):
+                paths of the pgn files relative to the library directory (sorted)
+        """
+        found = {}
+        for folder, _, file_names in walk(self.library):
+            for file_name in file_names:
+                if file_name[-4:].lower() == ".pgn":
+                    path = join(folder, file_name)
+                    found[relpath(path, self.library)] = path
+
+        changed = False
+        if index:
+            for name in found:
+                if not self.is_fresh(name):
+                    # new or changed file
+                    try:
+                        self.index_file(name)
+                    except OSError:
+                        continue
+                    changed = True
+
+        for name in [name for name in self.entries if name not in found]:
+            # deleted file, its index gets removed too
+            try:
+                remove(join(self.directory, self.entries.pop(name)["index"]))
+            except OSError:
+                pass
+            changed = True
+
+        if changed:
+            self.__save()
+        return sorted(name for name in found if name in self.entries or not index)
+
+    def file_path(self, name: str) -> str:
+        """
+        Returns the path of a pgn file of the catalogue
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (str):
+                path of the file
+        """
+        return join(self.library, name)
+
+    def games(self, name: str) -> int | None:
+        """
+        Returns the number of games of a pgn file (None if the file is not in the catalogue)
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (int | None):
+                number of games
+        """
+        entry = self.entries.get(name)
+        return None if entry is None else entry["games"]
+
+    def is_fresh(self, name: str) -> bool:
+        """
+        Returns True if a pgn file is indexed and its size and modification time have not changed since
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (bool):
+                True if the index of the file can be used
+        """
+        entry = self.entries.get(name)
+        if entry is None:
+            return False
+        try:
+            info = stat(self.file_path(name))
+        except OSError:
+            return False
+        return entry["size"] == info.st_size and entry["mtime"] == info.st_mtime
+
+    def offsets(self, name: str) -> list[int] | None:
+        """
+        Returns the byte offsets of the blocks of a pgn file (information and moves of the games, in turn) from its
+        index file (None if the file is not indexed or has changed since)
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (list[int] | None):
+                byte offset of each block
+        """
+        index = self.load_index(name)
+        return None if index is None else index["offsets"]
+
+    def load_index(self, name: str) -> dict | None:
+        """
+        Returns the byte offsets of the blocks of a pgn file and the header information of its games from its index file
+        (None if the file is not indexed or has changed since)
+        Can be called from a worker thread (the catalogue is only read)
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (dict | None):
+                'offsets': byte offset of each block, 'headers': header dictionary of each game (same keys as
+                FilePGN.parse_header)
+        """
+        entry = self.entries.get(name)
+        if entry is None or not self.is_fresh(name):
+            return None
+        try:
+            with open(join(self.directory, entry["index"]), "r") as file:
+                data = load(file)
+            if data["version"] != self.VERSION:
+                return None
+            return {"offsets": data["offsets"],
+                    "headers": [dict(zip(self.HEADER_TAGS, values)) for values in data["headers"]]}
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def index_file(self, name: str) -> dict:
+        """
+        Indexes a pgn file (byte offsets of its blocks and header information of its games), writes its index file and
+        updates its catalogue entry
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (dict):
+                catalogue entry of the file
+        """
+        entry = self.build_index(self.file_path(name), join(self.directory, self.index_name(name)))
+        self.entries[name] = entry
+        return entry
+
+    def add_entry(self, name: str, entry: dict) -> None:
+        """
+        Records the catalogue entry of a pgn file indexed elsewhere (e.g. by a LibraryIndexer) and saves the catalogue
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+            entry (dict):
+                catalogue entry of the file (from build_index)
+        """
+        self.entries[name] = entry
+        self.__save()
+
+    @staticmethod
+    def index_name(name: str) -> str:
+        """
+        Returns the name of the index file of a pgn file (the hash of its relative path)
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (str):
+                name of the index file
+        """
+        return sha1(name.encode()).hexdigest() + ".json"
+
+    @staticmethod
+    def build_index(file_path: str, index_path: str, checkpoint=None) -> dict:
+        """
+        Indexes a pgn file (byte offsets of its blocks and header information of its games), writes its index file and
+        returns its catalogue entry
+        Only reads and writes files, so it can run in a worker process
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of the pgn file
+
+            index_path (str):
+                path of the index file (its directory is created if it does not exist)
+
+            checkpoint (Callable[[], None] | None) default=None:
+                called every few hundred games (e.g. to wait while the indexing is paused, or to stop it by raising)
+
+        Returns:
+        --------
+            (dict):
+                catalogue entry of the file
+
+        Raises:
+        -------
+            OSError (Exception):
+                the pgn file could not be read
+        """
+        # the file is stat'ed first, so a file changed while being indexed is found stale next time
+        info = stat(file_path)
+        offsets = FilePGN.read_offsets(file_path)
+        with open(file_path, "rb") as pgn:
+            data = pgn.read()
+
+        # header information of each complete game
+        headers = []
+        for i in range(0, len(offsets) - 1, 2):
+            if checkpoint is not None and i % 512 == 0:
+                checkpoint()
+            header = FilePGN.parse_header(PGNBlocks.decode(data[offsets[i]:offsets[i + 1]]))
+            headers.append([header[tag] for tag in LibraryCatalogue.HEADER_TAGS])
+
+        entry = {"size": info.st_size,
+                 "mtime": info.st_mtime,
+                 "games": len(offsets) // 2,
+                 "index": basename(index_path)}
+        try:
+            makedirs(dirname(index_path) or ".", exist_ok=True)
+            # the file is written under a temporary name first, so that a half written file is never loaded
+            with open(index_path + ".tmp", "w") as file:
+                dump({"version": LibraryCatalogue.VERSION, "offsets": offsets, "headers": headers}, file,
+                     separators=(",", ":"))
+            replace(index_path + ".tmp", index_path)
+        except OSError:
+            # the catalogue is optional, the file is indexed again next time
+            pass
+        return entry
+
+    def __load(self) -> None:
+        """
+        Loads the catalogue file (a missing, damaged or old catalogue is built again by the next scan)
+        """
+        try:
+            with open(join(self.directory, "catalogue.json"), "r") as file:
+                data = load(file)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == self.VERSION:
+            self.entries = data["files"]
+
+    def __save(self) -> None:
+        """
+        Saves the catalogue file
+        """
+        try:
+            makedirs(self.directory, exist_ok=True)
+            path = join(self.directory, "catalogue.json")
+            with open(path + ".tmp", "w") as file:
+                dump({"version": self.VERSION, "files": self.entries}, file, separators=(",", ":"))
+            replace(path + ".tmp", path)
+        except OSError:
+            pass
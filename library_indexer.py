@@ -0,0 +1,304 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# library_indexer.py: includes class LibraryIndexer                                                                    #
+# -------------------------------------------------------------------------------------------------------------------- #
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import Event, cpu_count
+from os import stat
+from os.path import join
+import os
+from library_catalogue import LibraryCatalogue
+
+
+class LibraryIndexer:
+    """
+    Indexes the pgn files of the library in the background (byte offsets, header information and game counts), so
+    that a file opened for the first time is already indexed instead of being parsed on click
+    The files are indexed by a small pool of low priority processes (smallest files first, one task per file), and
+    their catalogue entries are recorded on the Tk thread (polled through after()), which also reports the progress
+    The indexing can be paused while a file is being loaded in the foreground, the workers wait at their next
+    checkpoint until it is resumed
+
+    ...
+
+    Attributes:
+    -----------
+        POLL_MS (int):
+            time between two polls of the finished files in milliseconds
+
+        master (Misc):
+            widget used for the polling
+
+        catalogue (LibraryCatalogue):
+            catalogue of the library
+
+        workers (int):
+            number of worker processes
+
+        on_progress (Callable[[int, int], None] | None):
+            called with the number of indexed files and the number of files to index after every file
+
+        done (int):
+            number of files indexed so far
+
+        total (int):
+            number of files to index
+
+        failed (list[str]):
+            files that could not be indexed by the last start (they are indexed again by the next one)
+
+        resume_event (Event | None):
+            class attribute, resume event of the indexer inside a worker process
+
+        stop_event (Event | None):
+            class attribute, stop event of the indexer inside a worker process
+
+        __resume (Event):
+            set while the indexing runs, cleared while it is paused
+
+        __stop (Event):
+            set when the indexing is stopped
+
+        __executor (ProcessPoolExecutor | None):
+            pool of the worker processes (None when no files are being indexed)
+
+        __futures (dict[Future, str]):
+            file of each pending task
+
+        __poll_id (str | None):
+            id of the scheduled poll
+
+    Methods:
+    --------
+        start(self) -> None:
+            starts indexing the new and changed files of the library
+
+        pause(self) -> None:
+            pauses the indexing
+
+        resume(self) -> None:
+            resumes the indexing
+
+        stop(self) -> None:
+            stops the indexing and the worker processes
+
+        @property
+        running(self) -> bool:
+            True while files are being indexed
+
+        @staticmethod
+        init_worker(resume_event: Event, stop_event: Event) -> None:
+            prepares a worker process
+
+        @staticmethod
+        checkpoint() -> None:
+            waits while the indexing is paused and stops a stopped one (worker process)
+
+        @staticmethod
+        index_file(file_path: str, index_path: str) -> dict:
+            indexes a pgn file (task of the worker processes)
+
+        __poll(self) -> None:
+            records the indexed files and reports the progress (Tk thread)
+    """
+
+    # time between two polls of the finished files in milliseconds
+    POLL_MS = 200
+
+    # events of the indexer inside a worker process (set by init_worker)
+    resume_event = None
+    stop_event = None
+
+    def __init__(self, master, catalogue: LibraryCatalogue, workers: int | None = None, on_progress=None):
+        """
+        Initializes the indexer (no files are indexed before start is called)
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                widget used for the polling
+
+            catalogue (LibraryCatalogue):
+                catalogue of the library
+
+            workers (int | None) default=None:
+                number of worker processes (None for one or two, leaving a processor to the window)
+
+            on_progress (Callable[[int, int], None] | None) default=None:
+                called with the number of indexed files and the number of files to index after every file
+        """
+        self.master = master
+        self.catalogue = catalogue
+        self.workers = workers if workers is not None else max(1, min(2, cpu_count() - 1))
+        self.on_progress = on_progress
+        self.done = 0
+        self.total = 0
+        self.failed = []
+
+        self.__resume = Event()
+        self.__resume.set()
+        self.__stop = Event()
+        self.__executor = None
+        self.__futures = {}
+        self.__poll_id = None
+
+    def start(self) -> None:
+        """
+        Starts indexing the new and changed files of the library (the files indexed by the catalogue are skipped)
+        """
+        if self.running:
+            return
+        pending = [name for name in self.catalogue.scan(index=False) if not self.catalogue.is_fresh(name)]
+        if not pending:
+            return
+
+        # the smallest files are indexed first, so most of the game counts are known soon
+        def size(name: str) -> int:
+            try:
+                return stat(self.catalogue.file_path(name)).st_size
+            except OSError:
+                return 0
+        pending.sort(key=size)
+
+        self.done = 0
+        self.total = len(pending)
+        self.failed = []
+        self.__executor = ProcessPoolExecutor(max_workers=self.workers, initializer=LibraryIndexer.init_worker,
+                                              initargs=(self.__resume, self.__stop))
+        for name in pending:
+            index_path = join(self.catalogue.directory, LibraryCatalogue.index_name(name))
+            future = self.__executor.submit(LibraryIndexer.index_file, self.catalogue.file_path(name), index_path)
+            self.__futures[future] = name
+
+        if self.on_progress is not None:
+            self.on_progress(self.done, self.total)
+        self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
+
+    def pause(self) -> None:
+        """
+        Pauses the indexing (e.g. while a file is being loaded in the foreground), the workers wait at their next
+        checkpoint
+        """
+        self.__resume.clear()
+
+    def resume(self) -> None:
+        """
+        Resumes the indexing
+        """
+        self.__resume.set()
+
+    def stop(self) -> None:
+        """
+        Stops the indexing and the worker processes (the files indexed so far stay in the catalogue)
+        """
+        if self.__poll_id is not None:
+            self.master.after_cancel(self.__poll_id)
+            self.__poll_id = None
+        if self.__executor is not None:
+            # the paused workers are woken up, so they find out they have been stopped
+            self.__stop.set()
+            self.__resume.set()
+            self.__executor.shutdown(wait=False, cancel_futures=True)
+            self.__executor = None
+        self.__futures.clear()
+
+    @property
+    def running(self) -> bool:
+        """
+        True while files are being indexed
+        """
+        return self.__executor is not None
+
+    @staticmethod
+    def init_worker(resume_event, stop_event) -> None:
+        """
+        Prepares a worker process: lowers its priority, so the indexing never slows down the window, and keeps the
+        events of the indexer
+
+        ...
+
+        Parameters:
+        -----------
+            resume_event (Event):
+                set while the indexing runs
+
+            stop_event (Event):
+                set when the indexing is stopped
+        """
+        LibraryIndexer.resume_event = resume_event
+        LibraryIndexer.stop_event = stop_event
+        try:
+            if hasattr(os, "nice"):
+                os.nice(10)
+            else:
+                # Windows: below normal priority class
+                import ctypes
+                ctypes.windll.kernel32.SetPriorityClass(ctypes.windll.kernel32.GetCurrentProcess(), 0x4000)
+        except (OSError, AttributeError):
+            # the files are indexed at normal priority
+            pass
+
+    @staticmethod
+    def checkpoint() -> None:
+        """
+        Waits while the indexing is paused (runs in a worker process)
+
+        ...
+
+        Raises:
+        -------
+            InterruptedError (Exception):
+                the indexing has been stopped
+        """
+        if LibraryIndexer.resume_event is not None:
+            LibraryIndexer.resume_event.wait()
+        if LibraryIndexer.stop_event is not None and LibraryIndexer.stop_event.is_set():
+            raise InterruptedError("indexing stopped")
+
+    @staticmethod
+    def index_file(file_path: str, index_path: str) -> dict:
+        """
+        Indexes a pgn file and writes its index file (task of the worker processes)
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of the pgn file
+
+            index_path (str):
+                path of the index file
+
+        Returns:
+        --------
+            (dict):
+                catalogue entry of the file
+        """
+        LibraryIndexer.checkpoint()
+        return LibraryCatalogue.build_index(file_path, index_path, checkpoint=LibraryIndexer.checkpoint)
+
+    def __poll(self) -> None:
+        """
+        Records the catalogue entries of the indexed files and reports the progress, then polls again while files are
+        being indexed (runs in the Tk thread)
+        """
+        self.__poll_id = None
+        for future in [future for future in self.__futures if future.done()]:
+            name = self.__futures.pop(future)
+            try:
+                self.catalogue.add_entry(name, future.result())
+            except Exception:
+                # any error of a worker (e.g. OSError, ValueError, BrokenProcessPool) fails only its file, which is
+                # indexed again by the next start
+                self.failed.append(name)
+            self.done += 1
+            if self.on_progress is not None:
+                self.on_progress(self.done, self.total)
+
+        if self.__futures:
+            self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
+        else:
+            self.__executor.shutdown(wait=False)
+            self.__executor = None
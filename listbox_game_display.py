@@ -1,16 +1,24 @@
 # -------------------------------------------------------------------------------------------------------------------- #
 # listbox_game_display.py: includes class ListboxGameDisplay                                                           #
 # -------------------------------------------------------------------------------------------------------------------- #
-from tkinter import Frame, Button, Listbox, Label, Scrollbar
+from sqlite3 import DatabaseError
+from tkinter import Frame, Button, Listbox, Label, Scrollbar, Entry, PhotoImage
 from pgn import FilePGN
-from game_loader import GameLoader
 from gui import GUI
-from my_exceptions import PossibleCorruptFile, NoMovesFound, FriendlyCapture, FalseGame
+from virtual_listbox import VirtualListbox
+from file_loader import FileLoader, BackgroundTask
+from game_list_frame import GameListFrame
+from game_index import GameIndex
+from library_catalogue import LibraryCatalogue
+from game_database import GameDatabase, DatabaseGames
+from thumbnail_cache import ThumbnailCache
+from my_exceptions import PossibleCorruptFile, NoMovesFound
 
 
-class ListboxGameDisplay(Frame):
+class ListboxGameDisplay(GameListFrame):
     """
-    Inherits from parent class Frame and adds in a listbox all the pgn files found inside the pre-selected directory
+    Inherits from parent class GameListFrame and adds in a listbox all the pgn files found inside the pre-selected
+    directory
     User can then select any of those and load the games they contain
 
     ...
@@ -23,23 +31,29 @@ class ListboxGameDisplay(Frame):
         button_run (Button):
             button to run the selected game
 
-        game_dict_collection (list[dict]):
-            list of dictionaries for each game
+        filter_frame (Frame):
+            frame of the filter entry
+
+        filter_entry (Entry):
+            entry to filter the games by player, event, site, date and result
+
+        button_query (Button):
+            button to query the game database of the whole library with the text of the filter entry
 
         pgn_listbox (Listbox):
             listbox to store the pgn files found
 
-        game_listbox (Listbox):
-            listbox to store the games of the selected file
+        game_listbox (VirtualListbox):
+            list of the games of the selected file (only the visible rows are rendered)
 
-        pgn_list (list):
-            list with pgn files found
+        thumbnails (ThumbnailCache):
+            thumbnails of the final positions, shown next to the games (rendered in the background)
 
-        root (Tk):
-            master window
+        pgn_list (list[str]):
+            pgn files found (paths relative to the library directory of the catalogue)
 
-        scrollbar1,2 (Scrollbar):
-            scrollbars for list-boxes
+        scrollbar1 (Scrollbar):
+            scrollbar for the pgn listbox
 
         warning_label (Label):
             label to show messages to the user
@@ -52,6 +66,33 @@ class ListboxGameDisplay(Frame):
         load_file(self, event):
             loads the games of a file
 
+        @staticmethod
+        read_index(catalogue: LibraryCatalogue, name: str) -> tuple[FilePGN, GameIndex] | None:
+            opens an indexed file from its index (worker thread)
+
+        index_loaded(self, name: str, result: tuple[FilePGN, GameIndex] | None) -> None:
+            shows the games of a file opened from its index
+
+        run_query(self) -> None:
+            queries the game database of the whole library
+
+        @staticmethod
+        read_query(database: GameDatabase, files: dict[str, str], criteria: dict) -> tuple[DatabaseGames, GameIndex,
+                                                                                          list[str]]:
+            imports the changed files and runs a query (worker thread)
+
+        query_loaded(self, result: tuple[DatabaseGames, GameIndex, list[str]]) -> None:
+            shows the games of a query
+
+        loading_failed(self, error: Exception) -> None:
+            shows why the file could not be loaded
+
+        game_row_image(self, i: int) -> PhotoImage:
+            returns the thumbnail of a row of the game list
+
+        __read_file(self, file_path: str):
+            starts reading a pgn file in the background
+
         __pack_widgets():
             places widgets
 
@@ -69,41 +110,50 @@ class ListboxGameDisplay(Frame):
             root (Tk):
                 main window
 
-            pgn_list (list):
-                list with pgn files found
+            pgn_list (list[str]):
+                pgn files found (paths relative to the library directory of root.catalogue)
         """
-        # initialization of parent class (Frame)
-        super().__init__()
-        self.config(bg="light blue")
-        # # master of the frame
-        self.root = root
-        # initialization of list to store the dictionaries for each game
-        self.game_dict_collection = []
+        # initialization of parent class (GameListFrame), the game list is empty until a file is selected
+        super().__init__(root)
         # back option enabled (in file sub-menu)
         self.root.file_menu.entryconfig(5, state="normal", command=self.retrieve_master)
 
         # initialization of list with pgn files found ------------------------------------------------------------------
-        self.pgn_list = []
-        for item in pgn_list:
-            if ".pgn" in item:
-                # all files that are not the correct type get excluded
-                self.pgn_list.append(item)
+        self.pgn_list = pgn_list
 
         # initialization of list-boxes ---------------------------------------------------------------------------------
-        self.pgn_listbox = Listbox(self, bg="#f7ffde", width=30, height=20, font=("consolas", 10))
-        self.game_listbox = Listbox(self, bg="#f7ffde", width=60, height=20, font=("consolas", 10))
-
-        # initialization of scrollbars for list-boxes
+        # (the selected file stays selected while text of the filter entry is selected)
+        self.pgn_listbox = Listbox(self, bg="#f7ffde", width=36, height=20, font=("consolas", 10),
+                                   exportselection=False)
+        # the game list has its own scrollbar and asks for the text and thumbnail of the visible rows only
+        # (the rows are taller with the thumbnails, so fewer rows fit next to the pgn listbox)
+        self.game_listbox = VirtualListbox(self, row_text=self.game_row_text, width=60, height=8,
+                                           row_image=self.game_row_image, image_size=ThumbnailCache.SIZE)
+        self.thumbnails = ThumbnailCache(self, on_update=self.game_listbox.render)
+
+        # initialization of the filter entry (the games are filtered as the user types)
+        self.filter_frame = Frame(self, bg="light blue")
+        Label(self.filter_frame, text="Search:", bg="light blue", font=("consolas", 10, "bold")).pack(side="left")
+        self.filter_entry = Entry(self.filter_frame, textvariable=self.filter_var, bg="#f7ffde", width=38,
+                                  font=("consolas", 10))
+        self.filter_entry.pack(side="left", padx=4, pady=2)
+        # the text of the entry can be run as a query over the whole library (e.g. black:Karpov result:0-1 year:1985)
+        self.button_query = Button(self.filter_frame,
+                                   text="Query library",
+                                   font=("consolas", 9, "bold"),
+                                   background="light green",
+                                   activebackground="green",
+                                   command=self.run_query)
+        self.button_query.pack(side="left")
+
+        # initialization of scrollbar for the pgn listbox
         self.scrollbar1 = Scrollbar(master=self, command=self.pgn_listbox.yview)
-        self.scrollbar2 = Scrollbar(master=self, command=self.game_listbox.yview)
-
-        # scrollbars added to list-boxes
         self.pgn_listbox.config(yscrollcommand=self.scrollbar1.set)
-        self.game_listbox.config(yscrollcommand=self.scrollbar2.set)
 
-        # adding pgn files in listbox
+        # adding pgn files in listbox, with the number of games recorded in the catalogue
         for item in self.pgn_list:
-            self.pgn_listbox.insert("end", item)
+            games = self.root.catalogue.games(item)
+            self.pgn_listbox.insert("end", f"{item} ({games})" if games is not None else item)
 
         # initialization of label to show messages to user -------------------------------------------------------------
         self.warning_label = Label(self, bg="light blue", fg="red", font=("consolas", 10, "bold"), pady=5)
@@ -140,22 +190,31 @@ class ListboxGameDisplay(Frame):
         # if something is selected...
         if index:
             # ... the first part of the returned tuple is kept
-            index_for_collection: int = index[0]
-            current_game_dictionary = self.game_dict_collection[index_for_collection]
+            index_for_collection: int = self.game_of_row(index[0])
+            try:
+                # the moves are only processed for the game that is run
+                current_game_dictionary = self.pgn_file.get_info(self.pgn_file.index_of_games[index_for_collection])
+            except KeyError:
+                # a game of a query whose file has been imported again since
+                self.warning_label.config(text="The game is no longer in the library")
+                self.warning_label.grid(row=2, column=1, columnspan=2, sticky="nw")
+                self.warning_label.after(3000, self.warning_label.grid_forget)
+                return
 
             try:
-                # collecting screenshot of game through the GameLoader object
-                game_loader = GameLoader(list_of_moves=current_game_dictionary["moves"])
-                # running GUI for selected game
-                GUI(game_loader, current_game_dictionary)
-            except (FalseGame, PossibleCorruptFile, NoMovesFound, FriendlyCapture) as v:
+                # the GameLoader object is retrieved from the game cache, or replays the moves in chunks once the GUI
+                # window is shown
+                game_loader = self.root.game_cache.get_game_loader(current_game_dictionary["moves"])
+                # opening a game window for the selected game (replay errors are reported by the GUI window)
+                GUI(self.root, game_loader, current_game_dictionary, game_cache=self.root.game_cache)
+            except (PossibleCorruptFile, NoMovesFound) as v:
                 self.warning_label.config(text=str(v))
-                self.warning_label.grid(row=1, column=1, columnspan=2, sticky="nw")
+                self.warning_label.grid(row=2, column=1, columnspan=2, sticky="nw")
                 self.warning_label.after(3000, self.warning_label.grid_forget)
         else:
             # no selection was made
             self.warning_label.config(text="Select a game to continue")
-            self.warning_label.grid(row=1, column=1, columnspan=2, sticky="nw")
+            self.warning_label.grid(row=2, column=1, columnspan=2, sticky="nw")
             self.warning_label.after(3000, self.warning_label.grid_forget)
 
     def load_file(self, event):
@@ -174,51 +233,240 @@ class ListboxGameDisplay(Frame):
         # the <<ListboxSelect>> event is triggered when a listbox item is dis-selected, too
         # so if the current selection is empty, this method will not do anything
         if cur_selection:
-            # clearing listbox and dictionary from previous selection
-            self.game_dict_collection.clear()
-            self.game_listbox.delete(0, "end")
-
-            try:
-                # FilePGN object is used to extract information
-                file = FilePGN("pgn_files\\" + self.pgn_listbox.get(self.pgn_listbox.curselection()))
-            except OSError:
-                self.warning_label.config(text="Could not open file")
-                self.warning_label.grid(row=1, column=1, columnspan=2, sticky="nw")
-                self.warning_label.after(3000, self.warning_label.grid_forget)
-            except PossibleCorruptFile as v:
-                self.warning_label.config(text=str(v))
-                self.warning_label.grid(row=1, column=1, columnspan=2, sticky="nw")
-                self.warning_label.after(3000, self.warning_label.grid_forget)
+            # the reading of the previously selected file stops (if it has not been finished)
+            if self.file_loader is not None:
+                self.file_loader.cancel()
+
+            # the thumbnails of the previous file are not rendered any more
+            self.thumbnails.cancel_pending()
+
+            # clearing list, dictionary and search index from previous selection
+            self.clear_games()
+
+            # the background indexing of the library waits while the file is being loaded
+            self.root.indexer.pause()
+            name = self.pgn_list[cur_selection[0]]
+            if self.root.catalogue.is_fresh(name):
+                # the file has been indexed, only its index is read (the file itself is not parsed)
+                self.file_loader = BackgroundTask(self, lambda: self.read_index(self.root.catalogue, name),
+                                                  on_done=lambda result: self.index_loaded(name, result),
+                                                  on_error=self.loading_failed)
+                self.file_loader.start()
             else:
-                # games get added to the listbox
-                for i, num in enumerate(file.index_of_games):
-                    # showing results by 100, if many games were loaded
-                    if i % 100 == 0:
-                        self.game_listbox.update()
-                    if cur_selection != self.pgn_listbox.curselection():
-                        # if another game is selected from the pgn_listbox and the loading of the previous game has not
-                        # yet been finished, the loop has to be broken in order to avoid games from the previous pgn to
-                        # be loaded at the end of the new selected game
-                        break
-                    # dictionary creation through the get_info method
-                    game_dictionary = file.get_info(num)
-                    # dictionary gets added to the collection
-                    self.game_dict_collection.append(game_dictionary)
-                    self.game_listbox.insert(i, f'{str(i + 1) + ".":4}{game_dictionary["White"]} vs '
-                                                f'{game_dictionary["Black"]} '
-                                                f'({game_dictionary["Result"]})')
+                self.__read_file(self.root.catalogue.file_path(name))
+
+    def __read_file(self, file_path: str):
+        """
+        Starts reading a pgn file in a worker thread, its games are added to the list in batches
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of the pgn file
+        """
+        self.pgn_file = FilePGN(file_path, load=False)
+        # the search tokens of the games are computed by the worker, too
+        self.file_loader = FileLoader(self, file_path, on_batch=self.games_loaded, on_done=self.file_loaded,
+                                      on_error=self.loading_failed, header_function=GameIndex.header_tokens)
+        self.file_loader.start()
+
+    @staticmethod
+    def read_index(catalogue: LibraryCatalogue, name: str) -> tuple[FilePGN, GameIndex] | None:
+        """
+        Opens an indexed pgn file from its index: the games are read from the file only when they are shown and the
+        search index is built from the header information of the index (runs in a worker thread)
+
+        ...
+
+        Parameters:
+        -----------
+            catalogue (LibraryCatalogue):
+                catalogue of the library
+
+            name (str):
+                path of the file relative to the library directory
+
+        Returns:
+        --------
+            (tuple[FilePGN, GameIndex] | None):
+                the opened file and its search index (None if the index could not be read)
+        """
+        index = catalogue.load_index(name)
+        if index is None:
+            return None
+        game_index = GameIndex()
+        game_index.add_games([GameIndex.tokens(header) for header in index["headers"]])
+        return FilePGN(catalogue.file_path(name), offsets=index["offsets"]), game_index
+
+    def index_loaded(self, name: str, result: tuple[FilePGN, GameIndex] | None):
+        """
+        Shows the games of a file opened from its index, or reads the file if its index could not be read
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                path of the file relative to the library directory (the file selected when the index was requested,
+                the selection of the pgn listbox may have been cleared since)
+
+            result (tuple[FilePGN, GameIndex] | None):
+                the opened file and its search index
+        """
+        if result is None:
+            # the file is read instead, the background indexing is resumed once it has been read
+            self.__read_file(self.root.catalogue.file_path(name))
+            return
+        self.pgn_file, self.game_index = result
+        self.apply_filter()
+        self.root.indexer.resume()
+
+    def run_query(self):
+        """
+        Queries the game database of the whole library with the text of the filter entry (e.g. 'black:Karpov
+        result:0-1 year:1985', words without a field are players), the new and changed files are imported first
+        The matching games are shown in the game list, the filter entry then filters them further
+        """
+        try:
+            criteria = GameDatabase.parse_query(self.filter_var.get())
+        except ValueError as v:
+            self.warning_label.config(text=str(v))
+            self.warning_label.grid(row=2, column=1, columnspan=2, sticky="nw")
+            self.warning_label.after(3000, self.warning_label.grid_forget)
+            return
+
+        # the previous file or query stops being loaded
+        if self.file_loader is not None:
+            self.file_loader.cancel()
+        self.thumbnails.cancel_pending()
+        self.pgn_listbox.selection_clear(0, "end")
+        self.clear_games()
+
+        # the library is imported and queried in a worker thread, while the background indexing waits
+        self.root.indexer.pause()
+        files = {name: self.root.catalogue.file_path(name) for name in self.pgn_list}
+        self.file_loader = BackgroundTask(self, lambda: self.read_query(self.root.database, files, criteria),
+                                          on_done=self.query_loaded, on_error=self.loading_failed)
+        self.file_loader.start()
+        self.warning_label.config(text="Searching library...")
+        self.warning_label.grid(row=2, column=1, columnspan=2, sticky="nw")
+
+    @staticmethod
+    def read_query(database: GameDatabase, files: dict[str, str],
+                   criteria: dict) -> tuple[DatabaseGames, GameIndex, list[str]]:
+        """
+        Imports the new and changed files into the game database and runs a query (runs in a worker thread)
+
+        ...
+
+        Parameters:
+        -----------
+            database (GameDatabase):
+                game database of the library
+
+            files (dict[str, str]):
+                address of each pgn file of the library by its path relative to the library directory
+
+            criteria (dict):
+                value of each field of the query (from GameDatabase.parse_query)
+
+        Returns:
+        --------
+            (tuple[DatabaseGames, GameIndex, list[str]]):
+                the matching games, their search index and the files that could not be imported
+
+        Raises:
+        -------
+            OSError (Exception):
+                the database could not be read or written
+        """
+        try:
+            failed = database.sync(files)
+            games = DatabaseGames(database, database.query(**criteria))
+            game_index = GameIndex()
+            game_index.add_games([GameIndex.tokens(header) for header in database.headers(games.index_of_games)])
+        except DatabaseError as e:
+            raise OSError(e)
+        return games, game_index, failed
+
+    def query_loaded(self, result: tuple[DatabaseGames, GameIndex, list[str]]):
+        """
+        Shows the games of a query (the filter entry gets cleared, so every matching game is shown) and the files that
+        could not be imported (their games are missing from the query)
+
+        ...
+
+        Parameters:
+        -----------
+            result (tuple[DatabaseGames, GameIndex, list[str]]):
+                the matching games, their search index and the files that could not be imported
+        """
+        self.warning_label.grid_forget()
+        self.pgn_file, self.game_index, failed = result
+        # clearing the entry shows the games (through apply_filter)
+        self.filter_var.set("")
+        self.root.indexer.resume()
+        if failed:
+            self.warning_label.config(text="Could not import: " + ", ".join(failed))
+            self.warning_label.grid(row=2, column=1, columnspan=2, sticky="nw")
+            self.warning_label.after(5000, self.warning_label.grid_forget)
+
+    def loading_failed(self, error: Exception):
+        """
+        Clears the game list and shows why the file could not be loaded
+
+        ...
+
+        Parameters:
+        -----------
+            error (Exception):
+                exception raised while reading the file
+        """
+        self.clear_games()
+        self.root.indexer.resume()
+
+        if isinstance(error, PossibleCorruptFile):
+            self.warning_label.config(text=str(error))
+        else:
+            self.warning_label.config(text="Could not open file")
+        self.warning_label.grid(row=2, column=1, columnspan=2, sticky="nw")
+        self.warning_label.after(3000, self.warning_label.grid_forget)
+
+    def game_row_image(self, i: int) -> PhotoImage:
+        """
+        Returns the thumbnail of the final position of the game shown in a row of the game list (a blank image while
+        the thumbnail is being rendered in the background)
+
+        ...
+
+        Parameters:
+        -----------
+            i (int):
+                index of the row
+
+        Returns:
+        --------
+            (PhotoImage):
+                thumbnail of the game
+        """
+        pgn_file = self.pgn_file
+        game_no = pgn_file.index_of_games[self.game_of_row(i)]
+        # the moves are processed by the worker of the thumbnail cache
+        return self.thumbnails.get((pgn_file.file_path, game_no), lambda: pgn_file.get_info(game_no)["moves"])
 
     def __pack_widgets(self):
         """
         Places the widgets in the frame
         """
         # τοποθέτηση στο πλαίσιο
-        self.pgn_listbox.grid(row=0, column=0, sticky="nw")
-        self.game_listbox.grid(row=0, column=2, sticky="ne")
-        self.scrollbar1.grid(row=0, column=1, sticky="ns")
-        self.scrollbar2.grid(row=0, column=3, sticky="ns")
-        self.button_back.grid(row=1, column=0, sticky="sw")
-        self.button_run.grid(row=1, column=2, columnspan=2, sticky="se")
+        self.pgn_listbox.grid(row=0, column=0, rowspan=2, sticky="nw")
+        self.filter_frame.grid(row=0, column=2, columnspan=2, sticky="w")
+        self.game_listbox.grid(row=1, column=2, columnspan=2, sticky="ne")
+        self.scrollbar1.grid(row=0, column=1, rowspan=2, sticky="ns")
+        self.button_back.grid(row=2, column=0, sticky="sw")
+        self.button_run.grid(row=2, column=2, columnspan=2, sticky="se")
 
         # frame gets packed
         self.pack()
@@ -227,6 +475,11 @@ class ListboxGameDisplay(Frame):
         """
         Main frame retrieval
         """
+        # the reading of the selected file and the rendering of the thumbnails stop
+        if self.file_loader is not None:
+            self.file_loader.cancel()
+        self.thumbnails.close()
+        self.root.indexer.resume()
         # main frame retrieval
         self.root.main_frame.pack()
         # menu retrieval
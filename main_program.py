@@ -4,13 +4,19 @@
 from tkinter import Tk, Menu, Button, Label, Frame, PhotoImage
 from tkinter.messagebox import askyesno
 from tkinter.filedialog import askopenfilename
-from os import listdir, mkdir
-from os.path import abspath
+from os import mkdir
+from os.path import abspath, isdir
 from manual_game_selector import ManualGameSelector
 from listbox_game_display import ListboxGameDisplay
 from functions import show_help, show_info, show_credits, about
-from my_exceptions import PossibleCorruptFile
 from submit_feedback import FeedBack
+from replay_cache import ReplayCache
+from game_loader_cache import GameLoaderCache
+from image_registry import ImageRegistry
+from library_catalogue import LibraryCatalogue
+from library_indexer import LibraryIndexer
+from game_database import GameDatabase
+from position_index import PositionIndex
 
 
 class MainProgram(Tk):
@@ -37,6 +43,24 @@ class MainProgram(Tk):
         warning_label (Label):
             label to show messages to user
 
+        game_cache (GameLoaderCache):
+            in-memory cache of recently opened games (backed by an on-disk ReplayCache), shared by all game list frames
+
+        catalogue (LibraryCatalogue):
+            catalogue of the pgn files of the pre-selected folder (sizes, modification times and game counts)
+
+        indexer (LibraryIndexer):
+            indexes the pgn files of the pre-selected folder in the background (paused while a file is being loaded)
+
+        status_label (Label):
+            label showing the progress of the background indexing
+
+        database (GameDatabase):
+            SQLite store of the games of the pre-selected folder, queried by player, date, event, result and ECO
+
+        position_index (PositionIndex):
+            index of the positions reached by the games of the database (updated when a position is searched)
+
     Methods:
     --------
         select_file(self):
@@ -54,6 +78,9 @@ class MainProgram(Tk):
         copy_path(self):
             copies (to clipboard) the absolute path to pre-selected folder with pgn files
 
+        indexing_progress(self, done: int, total: int) -> None:
+            shows the progress of the background indexing
+
         exit(self):
             destroys the main window and exits the app
     """
@@ -70,6 +97,17 @@ class MainProgram(Tk):
         # non-resizable window
         self.resizable(False, False)
 
+        # cache of replayed games (games that have been replayed before are not replayed again)
+        self.game_cache = GameLoaderCache(replay_cache=ReplayCache())
+        # catalogue of the pgn files in the pre-selected folder (only changed files are indexed again)
+        self.catalogue = LibraryCatalogue(library="pgn_files")
+        # the new and changed files are indexed by low priority processes, so a file opened for the first time is
+        # already indexed
+        self.indexer = LibraryIndexer(self, self.catalogue, on_progress=self.indexing_progress)
+        # database of the games of the pre-selected folder (the files are imported when the library is first queried)
+        self.database = GameDatabase(directory="library_cache")
+        self.position_index = PositionIndex(self.database)
+
         # menu-bar initialization --------------------------------------------------------------------------------------
         self.menubar = Menu(self)
         # file sub-menu
@@ -108,11 +146,19 @@ class MainProgram(Tk):
 
         # Label for showing messages to user ---------------------------------------------------------------------------
         self.warning_label = Label(self.main_frame, bg="light blue", fg="red", font=("consolas", 12, "bold"), pady=5)
+        # Label for the progress of the background indexing (shown at the bottom of the window while files are indexed)
+        self.status_label = Label(self, bg="light blue", fg="gray25", font=("consolas", 9), anchor="w")
 
         # main window configuration and main frame packing -------------------------------------------------------------
         self.config(menu=self.menubar, background="light blue")
         self.main_frame.pack(fill="x")
 
+        # the piece icons are decoded once, while the main window is idle, and shared by all game windows
+        self.after_idle(ImageRegistry.preload, self)
+        # the background indexing of the library starts once the window is shown
+        if isdir("pgn_files"):
+            self.after_idle(self.indexer.start)
+
         # window mainloop ----------------------------------------------------------------------------------------------
         self.protocol("WM_DELETE_WINDOW", self.exit)
         self.mainloop()
@@ -134,19 +180,9 @@ class MainProgram(Tk):
                 self.file_menu.entryconfig(1, state="disabled")
                 self.file_menu.entryconfig(3, state="disabled")
 
-                try:
-                    # ManualGameSelector frame gets packed
-                    ManualGameSelector(root=self, pgn_filepath=file_path)
-                except OSError:
-                    # a relevant message is shown in case of failure to open the file
-                    self.warning_label.config(text="Could not open file")
-                    self.warning_label.pack(fill="both")
-                    self.warning_label.after(2000, self.warning_label.pack_forget)
-                except PossibleCorruptFile as v:
-                    # in case of corrupt file, a relevant message is shown
-                    self.warning_label.config(text=str(v))
-                    self.warning_label.pack(fill="both")
-                    self.warning_label.after(2000, self.warning_label.pack_forget)
+                # ManualGameSelector frame gets packed (the file is read in the background, if it cannot be loaded the
+                # frame goes back to the main frame and shows a relevant message)
+                ManualGameSelector(root=self, pgn_filepath=file_path)
             else:
                 # wrong file type
                 self.warning_label.config(text="Invalid File Type!")
@@ -157,19 +193,14 @@ class MainProgram(Tk):
         """
         Loads all pgn file found in pre-selected folder
         """
-        try:
-            # list with directory items
-            list_dir = listdir("pgn_files")
-        except FileNotFoundError:
+        if not isdir("pgn_files"):
             # pre-selected directory was not found or deleted, and is created again
             mkdir("pgn_files")
-            list_dir = []
 
-        # check file type
-        for pgn_file_path in list_dir:
-            if pgn_file_path[-4:] != ".pgn":
-                # removal of wrong file types
-                list_dir.remove(pgn_file_path)
+        # pgn files of the directory and its sub-directories, the new and changed files are indexed in the background
+        # (never on the Tk thread, until they are indexed they get loaded from the file itself)
+        list_dir = self.catalogue.scan(index=False)
+        self.indexer.start()
 
         if list_dir:
             # main frame gets withdrawn
@@ -224,9 +255,33 @@ class MainProgram(Tk):
         self.warning_label.pack(fill="both")
         self.warning_label.after(2000, self.warning_label.pack_forget)
 
+    def indexing_progress(self, done: int, total: int):
+        """
+        Shows the progress of the background indexing of the library, the label is hidden once every file is indexed
+
+        ...
+
+        Parameters:
+        -----------
+            done (int):
+                number of files indexed so far
+
+            total (int):
+                number of files to index
+        """
+        if done < total:
+            self.status_label.config(text=f"Indexing library... {done}/{total} files")
+            self.status_label.pack(side="bottom", fill="x")
+        else:
+            self.status_label.pack_forget()
+
     def exit(self):
         """
         Ask confirmation to terminate the app
         """
         if askyesno(master=self, title="Quit?", message="Do you really wish to quit?", default="no"):
+            # the background indexing stops (the files indexed so far are kept)
+            self.indexer.stop()
+            # the images of the game windows are dropped before the interpreter is destroyed
+            ImageRegistry.release(self)
             self.destroy()
@@ -1,16 +1,19 @@
 # -------------------------------------------------------------------------------------------------------------------- #
 # manual_game_selector.py: includes class ManualGameSelector                                                           #
 # -------------------------------------------------------------------------------------------------------------------- #
-from tkinter import Frame, Button, Listbox, Scrollbar, Label
-from game_loader import GameLoader
+from tkinter import Frame, Button, Label, Entry
 from gui import GUI
 from pgn import FilePGN
-from my_exceptions import PossibleCorruptFile, NoMovesFound, FriendlyCapture, FalseGame
+from virtual_listbox import VirtualListbox
+from file_loader import FileLoader
+from game_index import GameIndex
+from game_list_frame import GameListFrame
+from my_exceptions import PossibleCorruptFile, NoMovesFound
 
 
-class ManualGameSelector(Frame):
+class ManualGameSelector(GameListFrame):
     """
-    Inherits from parent class Frame and opens a Windows explorer window
+    Inherits from parent class GameListFrame and opens a Windows explorer window
     Through this window, the user can manually select the pgn file he/she wants to load
     If a valid file type is selected, a new frame is created that stores all the games of the selected pgn file inside
     a listbox
@@ -25,17 +28,14 @@ class ManualGameSelector(Frame):
         button_run (Button):
             button to run the selected game
 
-        game_dict_collection (list[dict]):
-            list of dictionaries for each game
+        filter_frame (Frame):
+            frame of the filter entry
 
-        listbox (Listbox):
-            listbox to store the games of the selected file
+        filter_entry (Entry):
+            entry to filter the games by player, event, site, date and result
 
-        root (Tk):
-            master window
-
-        scrollbar (Scrollbar):
-            scrollbar for the listbox
+        game_listbox (VirtualListbox):
+            list of the games of the selected file (only the visible rows are rendered)
 
         warning_label (Label):
             label to show messages to the user
@@ -46,7 +46,10 @@ class ManualGameSelector(Frame):
             displays the selected game
 
         __fill_listbox():
-            adds games in listbox
+            starts reading the games of the file in the background
+
+        loading_failed(self, error: Exception) -> None:
+            goes back to the main frame and shows why the file could not be loaded
 
         __pack_widgets():
             places widgets
@@ -68,25 +71,24 @@ class ManualGameSelector(Frame):
             pgn_filepath (str):
                 διεύθυνση αρχείου pgn που επιλέχθηκε
         """
-        # initialization of parent class (Frame)
-        super().__init__()
-        self.config(bg="light blue")
-        # master of the frame
-        self.root = root
+        # initialization of parent class (GameListFrame), the game list is empty until the file is read
+        super().__init__(root)
         # selected filepath
         self.__filepath = pgn_filepath
-        # initialization of list to store the dictionaries for each game
-        self.game_dict_collection = []
         # back option enabled (in file sub-menu)
         self.root.file_menu.entryconfig(5, state="normal", command=self.retrieve_master)
 
         # initialization of listbox and label --------------------------------------------------------------------------
         self.warning_label = Label(self, bg="light blue", fg="red", font=("consolas", 10, "bold"), pady=5)
-        self.listbox = Listbox(self, bg="#f7ffde", width=80, height=20, font=("consolas", 10))
+        # the game list has its own scrollbar and asks for the text of the visible rows only
+        self.game_listbox = VirtualListbox(self, row_text=self.game_row_text, width=80, height=20)
 
-        # scrollbar added to listbox
-        self.scrollbar = Scrollbar(master=self, command=self.listbox.yview)
-        self.listbox.config(yscrollcommand=self.scrollbar.set)
+        # initialization of the filter entry (the games are filtered as the user types)
+        self.filter_frame = Frame(self, bg="light blue")
+        Label(self.filter_frame, text="Search:", bg="light blue", font=("consolas", 10, "bold")).pack(side="left")
+        self.filter_entry = Entry(self.filter_frame, textvariable=self.filter_var, bg="#f7ffde", width=72,
+                                  font=("consolas", 10))
+        self.filter_entry.pack(side="left", padx=4, pady=2)
 
         # initialization of buttons ------------------------------------------------------------------------------------
         self.button_run = Button(self,
@@ -116,64 +118,73 @@ class ManualGameSelector(Frame):
         Displays the selected game
         """
         # storing the user's selection
-        index = self.listbox.curselection()
+        index = self.game_listbox.curselection()
         # if something is selected...
         if index:
             # ... the first part of the returned tuple is kept
-            index_for_collection: int = index[0]
-            current_game_dictionary = self.game_dict_collection[index_for_collection]
+            index_for_collection: int = self.game_of_row(index[0])
+            # the moves are only processed for the game that is run
+            current_game_dictionary = self.pgn_file.get_info(self.pgn_file.index_of_games[index_for_collection])
 
             try:
-                # collecting screenshot of game through the GameLoader object
-                game_loader = GameLoader(current_game_dictionary["moves"])
-                # running GUI for selected game
-                GUI(game_loader, current_game_dictionary)
-            except (FalseGame, PossibleCorruptFile, NoMovesFound, FriendlyCapture) as v:
+                # the GameLoader object is retrieved from the game cache, or replays the moves in chunks once the GUI
+                # window is shown
+                game_loader = self.root.game_cache.get_game_loader(current_game_dictionary["moves"])
+                # opening a game window for the selected game (replay errors are reported by the GUI window)
+                GUI(self.root, game_loader, current_game_dictionary, game_cache=self.root.game_cache)
+            except (PossibleCorruptFile, NoMovesFound) as v:
                 self.warning_label.config(text=str(v))
-                self.warning_label.grid(row=1, column=0, columnspan=2, sticky="n")
+                self.warning_label.grid(row=2, column=0, columnspan=2, sticky="n")
                 self.warning_label.after(3000, self.warning_label.grid_forget)
         else:
             # no selection was made
             self.warning_label.config(text="Select a game to continue")
-            self.warning_label.grid(row=1, column=0, columnspan=2, sticky="n")
+            self.warning_label.grid(row=2, column=0, columnspan=2, sticky="n")
             self.warning_label.after(3000, self.warning_label.grid_forget)
 
     def __fill_listbox(self):
         """
-        Fills the listbox with the games loaded from the pgn file
+        Starts reading the pgn file in a worker thread, its games are added to the listbox in batches
+        """
+        # the background indexing of the library waits while the file is being loaded
+        self.root.indexer.pause()
+        self.pgn_file = FilePGN(self.__filepath, load=False)
+        # the search tokens of the games are computed by the worker, too
+        self.file_loader = FileLoader(self, self.__filepath, on_batch=self.games_loaded, on_done=self.file_loaded,
+                                      on_error=self.loading_failed, header_function=GameIndex.header_tokens)
+        self.file_loader.start()
+
+    def loading_failed(self, error: Exception):
+        """
+        Goes back to the main frame and shows why the file could not be loaded
+
+        ...
+
+        Parameters:
+        -----------
+            error (Exception):
+                exception raised while reading the file
         """
-        try:
-            # FilePGN object is used to extract information
-            file = FilePGN(self.__filepath)
-        except OSError:
-            self.retrieve_master()
-            raise OSError
-        except PossibleCorruptFile:
-            self.retrieve_master()
-            raise PossibleCorruptFile
+        root = self.root
+        self.retrieve_master()
+        if isinstance(error, PossibleCorruptFile):
+            # in case of corrupt file, a relevant message is shown
+            root.warning_label.config(text=str(error))
         else:
-            # games loaded are added to the listbox
-            for i, num in enumerate(file.index_of_games):
-                # dictionary creation through the get_info method
-                game_dictionary = file.get_info(num)
-                # dictionary gets added to the collection
-                self.game_dict_collection.append(game_dictionary)
-                self.listbox.insert(i, f'{str(i + 1) + ".":4}{game_dictionary["White"]} vs '
-                                       f'{game_dictionary["Black"]} '
-                                       f'({game_dictionary["Result"]})')
-                # showing results by 100, if many games were loaded
-                if i % 100 == 0:
-                    self.listbox.update()
+            # a relevant message is shown in case of failure to open the file
+            root.warning_label.config(text="Could not open file")
+        root.warning_label.pack(fill="both")
+        root.warning_label.after(2000, root.warning_label.pack_forget)
 
     def __pack_widgets(self):
         """
         Places the widgets in the frame
         """
         # τοποθέτηση στο πλαίσιο
-        self.listbox.grid(row=0, column=0, sticky="ne")
-        self.scrollbar.grid(row=0, column=1, sticky="ns")
-        self.button_back.grid(row=1, column=0, sticky="w")
-        self.button_run.grid(row=1, column=0, columnspan=2, sticky="e")
+        self.filter_frame.grid(row=0, column=0, columnspan=2, sticky="w")
+        self.game_listbox.grid(row=1, column=0, columnspan=2, sticky="ne")
+        self.button_back.grid(row=2, column=0, sticky="w")
+        self.button_run.grid(row=2, column=0, columnspan=2, sticky="e")
 
         # frame gets packed
         self.pack()
@@ -182,6 +193,10 @@ class ManualGameSelector(Frame):
         """
         Main frame retrieval
         """
+        # the reading of the file stops
+        if self.file_loader is not None:
+            self.file_loader.cancel()
+        self.root.indexer.resume()
         # main frame retrieval
         self.root.main_frame.pack()
         # menu retrieval
@@ -0,0 +1,397 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# material_index.py: includes class MaterialIndex                                                                      #
+# -------------------------------------------------------------------------------------------------------------------- #
+from argparse import ArgumentParser
+from game_database import GameDatabase
+
+
+class MaterialIndex:
+    """
+    Index of the material signatures reached by the games of the GameDatabase (e.g. KRPvKR), used to find endgames and
+    material imbalances without replaying the games
+    The signature of a position is a single integer: the number of pawns, knights, bishops, rooks and queens of White
+    (4 bits each, from the lowest bits) followed by the same for Black, plus two flags for pawns on the queenside
+    (files a ~ d) and on the kingside (files e ~ h)
+    The material only changes with captures and promotions (pawns only change file by capturing, too), so a game goes
+    through a few signatures only, the first round each one is reached is stored
+    The signatures are recorded while the games are replayed by PositionIndex.update (one pass over the games for the
+    positions, the opening tree and the material), deleting or importing a file again drops them along with its games
+
+    ...
+
+    Attributes:
+    -----------
+        SHIFTS (dict[str, int]):
+            bit of the count of each white piece (the black pieces are BLACK bits higher)
+
+        BLACK (int):
+            bits of the counts of the white pieces
+
+        QUEENSIDE (int):
+            flag for pawns on files a ~ d
+
+        KINGSIDE (int):
+            flag for pawns on files e ~ h
+
+        WINGS (dict[str, tuple[int, ...]]):
+            pawn flags allowed by each wing condition of the searches
+
+        database (GameDatabase):
+            database of the games
+
+        created (bool):
+            True if the index did not exist in the database before (the games indexed before have to be replayed)
+
+    Methods:
+    --------
+        @staticmethod
+        signature(screenshot: list[dict]) -> int:
+            returns the material signature of a position of a GameLoader
+
+        @staticmethod
+        game_signatures(game_loader: GameLoader) -> list[int]:
+            returns the material signature of each round replayed by a GameLoader
+
+        @staticmethod
+        parse(text: str) -> tuple[int, int]:
+            returns the signature and the mask of the counts given by a text like 'KRPvKR'
+
+        @staticmethod
+        name(signature: int) -> str:
+            returns the text of a signature
+
+        @staticmethod
+        swap(signature: int) -> int:
+            returns the signature with the colours swapped
+
+        add_games(self, games: list[tuple[int, list[int]]]) -> None:
+            stores the signatures of replayed games
+
+        signatures(self, text: str, wing: str | None = None, either: bool = True) -> list[int]:
+            returns the signatures of the index that match a text
+
+        search(self, text: str, wing: str | None = None, either: bool = True) -> list[tuple[int, int]]:
+            returns the games that reached a material signature and the round they reached it
+
+        __create_tables(self) -> bool:
+            creates the table of the index
+    """
+
+    # bit of the count of each white piece (4 bits each, up to 15 pieces)
+    SHIFTS = {"p": 0, "n": 4, "b": 8, "r": 12, "q": 16}
+    BLACK = 20
+
+    # flags of the wings with pawns (of either colour)
+    QUEENSIDE = 1 << 40
+    KINGSIDE = 1 << 41
+
+    # pawn flags allowed by each wing condition ('one': all the pawns on the same wing)
+    WINGS = {"one": (QUEENSIDE, KINGSIDE), "queenside": (QUEENSIDE,), "kingside": (KINGSIDE,),
+             "both": (QUEENSIDE | KINGSIDE,)}
+
+    def __init__(self, database: GameDatabase):
+        """
+        Initializes the index (the table is created in the database if it does not exist)
+
+        ...
+
+        Parameters:
+        -----------
+            database (GameDatabase):
+                database of the games
+        """
+        self.database = database
+        self.created = self.__create_tables()
+
+    @staticmethod
+    def signature(screenshot: list) -> int:
+        """
+        Returns the material signature of a position of a GameLoader (the kings are not counted)
+
+        ...
+
+        Parameters:
+        -----------
+            screenshot (list[dict]):
+                list with the name, row and column of each piece (from GameLoader.screenshots_per_round)
+
+        Returns:
+        --------
+            (int):
+                signature of the position
+        """
+        signature = 0
+        shifts = MaterialIndex.SHIFTS
+        for piece in screenshot:
+            name = piece["name"]
+            shift = shifts.get(name[0])
+            if shift is None:
+                # king or empty square
+                continue
+            signature += 1 << (shift if name[1] == "w" else shift + MaterialIndex.BLACK)
+            if shift == 0:
+                signature |= MaterialIndex.QUEENSIDE if piece["col"] < 4 else MaterialIndex.KINGSIDE
+        return signature
+
+    @staticmethod
+    def game_signatures(game_loader) -> list[int]:
+        """
+        Returns the material signature of each round replayed by a GameLoader (starting position first)
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                replayed game
+
+        Returns:
+        --------
+            (list[int]):
+                signature of each round
+        """
+        screenshots = game_loader.screenshots_per_round
+        return [MaterialIndex.signature(screenshots[ply]) for ply in range(game_loader.plies_loaded + 1)]
+
+    @staticmethod
+    def parse(text: str) -> tuple[int, int]:
+        """
+        Returns the signature and the mask of the counts given by a text like 'KRPPvKR' (White first, 'K' is optional),
+        '*' instead of the pawns of a side stands for any number of pawns
+
+        ...
+
+        Parameters:
+        -----------
+            text (str):
+                material of both sides, separated by 'v'
+
+        Returns:
+        --------
+            (tuple[int, int]):
+                signature and mask of the counts that have to match
+
+        Raises:
+        -------
+            ValueError (Exception):
+                the text is not valid
+        """
+        sides = text.strip().upper().split("V")
+        if len(sides) != 2:
+            raise ValueError(f"Material '{text}' should be given as White v Black, e.g. KRPvKR")
+
+        signature = 0
+        mask = 0
+        for offset, side in zip((0, MaterialIndex.BLACK), sides):
+            counts = dict.fromkeys(MaterialIndex.SHIFTS, 0)
+            any_pawns = False
+            for char in side.strip():
+                if char == "*":
+                    any_pawns = True
+                elif char.lower() in counts:
+                    counts[char.lower()] += 1
+                elif char != "K":
+                    raise ValueError(f"Invalid piece '{char}' in material '{text}'")
+            for piece, shift in MaterialIndex.SHIFTS.items():
+                if piece == "p" and any_pawns:
+                    continue
+                if counts[piece] > 15:
+                    raise ValueError(f"Too many pieces in material '{text}'")
+                signature |= counts[piece] << (shift + offset)
+                mask |= 15 << (shift + offset)
+        return signature, mask
+
+    @staticmethod
+    def name(signature: int) -> str:
+        """
+        Returns the text of a signature, e.g. 'KRPPvKR'
+
+        ...
+
+        Parameters:
+        -----------
+            signature (int):
+                material signature
+
+        Returns:
+        --------
+            (str):
+                material of both sides
+        """
+        sides = []
+        for offset in (0, MaterialIndex.BLACK):
+            side = "K"
+            for piece in "qrbnp":
+                side += piece.upper() * (signature >> (MaterialIndex.SHIFTS[piece] + offset) & 15)
+            sides.append(side)
+        return "v".join(sides)
+
+    @staticmethod
+    def swap(signature: int) -> int:
+        """
+        Returns the signature with the colours swapped (the pawn flags stay)
+
+        ...
+
+        Parameters:
+        -----------
+            signature (int):
+                material signature
+
+        Returns:
+        --------
+            (int):
+                signature with the pieces of White as Black and the pieces of Black as White
+        """
+        side = (1 << MaterialIndex.BLACK) - 1
+        return (signature & ~(side | side << MaterialIndex.BLACK)) | (signature & side) << MaterialIndex.BLACK \
+            | (signature >> MaterialIndex.BLACK & side)
+
+    def add_games(self, games: list) -> None:
+        """
+        Stores the signatures of replayed games, only the first round each signature is reached (called inside the
+        transaction storing their positions)
+
+        ...
+
+        Parameters:
+        -----------
+            games (list[tuple[int, list[int]]]):
+                id and signature of each round of each game
+        """
+        rows = []
+        for game_id, signatures in games:
+            first = {}
+            for ply, signature in enumerate(signatures):
+                first.setdefault(signature, ply)
+            rows.extend((signature, game_id, ply) for signature, ply in first.items())
+        self.database.connection.executemany("INSERT OR IGNORE INTO material (signature, game_id, ply) "
+                                             "VALUES (?, ?, ?)", rows)
+
+    def signatures(self, text: str, wing: str | None = None, either: bool = True) -> list[int]:
+        """
+        Returns the signatures of the index that match a text (the distinct signatures are few, they are filtered
+        here, the games are then found through the index of the table)
+
+        ...
+
+        Parameters:
+        -----------
+            text (str):
+                material of both sides (see parse), e.g. 'KR*vKB*'
+
+            wing (str | None) default=None:
+                'one' (all the pawns on one wing), 'queenside', 'kingside', 'both' or None for any
+
+            either (bool) default=True:
+                if True, the material may belong to either colour (e.g. KRvKB also finds KBvKR)
+
+        Returns:
+        --------
+            (list[int]):
+                matching signatures
+
+        Raises:
+        -------
+            ValueError (Exception):
+                the text or the wing are not valid
+        """
+        signature, mask = self.parse(text)
+        if wing is not None and wing not in self.WINGS:
+            raise ValueError(f"Wing should be one of {', '.join(self.WINGS)}, not '{wing}'")
+        patterns = {(signature, mask)}
+        if either:
+            patterns.add((self.swap(signature), self.swap(mask)))
+        wings = self.WINGS.get(wing)
+
+        found = []
+        for candidate, in self.database.connection.execute("SELECT signature FROM material_signatures"):
+            if wings is not None and candidate & (self.QUEENSIDE | self.KINGSIDE) not in wings:
+                continue
+            if any(candidate & pattern_mask == pattern for pattern, pattern_mask in patterns):
+                found.append(candidate)
+        return found
+
+    def search(self, text: str, wing: str | None = None, either: bool = True) -> list[tuple[int, int]]:
+        """
+        Returns the games that reached a material signature and the first round they reached it, e.g.
+        search('KR*vKB*', wing='one') for the rook against bishop endings with all the pawns on one wing
+
+        ...
+
+        Parameters:
+        -----------
+            text (str):
+                material of both sides (see parse)
+
+            wing (str | None) default=None:
+                'one' (all the pawns on one wing), 'queenside', 'kingside', 'both' or None for any
+
+            either (bool) default=True:
+                if True, the material may belong to either colour
+
+        Returns:
+        --------
+            (list[tuple[int, int]]):
+                id of each game and round it reached the material, sorted by game
+
+        Raises:
+        -------
+            ValueError (Exception):
+                the text or the wing are not valid
+        """
+        found = {}
+        connection = self.database.connection
+        for signature in self.signatures(text, wing, either):
+            for game_id, ply in connection.execute("SELECT game_id, ply FROM material WHERE signature = ?",
+                                                   (signature,)):
+                if ply < found.get(game_id, ply + 1):
+                    found[game_id] = ply
+        return sorted(found.items())
+
+    def __create_tables(self) -> bool:
+        """
+        Creates the tables of the index (if they do not exist): the signatures of the games (deleted along with them)
+        and the distinct signatures, kept by a trigger (a signature stays after its games are deleted, it just finds
+        no game)
+
+        ...
+
+        Returns:
+        --------
+            (bool):
+                True if the tables have been created
+        """
+        with self.database.connection as connection:
+            exists = connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'material'").fetchone()
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS material (
+                    signature INTEGER NOT NULL,
+                    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+                    ply INTEGER NOT NULL,
+                    PRIMARY KEY (signature, game_id)) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS material_game ON material (game_id);
+                CREATE TABLE IF NOT EXISTS material_signatures (signature INTEGER PRIMARY KEY);
+                CREATE TRIGGER IF NOT EXISTS material_signature AFTER INSERT ON material BEGIN
+                    INSERT OR IGNORE INTO material_signatures (signature) VALUES (new.signature);
+                END;
+            """)
+        return exists is None
+
+
+if __name__ == "__main__":
+    # command line: python material_index.py "KR*vKB*" [--wing one] [--colour]
+    parser = ArgumentParser(description="Finds the games of the game database reaching a material signature "
+                                        "(run 'python position_index.py update' first)")
+    parser.add_argument("material", help="material of both sides, e.g. KRPvKR ('*' for any number of pawns)")
+    parser.add_argument("--wing", choices=tuple(MaterialIndex.WINGS), help="wings with pawns")
+    parser.add_argument("--colour", action="store_true", help="White has the first material (not either colour)")
+    args = parser.parse_args()
+
+    game_database = GameDatabase()
+    material_index = MaterialIndex(game_database)
+    found = material_index.search(args.material, args.wing, either=not args.colour)
+    for (found_id, found_ply), header in zip(found, game_database.headers([game_id for game_id, _ in found])):
+        print(f'{header["White"]} vs {header["Black"]} ({header["Result"]}) {header["Date"]}, '
+              f'move {found_ply // 2 + 1}')
+    print(f"{len(found)} games")
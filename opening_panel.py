@@ -0,0 +1,108 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# opening_panel.py: includes class OpeningPanel                                                                        #
+# -------------------------------------------------------------------------------------------------------------------- #
+from tkinter import Frame, Label
+from opening_tree import OpeningTree
+
+
+class OpeningPanel(Frame):
+    """
+    Panel of the game window with the moves played from the current position by the games of the library, read from
+    the OpeningTree (number of games and the percentage of White wins, draws and Black wins of each move)
+
+    ...
+
+    Attributes:
+    -----------
+        MAX_ROWS (int):
+            number of moves shown (the most played ones)
+
+        tree (OpeningTree):
+            opening explorer of the library
+
+        title_label (Label):
+            label with the number of games of the position (or a message)
+
+        moves_label (Label):
+            label with a row for each move
+
+    Methods:
+    --------
+        show(self, key: int, ply: int) -> None:
+            shows the moves played from a position
+
+        show_message(self, text: str) -> None:
+            shows a message instead of the moves
+    """
+
+    # number of moves shown
+    MAX_ROWS = 8
+
+    def __init__(self, master, tree: OpeningTree):
+        """
+        Initializes the panel
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                game window
+
+            tree (OpeningTree):
+                opening explorer of the library
+        """
+        super().__init__(master=master, bg="light blue", bd=2, relief="groove")
+        self.tree = tree
+
+        self.title_label = Label(self, bg="light blue", font=("consolas", 11, "bold"), anchor="w")
+        self.moves_label = Label(self, bg="light blue", font=("consolas", 10), anchor="w", justify="left")
+        self.title_label.pack(fill="x")
+        self.moves_label.pack(fill="x")
+
+    def show(self, key: int, ply: int) -> None:
+        """
+        Shows the moves played from a position (the most played first)
+
+        ...
+
+        Parameters:
+        -----------
+            key (int):
+                hash of the position (from PositionIndex.screenshot_key)
+
+            ply (int):
+                round of the position
+        """
+        moves = self.tree.moves(key)
+        if not moves:
+            if ply >= OpeningTree.MAX_PLY:
+                self.show_message(f"Opening explorer: only the first {OpeningTree.MAX_PLY // 2} moves are included")
+            else:
+                self.show_message("Opening explorer: no game of the library reached this position")
+            return
+
+        total = sum(move["games"] for move in moves)
+        self.title_label.config(text=f"Opening explorer: {total} games")
+        rows = [f"{'Move':8}{'Games':>8}{'White':>8}{'Draw':>8}{'Black':>8}"]
+        for move in moves[:self.MAX_ROWS]:
+            games = move["games"]
+            rows.append(f"{move['move']:8}{games:>8}{move['white'] / games:>8.0%}{move['draws'] / games:>8.0%}"
+                        f"{move['black'] / games:>8.0%}")
+        if len(moves) > self.MAX_ROWS:
+            rows.append(f"... {len(moves) - self.MAX_ROWS} more moves")
+        self.moves_label.config(text="\n".join(rows))
+
+    def show_message(self, text: str) -> None:
+        """
+        Shows a message instead of the moves (e.g. while the tree is being built)
+
+        ...
+
+        Parameters:
+        -----------
+            text (str):
+                message to show
+        """
+        self.title_label.config(text=text)
+        self.moves_label.config(text="")
@@ -0,0 +1,135 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# opening_tree.py: includes class OpeningTree                                                                          #
+# -------------------------------------------------------------------------------------------------------------------- #
+from game_database import GameDatabase
+
+
+class OpeningTree:
+    """
+    Opening explorer of the games of the GameDatabase: for every position of the first rounds of the games, the moves
+    played from it, the number of games and how many of them White won, drew or Black won
+    The tree is filled while the games are replayed by PositionIndex.update (one pass over the games for both), the
+    counts of each batch are summed in memory and added to the stored counts with a single upsert per move
+    The counts are kept per file, so deleting or importing a file again drops its counts along with its games
+
+    ...
+
+    Attributes:
+    -----------
+        MAX_PLY (int):
+            number of rounds of each game added to the tree
+
+        RESULTS (dict[str, int]):
+            column of each result (1: White won, 2: draw, 3: Black won)
+
+        database (GameDatabase):
+            database of the games
+
+        created (bool):
+            True if the tree did not exist in the database before (the games indexed before have to be replayed)
+
+    Methods:
+    --------
+        add_games(self, games: list[tuple[int, list[int], list[str], str]]) -> None:
+            adds the moves of replayed games to the tree
+
+        moves(self, key: int) -> list[dict]:
+            returns the moves played from a position and their statistics
+
+        __create_tables(self) -> bool:
+            creates the table of the tree
+    """
+
+    # number of rounds of each game added to the tree (the first 20 moves)
+    MAX_PLY = 40
+
+    # column of each result
+    RESULTS = {"1-0": 1, "1/2-1/2": 2, "0-1": 3}
+
+    def __init__(self, database: GameDatabase):
+        """
+        Initializes the tree (the table is created in the database if it does not exist)
+
+        ...
+
+        Parameters:
+        -----------
+            database (GameDatabase):
+                database of the games
+        """
+        self.database = database
+        self.created = self.__create_tables()
+
+    def add_games(self, games: list) -> None:
+        """
+        Adds the moves of replayed games to the tree (called inside the transaction storing their positions)
+
+        ...
+
+        Parameters:
+        -----------
+            games (list[tuple[int, list[int], list[str], str]]):
+                file id, hash of each position (from PositionIndex.replay), moves and result of each game
+        """
+        counts = {}
+        for file_id, hashes, moves, result in games:
+            column = self.RESULTS.get(result, 0)
+            # the move of round 'ply' leads from position 'ply' to position 'ply + 1'
+            for ply in range(min(self.MAX_PLY, len(hashes) - 1, len(moves))):
+                row = counts.setdefault((hashes[ply], moves[ply].rstrip("!?"), file_id), [0, 0, 0, 0])
+                row[0] += 1
+                if column:
+                    row[column] += 1
+
+        self.database.connection.executemany(
+            "INSERT INTO opening_moves (hash, move, file_id, games, white, draws, black) VALUES (?, ?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (hash, move, file_id) DO UPDATE SET games = games + excluded.games, "
+            "white = white + excluded.white, draws = draws + excluded.draws, black = black + excluded.black",
+            [key + tuple(row) for key, row in counts.items()])
+
+    def moves(self, key: int) -> list[dict]:
+        """
+        Returns the moves played from a position and their statistics (most played first)
+
+        ...
+
+        Parameters:
+        -----------
+            key (int):
+                hash of the position (from PositionIndex.screenshot_key or PositionIndex.fen_key)
+
+        Returns:
+        --------
+            (list[dict]):
+                'move', 'games', 'white', 'draws' and 'black' of each move
+        """
+        rows = self.database.connection.execute("SELECT move, SUM(games), SUM(white), SUM(draws), SUM(black) "
+                                                "FROM opening_moves WHERE hash = ? GROUP BY move "
+                                                "ORDER BY SUM(games) DESC, move", (key,))
+        return [dict(zip(("move", "games", "white", "draws", "black"), row)) for row in rows]
+
+    def __create_tables(self) -> bool:
+        """
+        Creates the table of the tree (if it does not exist), the counts of a file are deleted along with it
+
+        ...
+
+        Returns:
+        --------
+            (bool):
+                True if the table has been created
+        """
+        with self.database.connection as connection:
+            exists = connection.execute("SELECT 1 FROM sqlite_master WHERE name = 'opening_moves'").fetchone()
+            connection.execute("""
+                CREATE TABLE IF NOT EXISTS opening_moves (
+                    hash INTEGER NOT NULL,
+                    move TEXT NOT NULL,
+                    file_id INTEGER NOT NULL REFERENCES files (id) ON DELETE CASCADE,
+                    games INTEGER NOT NULL,
+                    white INTEGER NOT NULL,
+                    draws INTEGER NOT NULL,
+                    black INTEGER NOT NULL,
+                    PRIMARY KEY (hash, move, file_id)) WITHOUT ROWID""")
+            connection.execute("CREATE INDEX IF NOT EXISTS opening_moves_file ON opening_moves (file_id)")
+        return exists is None
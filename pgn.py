@@ -1,6 +1,8 @@
 # -------------------------------------------------------------------------------------------------------------------- #
-# pgn.py: includes class FilePGN                                                                                       #
+# pgn.py: includes classes FilePGN and PGNBlocks                                                                       #
 # -------------------------------------------------------------------------------------------------------------------- #
+from collections.abc import Iterator, Sequence
+from locale import getpreferredencoding
 from my_exceptions import PossibleCorruptFile
 
 
@@ -16,17 +18,40 @@ class FilePGN:
         file_path (str):
             address of a pgn file
 
-        game_data (list):
-            list of information read from the pgn file (prior to being processed)
+        game_data (list | PGNBlocks):
+            list of information read from the pgn file (prior to being processed), or the blocks read on demand when
+            the file was opened from its index
 
         index_of_games (list[int]):
             list of integers posing as game indexes in game_data list
 
     Methods:
     --------
+        add_blocks(self, blocks: list[str]) -> None:
+            adds blocks read by read_blocks (in batches) to game_data
+
+        get_header(self, game_no: int) -> dict:
+            returns dict with the header information of a game (without the moves)
+
+        @staticmethod
+        parse_header(header: str) -> dict:
+            returns dict with the information found in the header of a game
+
+        @staticmethod
+        parse_tags(header: str) -> dict:
+            returns dict with every tag pair found in the header of a game
+
         get_info(self, game_no: int) -> dict:
             returns dict with the information of a game
 
+        @staticmethod
+        read_blocks(file_path: str) -> Iterator[str]:
+            yields the information and moves of the games one by one while reading the pgn file
+
+        @staticmethod
+        read_offsets(file_path: str) -> list[int]:
+            returns the byte offset of every block of the pgn file
+
         __split_files(self) -> list[str]:
             returns list with the information and moves of the games stored inside the pgn file
 
@@ -42,7 +67,7 @@ class FilePGN:
             returns string with the number of rounds of the game
     """
 
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, load: bool = True, offsets: list[int] | None = None):
         """
         Initialization of class object
 
@@ -52,9 +77,27 @@ class FilePGN:
         -----------
             file_path (str):
                 address of a pgn file
+
+            load (bool) default=True:
+                if False, the file is not read and the games get added later through add_blocks (e.g. by a FileLoader)
+
+            offsets (list[int] | None) default=None:
+                byte offsets of the blocks of the file (from its index), if given the file is not parsed and the blocks
+                are read from the file only when they are needed
         """
         self.file_path = file_path
 
+        if offsets is not None:
+            self.game_data: Sequence = PGNBlocks(file_path, offsets)
+            # only complete games (information and moves) get an index
+            self.index_of_games: list = list(range(0, len(offsets) - 1, 2))
+            return
+
+        if not load:
+            self.game_data: list = []
+            self.index_of_games: list = []
+            return
+
         # __split_files() gets called for this pgn file
         # game_data list now contains
         # a) in positions n the information of a game and
@@ -65,11 +108,26 @@ class FilePGN:
         # list with indexes of games
         self.index_of_games: list = self.__get_index_of_games()
 
-    def get_info(self, game_no: int) -> dict[str, str | list]:
+    def add_blocks(self, blocks: list[str]) -> None:
         """
-        Returns dictionary with information of a game from the pgn file
+        Adds blocks yielded by read_blocks to the game_data list (the file is being read in batches)
+        Only games whose moves have been added get an index in index_of_games
+
+        ...
+
+        Parameters:
+        -----------
+            blocks (list[str]):
+                next blocks of the file (information and moves of the games, in turn)
+        """
+        self.game_data.extend(blocks)
+        self.index_of_games.extend(range(len(self.index_of_games) * 2, len(self.game_data) - 1, 2))
+
+    def get_header(self, game_no: int) -> dict[str, str]:
+        """
+        Returns dictionary with the header information of a game from the pgn file (the moves are not processed)
         The game is selected by the index 'game_no'
-        Dictionary key-words: Event, Site, Date, White, Black, Result, Rounds, moves
+        Dictionary key-words: Event, Site, Date, Round, White, Black, Result
 
         ...
 
@@ -81,7 +139,27 @@ class FilePGN:
         Returns:
         --------
             game_dict (dict):
-                dictionary with game information
+                dictionary with game header information
+        """
+        return self.parse_header(self.game_data[game_no])
+
+    @staticmethod
+    def parse_header(header: str) -> dict[str, str]:
+        """
+        Returns dictionary with the information found in the header (tag pairs) of a game
+        Dictionary key-words: Event, Site, Date, Round, White, Black, Result
+
+        ...
+
+        Parameters:
+        -----------
+            header (str):
+                information of a game as read from the pgn file (a block yielded by read_blocks)
+
+        Returns:
+        --------
+            game_dict (dict):
+                dictionary with game header information
         """
         # list containing key-words
         info_list = ["Event ", "Site ", "Date ", "Round ", "White ", "Black ", "Result "]
@@ -89,7 +167,7 @@ class FilePGN:
         game_dict = {}
 
         # storing the game info for easier access
-        game_info = self.game_data[game_no].split("\n")
+        game_info = header.split("\n")
 
         # extraction of game info
         for key_word in info_list:
@@ -106,6 +184,55 @@ class FilePGN:
             else:
                 game_dict[key_word.strip()] = "[no info]"
 
+        return game_dict
+
+    @staticmethod
+    def parse_tags(header: str) -> dict[str, str]:
+        """
+        Returns dictionary with every tag pair found in the header of a game (in the order of the file), e.g.
+        [ECO "B44"] gives 'ECO': 'B44'
+
+        ...
+
+        Parameters:
+        -----------
+            header (str):
+                information of a game as read from the pgn file (a block yielded by read_blocks)
+
+        Returns:
+        --------
+            tags (dict):
+                dictionary with the value of each tag
+        """
+        tags = {}
+        for string in header.split("\n"):
+            # e.g. string: [Event "Sparkassen Chess Meeting"]
+            if string[:1] == "[" and "\"" in string:
+                start = string.find("\"")
+                tags[string[1:start].strip()] = string[start + 1:string.rfind("\"")]
+        return tags
+
+    def get_info(self, game_no: int) -> dict[str, str | list]:
+        """
+        Returns dictionary with information of a game from the pgn file
+        The game is selected by the index 'game_no'
+        Dictionary key-words: Event, Site, Date, White, Black, Result, Rounds, moves
+
+        ...
+
+        Parameters:
+        -----------
+            game_no (int):
+                even non-negative number (0, 2, 4 etc.) from index_of_games attribute
+
+        Returns:
+        --------
+            game_dict (dict):
+                dictionary with game information
+        """
+        # header information of the game
+        game_dict: dict = self.get_header(game_no)
+
         try:
             # string with the game moves
             game_moves = self.game_data[game_no + 1]
@@ -121,6 +248,83 @@ class FilePGN:
         # dictionary gets returned
         return game_dict
 
+    @staticmethod
+    def read_blocks(file_path: str) -> Iterator[str]:
+        """
+        Yields the information and the moves of the games stored inside the pgn file, in turn, while the file is read
+        (the whole file is never kept in memory as a single string)
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of a pgn file
+
+        Yields:
+        -------
+            (str):
+                information or moves of a game
+        """
+        # pgn file gets opened
+        with open(file_path, "r") as pgn:
+            # initialization of temporary list to store the lines of the current block
+            block = []
+            # loop through the file contents by line
+            for line in pgn:
+                # every time a line with the "\n" is read, the reading of either the game information or game moves has
+                # been finished
+                if line == "\n":
+                    # in case more than one empty lines exist between them, they get ignored
+                    if not block:
+                        continue
+                    block.append(line)
+                    # all the information stored till now is yielded
+                    yield "".join(block)
+                    # the temporary list gets reset
+                    block = []
+                else:
+                    block.append(line)
+
+            # if the file doesn't end on an empty line, the final information is yielded
+            if block:
+                yield "".join(block)
+
+    @staticmethod
+    def read_offsets(file_path: str) -> list[int]:
+        """
+        Returns the byte offset of every block of the pgn file (the same blocks yielded by read_blocks), so that the
+        games can be found in the file without being parsed
+        Blocks at even positions are the information of the games, blocks at odd positions their moves
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of a pgn file
+
+        Returns:
+        --------
+            offsets (list[int]):
+                byte offset of the first line of each block
+        """
+        offsets = []
+        # the file is read in binary mode, so the offsets are byte positions
+        with open(file_path, "rb") as pgn:
+            position = 0
+            in_block = False
+            for line in pgn:
+                if line in (b"\n", b"\r\n"):
+                    # empty line, end of the current block
+                    in_block = False
+                elif not in_block:
+                    # first line of a new block
+                    offsets.append(position)
+                    in_block = True
+                position += len(line)
+        return offsets
+
     def __split_files(self) -> list[str]:
         """
         returns list with the information and moves of the games stored inside the pgn file
@@ -141,40 +345,13 @@ class FilePGN:
             PossibleCorruptFile (Exception):
                 if the length of the list to return is not even number
         """
+        game_data_list = list(self.read_blocks(self.file_path))
 
-        # pgn file gets opened
-        with open(self.file_path, "r") as pgn:
-            # initialization of list to store information
-            game_data_list = []
-            # initialization of temporary string variable to store information
-            game_data = ''
-            # loop through the file contents by line
-            for line in pgn:
-                # concatenation of line to the game_data string
-                game_data += line
-                # every time a line with the "\n" is read, the reading of either the game information or game moves has
-                # been finished
-                if line == "\n":
-                    # in case more than one empty lines exist between them, they get ignored
-                    if game_data == "\n":
-                        game_data = ''
-                        continue
-                    # all the information stored till now is added to the list
-                    game_data_list.append(game_data)
-                    # the temporary variable gets reset
-                    game_data = ''
-
-            # if the file doesn't end on an empty line, the final information is added to the list
-            if game_data:
-                game_data_list.append(game_data)
-
-            pgn.close()
+        if len(game_data_list) % 2 != 0:
+            # some error occurred while reading the file
+            raise PossibleCorruptFile('Length of list should be even number, not ' + str(len(game_data_list)))
 
-            if len(game_data_list) % 2 != 0:
-                # some error occurred while reading the file
-                raise PossibleCorruptFile('Length of list should be even number, not ' + str(len(game_data_list)))
-
-            return game_data_list
+        return game_data_list
 
     def __get_index_of_games(self) -> list:
         """
@@ -282,3 +459,121 @@ class FilePGN:
         length = len(processed_game_moves)
         # returns string with the number of rounds (number of moves divided by two)
         return str(length // 2 if length % 2 == 0 else (length // 2) + 1)
+
+
+class PGNBlocks(Sequence):
+    """
+    Read-only list of the blocks of a pgn file (information and moves of the games, in turn) that reads each block from
+    the file only when it is needed, using the byte offsets of the blocks from the index of the file
+    Used as the game_data of a FilePGN opened from its index, so that a big file is never parsed as a whole
+
+    ...
+
+    Attributes:
+    -----------
+        file_path (str):
+            address of the pgn file
+
+        offsets (list[int]):
+            byte offset of each block
+
+    Methods:
+    --------
+        @staticmethod
+        decode(data: bytes) -> str:
+            returns the text of a block read in binary mode
+
+        @staticmethod
+        read_blocks(file_path: str) -> Iterator[str]:
+            yields the blocks of a pgn file read in binary mode
+    """
+
+    def __init__(self, file_path: str, offsets: list[int]):
+        """
+        Initializes the list (nothing is read from the file)
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of the pgn file
+
+            offsets (list[int]):
+                byte offset of each block (from FilePGN.read_offsets)
+        """
+        self.file_path = file_path
+        self.offsets = offsets
+
+    def __len__(self) -> int:
+        return len(self.offsets)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self.offsets)))]
+        if i < 0:
+            i += len(self.offsets)
+        if not 0 <= i < len(self.offsets):
+            raise IndexError("block index out of range")
+
+        # the block ends where the next one starts (the last one at the end of the file)
+        with open(self.file_path, "rb") as pgn:
+            pgn.seek(self.offsets[i])
+            data = pgn.read(self.offsets[i + 1] - self.offsets[i] if i + 1 < len(self.offsets) else -1)
+        return self.decode(data)
+
+    @staticmethod
+    def decode(data: bytes) -> str:
+        """
+        Returns the text of a block read in binary mode, as read_blocks would read it in text mode (same encoding and
+        line endings), undecodable bytes are replaced
+
+        ...
+
+        Parameters:
+        -----------
+            data (bytes):
+                contents of the block
+
+        Returns:
+        --------
+            (str):
+                text of the block
+        """
+        return data.decode(getpreferredencoding(False), errors="replace").replace("\r\n", "\n")
+
+    @staticmethod
+    def read_blocks(file_path: str) -> Iterator[str]:
+        """
+        Yields the information and the moves of the games stored inside the pgn file, in turn, like
+        FilePGN.read_blocks, but the file is read in binary mode and each block is decoded like the other blocks, so
+        files that are not valid in the preferred encoding are read, too
+
+        ...
+
+        Parameters:
+        -----------
+            file_path (str):
+                address of a pgn file
+
+        Yields:
+        -------
+            (str):
+                information or moves of a game
+        """
+        with open(file_path, "rb") as pgn:
+            block = []
+            for line in pgn:
+                if line in (b"\n", b"\r\n"):
+                    # empty lines between the blocks are ignored, the one after a block ends it
+                    if not block:
+                        continue
+                    block.append(line)
+                    yield PGNBlocks.decode(b"".join(block))
+                    block = []
+                else:
+                    block.append(line)
+
+            # if the file doesn't end on an empty line, the final information is yielded
+            if block:
+                yield PGNBlocks.decode(b"".join(block))
@@ -0,0 +1,397 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# player_stats.py: includes class PlayerStats                                                                          #
+# -------------------------------------------------------------------------------------------------------------------- #
+from argparse import ArgumentParser
+from collections import Counter
+from itertools import islice, chain
+from pgn import FilePGN
+from game_database import GameDatabase
+
+
+class PlayerStats:
+    """
+    Statistics of the players of a pgn file or of the game database (score, results with each colour, results by year
+    and head-to-head records), computed from the White, Black, Result and Date tags of the games
+    The games are aggregated in a single streaming pass: the (White, Black, Result, year) rows are counted in batches
+    (Counter counts them in C, and most rows repeat), then each distinct row adds its count to a few counters (of each
+    player, of each player in its year and of the pair of players), so the memory grows with the number of players and
+    pairs, not with the number of games, and no query has to go through the games again
+    Every counter is a list [wins, draws, losses, unfinished] from the side of the player (of the first player of the
+    pair for the head-to-head records)
+
+    ...
+
+    Attributes:
+    -----------
+        BATCH_SIZE (int):
+            number of rows counted at once
+
+        OUTCOMES (dict[str, tuple[int, int]]):
+            index of the counter of White and of Black for each result
+
+        games (int):
+            number of games added
+
+        colours (dict[str, tuple[list[int], list[int]]]):
+            counters of each player with White and with Black
+
+        years (dict[str, dict[str, list[int]]]):
+            counters of each player by year ('????' for unknown dates)
+
+        pairs (dict[tuple[str, str], list[int]]):
+            counters of each pair of players (names sorted)
+
+    Methods:
+    --------
+        add(self, white: str, black: str, result: str, date: str = "", games: int = 1) -> None:
+            adds the result of a game (or of identical games)
+
+        add_headers(self, headers: Iterable[dict[str, str]]) -> PlayerStats:
+            adds the games of header dictionaries
+
+        add_file(self, pgn_file: FilePGN) -> PlayerStats:
+            adds the games of a pgn file
+
+        add_database(self, database: GameDatabase, game_ids: list[int] | None = None) -> PlayerStats:
+            adds the games of the game database
+
+        @staticmethod
+        summary(counter: list[int]) -> dict[str, int | float]:
+            returns the games, wins, draws, losses, points and score of a counter
+
+        player(self, name: str) -> dict | None:
+            returns the statistics of a player
+
+        head_to_head(self, name: str, opponent: str) -> dict[str, int | float] | None:
+            returns the record of a player against an opponent
+
+        opponents(self, name: str) -> dict[str, dict[str, int | float]]:
+            returns the record of a player against each opponent
+
+        ranking(self, min_games: int = 1) -> list[tuple[str, int, float]]:
+            returns the players sorted by number of games
+
+        __add_rows(self, rows: Iterable[tuple[str, str, str, str]]) -> None:
+            counts and adds (White, Black, Result, year) rows in batches
+    """
+
+    # number of rows counted at once (the memory of a batch is freed before the next one)
+    BATCH_SIZE = 100000
+
+    # index of the counter of White and of Black for each result (3 for unfinished or unknown results)
+    OUTCOMES = {"1-0": (0, 2), "1/2-1/2": (1, 1), "0-1": (2, 0)}
+
+    def __init__(self):
+        """
+        Initializes empty statistics
+        """
+        self.games = 0
+        self.colours = {}
+        self.years = {}
+        self.pairs = {}
+
+    def add(self, white: str, black: str, result: str, date: str = "", games: int = 1) -> None:
+        """
+        Adds the result of a game (or of a number of games with the same players, result and year) to the counters of
+        both players, of their year and of their pair
+
+        ...
+
+        Parameters:
+        -----------
+            white (str):
+                name of the White player
+
+            black (str):
+                name of the Black player
+
+            result (str):
+                result of the game ('1-0', '1/2-1/2', '0-1' or anything else for unfinished games)
+
+            date (str) default="":
+                date of the game (only the year is used, e.g. '1985.??.??')
+
+            games (int) default=1:
+                number of games
+        """
+        white, black = white.strip() or "?", black.strip() or "?"
+        white_outcome, black_outcome = self.OUTCOMES.get(result.strip(), (3, 3))
+        year = date[:4] if date[:4].isdigit() else "????"
+        self.games += games
+
+        colours = self.colours
+        if white not in colours:
+            colours[white] = ([0, 0, 0, 0], [0, 0, 0, 0])
+        if black not in colours:
+            colours[black] = ([0, 0, 0, 0], [0, 0, 0, 0])
+        colours[white][0][white_outcome] += games
+        colours[black][1][black_outcome] += games
+
+        years = self.years
+        for name, outcome in ((white, white_outcome), (black, black_outcome)):
+            player_years = years.get(name)
+            if player_years is None:
+                player_years = years[name] = {}
+            counter = player_years.get(year)
+            if counter is None:
+                counter = player_years[year] = [0, 0, 0, 0]
+            counter[outcome] += games
+
+        # the record of a pair is kept once, from the side of the first name
+        if white <= black:
+            pair, outcome = (white, black), white_outcome
+        else:
+            pair, outcome = (black, white), black_outcome
+        counter = self.pairs.get(pair)
+        if counter is None:
+            counter = self.pairs[pair] = [0, 0, 0, 0]
+        counter[outcome] += games
+
+    def add_headers(self, headers):
+        """
+        Adds the games of header dictionaries (e.g. from FilePGN.get_header or LibraryCatalogue.load_index), the
+        headers are consumed one by one, so they can be given by a generator
+
+        ...
+
+        Parameters:
+        -----------
+            headers (Iterable[dict[str, str]]):
+                header dictionaries with White, Black, Result and Date
+
+        Returns:
+        --------
+            (PlayerStats):
+                the statistics themselves (for chaining)
+        """
+        self.__add_rows((header.get("White", "?"), header.get("Black", "?"), header.get("Result", "*"),
+                         header.get("Date", "")[:4]) for header in headers)
+        return self
+
+    def add_file(self, pgn_file: FilePGN):
+        """
+        Adds the games of a pgn file (only the headers are parsed, not the moves)
+
+        ...
+
+        Parameters:
+        -----------
+            pgn_file (FilePGN):
+                pgn file
+
+        Returns:
+        --------
+            (PlayerStats):
+                the statistics themselves (for chaining)
+        """
+        return self.add_headers(pgn_file.get_header(game_no) for game_no in pgn_file.index_of_games)
+
+    def add_database(self, database: GameDatabase, game_ids: list[int] | None = None):
+        """
+        Adds the games of the game database (the rows are streamed from a cursor, only the columns that are needed
+        are read)
+
+        ...
+
+        Parameters:
+        -----------
+            database (GameDatabase):
+                database of the games
+
+            game_ids (list[int] | None) default=None:
+                ids of the games to add (e.g. from GameDatabase.query), None for every game
+
+        Returns:
+        --------
+            (PlayerStats):
+                the statistics themselves (for chaining)
+        """
+        connection = database.connection
+        select = "SELECT white, black, result, substr(date, 1, 4) FROM games"
+        if game_ids is None:
+            self.__add_rows(connection.execute(select))
+        else:
+            # the ids are read in chunks, below the limit of SQL variables
+            self.__add_rows(chain.from_iterable(
+                connection.execute(f"{select} WHERE id IN ({','.join('?' * len(game_ids[start:start + 500]))})",
+                                   game_ids[start:start + 500]) for start in range(0, len(game_ids), 500)))
+        return self
+
+    @staticmethod
+    def summary(counter: list) -> dict:
+        """
+        Returns the games, wins, draws, losses, points and score (points per finished game) of a counter
+
+        ...
+
+        Parameters:
+        -----------
+            counter (list[int]):
+                wins, draws, losses and unfinished games
+
+        Returns:
+        --------
+            (dict[str, int | float]):
+                'games', 'wins', 'draws', 'losses', 'points' and 'score' (0.0 ~ 1.0)
+        """
+        wins, draws, losses, unfinished = counter
+        finished = wins + draws + losses
+        points = wins + draws / 2
+        return {"games": finished + unfinished, "wins": wins, "draws": draws, "losses": losses, "points": points,
+                "score": points / finished if finished else 0.0}
+
+    def player(self, name: str) -> dict | None:
+        """
+        Returns the statistics of a player
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                name of the player (as written in the pgn files)
+
+        Returns:
+        --------
+            (dict | None):
+                'total', 'white' and 'black' summaries and 'years' (summary of each year), None for unknown players
+        """
+        colours = self.colours.get(name)
+        if colours is None:
+            return None
+        white, black = colours
+        return {"total": self.summary([w + b for w, b in zip(white, black)]),
+                "white": self.summary(white),
+                "black": self.summary(black),
+                "years": {year: self.summary(counter) for year, counter in sorted(self.years[name].items())}}
+
+    def head_to_head(self, name: str, opponent: str) -> dict | None:
+        """
+        Returns the record of a player against an opponent (from the side of the player)
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                name of the player
+
+            opponent (str):
+                name of the opponent
+
+        Returns:
+        --------
+            (dict[str, int | float] | None):
+                summary of the games between them, None if they never played each other
+        """
+        if name <= opponent:
+            counter = self.pairs.get((name, opponent))
+        else:
+            counter = self.pairs.get((opponent, name))
+            if counter is not None:
+                # the record is stored from the side of the opponent
+                counter = [counter[2], counter[1], counter[0], counter[3]]
+        return None if counter is None else self.summary(counter)
+
+    def opponents(self, name: str) -> dict:
+        """
+        Returns the record of a player against each opponent (goes through the pairs once)
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                name of the player
+
+        Returns:
+        --------
+            (dict[str, dict[str, int | float]]):
+                summary of the games against each opponent
+        """
+        records = {}
+        for (first, second), counter in self.pairs.items():
+            if first == name:
+                records[second] = self.summary(counter)
+            elif second == name:
+                records[first] = self.summary([counter[2], counter[1], counter[0], counter[3]])
+        return records
+
+    def ranking(self, min_games: int = 1) -> list:
+        """
+        Returns the players sorted by number of games (most games first)
+
+        ...
+
+        Parameters:
+        -----------
+            min_games (int) default=1:
+                players with fewer games are left out
+
+        Returns:
+        --------
+            (list[tuple[str, int, float]]):
+                name, number of games and score of each player
+        """
+        players = []
+        for name, (white, black) in self.colours.items():
+            total = self.summary([w + b for w, b in zip(white, black)])
+            if total["games"] >= min_games:
+                players.append((name, total["games"], total["score"]))
+        players.sort(key=lambda player: (-player[1], player[0]))
+        return players
+
+    def __add_rows(self, rows) -> None:
+        """
+        Counts (White, Black, Result, year) rows in batches and adds each distinct row with its count
+
+        ...
+
+        Parameters:
+        -----------
+            rows (Iterable[tuple[str, str, str, str]]):
+                White, Black, Result and year of each game
+        """
+        rows = iter(rows)
+        while True:
+            counts = Counter(islice(rows, self.BATCH_SIZE))
+            if not counts:
+                break
+            for (white, black, result, year), games in counts.items():
+                self.add(white or "", black or "", result or "", year or "", games)
+
+
+if __name__ == "__main__":
+    # command line: python player_stats.py "Karpov, Anatoly" [--vs "Kasparov, Garry"] [--file FILE.pgn]
+    parser = ArgumentParser(description="Shows the statistics of a player of the game database or of a pgn file")
+    parser.add_argument("player", nargs="?", help="name of the player (the ranking is shown if left out)")
+    parser.add_argument("--vs", help="name of the opponent (head-to-head record)")
+    parser.add_argument("--file", help="pgn file (instead of the game database)")
+    args = parser.parse_args()
+
+    stats = PlayerStats()
+    if args.file:
+        stats.add_file(FilePGN(args.file))
+    else:
+        stats.add_database(GameDatabase())
+
+    def line(label: str, summary: dict) -> str:
+        return f'{label:12}{summary["games"]:>7} games  +{summary["wins"]} ={summary["draws"]} -{summary["losses"]}  ' \
+               f'{summary["score"]:.1%}'
+
+    if args.player is None:
+        for ranked_name, ranked_games, ranked_score in stats.ranking()[:30]:
+            print(f"{ranked_name:40}{ranked_games:>7} games  {ranked_score:.1%}")
+    elif args.vs:
+        record = stats.head_to_head(args.player, args.vs)
+        print(line("vs " + args.vs, record) if record else f"{args.player} and {args.vs} never played each other")
+    else:
+        statistics = stats.player(args.player)
+        if statistics is None:
+            print(f"{args.player}: no games")
+        else:
+            print(line("Total", statistics["total"]))
+            print(line("White", statistics["white"]))
+            print(line("Black", statistics["black"]))
+            for stats_year, year_summary in statistics["years"].items():
+                print(line(stats_year, year_summary))
@@ -0,0 +1,386 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# position_index.py: includes class PositionIndex                                                                      #
+# -------------------------------------------------------------------------------------------------------------------- #
+from argparse import ArgumentParser
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from random import Random
+from zlib import decompress
+from game_loader import GameLoader
+from game_database import GameDatabase
+from opening_tree import OpeningTree
+from material_index import MaterialIndex
+from my_exceptions import NoMovesFound, FalseGame, FriendlyCapture
+
+
+class PositionIndex:
+    """
+    Index of every position reached by the games of the GameDatabase, used to find the games that reached a position
+    (given as FEN or as a screenshot of the GUI window) and the round they reached it
+    Every game is replayed once and each of its positions is hashed with Zobrist keys (a random number for each piece
+    on each square, XOR-ed together, plus one for the side to move), the hash is updated with the squares that change
+    from one round to the next instead of being computed again
+    The hashes are stored in the database along with the game and the first round they were reached, deleting or
+    importing a file again drops the positions of its games, so only new games get replayed by the next update
+    Positions are matched by piece placement and side to move (castling and en passant rights are not compared)
+    The same replay fills the OpeningTree (moves played from each position and their results) and the MaterialIndex
+    (material signature of each position)
+
+    ...
+
+    Attributes:
+    -----------
+        PIECES (tuple[str]):
+            names of the pieces in the screenshots ('kw', 'qw' ... 'pb')
+
+        FEN_PIECES (dict[str, str]):
+            piece name of each FEN letter
+
+        KEYS (dict[tuple[str, int], int]):
+            Zobrist key of each piece on each square (0 ~ 63, row * 8 + column)
+
+        BLACK_TO_MOVE (int):
+            Zobrist key of the side to move
+
+        BATCH_SIZE (int):
+            number of games replayed and stored in each transaction
+
+        database (GameDatabase):
+            database of the games
+
+        tree (OpeningTree):
+            opening explorer of the games, filled along with the index
+
+        material (MaterialIndex):
+            material signatures of the games, filled along with the index
+
+    Methods:
+    --------
+        @staticmethod
+        screenshot_key(screenshot: list[dict], ply: int) -> int:
+            returns the hash of a position of a GameLoader
+
+        @staticmethod
+        fen_key(fen: str) -> int:
+            returns the hash of a position given as FEN
+
+        @staticmethod
+        replay(list_of_moves: list) -> tuple[list[int], list[int]]:
+            replays a game and returns the hash and the material signature of each of its positions
+
+        @staticmethod
+        game_keys(game_loader: GameLoader) -> list[int]:
+            returns the hash of each position of a replayed game
+
+        update(self, workers: int | None = None, token=None, on_progress=None) -> int:
+            replays and indexes the games that have not been indexed yet
+
+        search(self, key: int) -> list[tuple[int, int]]:
+            returns the games that reached a position and the round they reached it
+
+        __create_tables(self) -> None:
+            creates the tables of the index
+    """
+
+    # names of the pieces in the screenshots
+    PIECES = ("kw", "qw", "rw", "bw", "nw", "pw", "kb", "qb", "rb", "bb", "nb", "pb")
+
+    # piece name of each FEN letter (upper case for white)
+    FEN_PIECES = {"K": "kw", "Q": "qw", "R": "rw", "B": "bw", "N": "nw", "P": "pw",
+                  "k": "kb", "q": "qb", "r": "rb", "b": "bb", "n": "nb", "p": "pb"}
+
+    # Zobrist keys, drawn from a fixed seed so they never change between runs (63 bits, so the hashes fit in the
+    # signed integers of SQLite)
+    KEYS = dict(zip(product(PIECES, range(64)), map(Random(0x5A0B).getrandbits, [63] * 768)))
+    BLACK_TO_MOVE = Random(0xB1AC).getrandbits(63)
+
+    # number of games replayed and stored in each transaction
+    BATCH_SIZE = 2000
+
+    def __init__(self, database: GameDatabase):
+        """
+        Initializes the index (the tables are created in the database if they do not exist)
+
+        ...
+
+        Parameters:
+        -----------
+            database (GameDatabase):
+                database of the games
+        """
+        self.database = database
+        self.__create_tables()
+        self.tree = OpeningTree(database)
+        self.material = MaterialIndex(database)
+        if self.tree.created or self.material.created:
+            # the games indexed before the tree or the material existed are replayed again by the next update, to fill
+            # them (the counts of the tree are added again from scratch)
+            with database.connection as connection:
+                connection.execute("DELETE FROM positions_indexed")
+                connection.execute("DELETE FROM opening_moves")
+
+    @staticmethod
+    def screenshot_key(screenshot: list, ply: int) -> int:
+        """
+        Returns the hash of a position of a GameLoader (e.g. the current position of a GUI window)
+
+        ...
+
+        Parameters:
+        -----------
+            screenshot (list[dict]):
+                list with the name, row and column of each piece (from GameLoader.screenshots_per_round)
+
+            ply (int):
+                round of the position (white moves at even rounds)
+
+        Returns:
+        --------
+            (int):
+                hash of the position
+        """
+        key = PositionIndex.BLACK_TO_MOVE if ply % 2 else 0
+        for piece in screenshot:
+            key ^= PositionIndex.KEYS.get((piece["name"], piece["row"] * 8 + piece["col"]), 0)
+        return key
+
+    @staticmethod
+    def fen_key(fen: str) -> int:
+        """
+        Returns the hash of a position given in Forsyth-Edwards Notation, e.g.
+        'rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq e3 0 1' (only the piece placement and the side to move
+        are used)
+
+        ...
+
+        Parameters:
+        -----------
+            fen (str):
+                position in FEN
+
+        Returns:
+        --------
+            (int):
+                hash of the position
+
+        Raises:
+        -------
+            ValueError (Exception):
+                the piece placement is not valid
+        """
+        fields = fen.split()
+        if not fields:
+            raise ValueError("Empty FEN")
+        ranks = fields[0].split("/")
+        if len(ranks) != 8:
+            raise ValueError(f"FEN should have 8 ranks, not {len(ranks)}")
+
+        key = PositionIndex.BLACK_TO_MOVE if len(fields) > 1 and fields[1] == "b" else 0
+        # the first rank of the FEN is the 8th rank, the top row of the board
+        for row, rank in enumerate(ranks):
+            col = 0
+            for char in rank:
+                if char.isdigit():
+                    col += int(char)
+                elif char in PositionIndex.FEN_PIECES:
+                    if col > 7:
+                        raise ValueError(f"FEN rank '{rank}' has more than 8 squares")
+                    key ^= PositionIndex.KEYS[(PositionIndex.FEN_PIECES[char], row * 8 + col)]
+                    col += 1
+                else:
+                    raise ValueError(f"Invalid FEN character '{char}'")
+            if col != 8:
+                raise ValueError(f"FEN rank '{rank}' should have 8 squares")
+        return key
+
+    @staticmethod
+    def replay(list_of_moves: list) -> tuple[list[int], list[int]]:
+        """
+        Replays a game and returns the hash and the material signature of each of its positions (task of the process
+        pool), games with a false move are indexed up to that move
+
+        ...
+
+        Parameters:
+        -----------
+            list_of_moves (list):
+                list with the moves of the game
+
+        Returns:
+        --------
+            (tuple[list[int], list[int]]):
+                hash and material signature of the position of each round (starting position first), empty if the
+                game has no moves
+        """
+        try:
+            game_loader = GameLoader(list_of_moves, lazy=True)
+        except NoMovesFound:
+            return [], []
+        try:
+            game_loader.load_plies(game_loader.moves_length)
+        except (FalseGame, FriendlyCapture):
+            pass
+        return PositionIndex.game_keys(game_loader), MaterialIndex.game_signatures(game_loader)
+
+    @staticmethod
+    def game_keys(game_loader: GameLoader) -> list[int]:
+        """
+        Returns the hash of each position replayed by a GameLoader
+        The hash of each round is the hash of the previous one with the keys of the squares that changed
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                replayed game
+
+        Returns:
+        --------
+            (list[int]):
+                hash of the position of each round (starting position first)
+        """
+        keys = PositionIndex.KEYS
+        board = ["  "] * 64
+        key = 0
+        hashes = []
+        for ply in range(game_loader.plies_loaded + 1):
+            for piece in game_loader.screenshots_per_round[ply]:
+                square = piece["row"] * 8 + piece["col"]
+                name = piece["name"]
+                if board[square] != name:
+                    # the old piece is taken out and the new one put in
+                    key ^= keys.get((board[square], square), 0) ^ keys.get((name, square), 0)
+                    board[square] = name
+            hashes.append(key ^ PositionIndex.BLACK_TO_MOVE if ply % 2 else key)
+        return hashes
+
+    def update(self, workers: int | None = None, token=None, on_progress=None) -> int:
+        """
+        Replays and indexes the games of the database that have not been indexed yet (the games are replayed by a
+        process pool, each batch of games is stored inside one transaction, along with its moves in the opening tree
+        and its material signatures)
+        The lock of the database is held for one batch at a time, so the library can be synced and queried between
+        the batches, the games deleted or indexed by another thread in the meantime are skipped
+
+        ...
+
+        Parameters:
+        -----------
+            workers (int | None) default=None:
+                number of processes (None for the number of processors)
+
+            token (CancelToken | None) default=None:
+                checked before every batch, the update stops once it has been cancelled (the games indexed so far are
+                kept)
+
+            on_progress (Callable[[int, int], None] | None) default=None:
+                called with the number of games done and the number of games to index after every batch
+
+        Returns:
+        --------
+            (int):
+                number of games indexed
+        """
+        connection = self.database.connection
+        with self.database.lock:
+            pending = [game_id for game_id, in connection.execute("SELECT id FROM games WHERE id NOT IN "
+                                                                  "(SELECT game_id FROM positions_indexed) "
+                                                                  "ORDER BY id")]
+        if not pending:
+            return 0
+
+        indexed = 0
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for start in range(0, len(pending), self.BATCH_SIZE):
+                if token is not None and token.cancelled:
+                    break
+                chunk = pending[start:start + self.BATCH_SIZE]
+                with self.database.lock:
+                    # the games deleted (e.g. by a sync) or indexed by another thread since the start are skipped
+                    batch = connection.execute(f"SELECT id, file_id, result, data FROM games JOIN moves "
+                                               f"ON id = game_id WHERE id IN ({','.join('?' * len(chunk))}) AND id "
+                                               f"NOT IN (SELECT game_id FROM positions_indexed) ORDER BY id",
+                                               chunk).fetchall()
+                    moves = []
+                    for _, _, _, data in batch:
+                        text = decompress(data).decode()
+                        moves.append(text.split("\n") if text else [])
+
+                    rows = []
+                    games = []
+                    signatures = []
+                    for (game_id, file_id, result, _), list_of_moves, (hashes, material) in zip(
+                            batch, moves, executor.map(PositionIndex.replay, moves, chunksize=16)):
+                        games.append((file_id, hashes, list_of_moves, result))
+                        signatures.append((game_id, material))
+                        # only the first round a position was reached is stored
+                        first = {}
+                        for ply, key in enumerate(hashes):
+                            first.setdefault(key, ply)
+                        rows.extend((key, game_id, ply) for key, ply in first.items())
+                    with connection:
+                        connection.executemany("INSERT OR IGNORE INTO positions (hash, game_id, ply) VALUES (?, ?, ?)",
+                                               rows)
+                        connection.executemany("INSERT INTO positions_indexed (game_id) VALUES (?)",
+                                               [(game_id,) for game_id, _, _, _ in batch])
+                        self.tree.add_games(games)
+                        self.material.add_games(signatures)
+                indexed += len(batch)
+                if on_progress is not None:
+                    on_progress(start + len(chunk), len(pending))
+        return indexed
+
+    def search(self, key: int) -> list[tuple[int, int]]:
+        """
+        Returns the games that reached a position and the first round they reached it
+
+        ...
+
+        Parameters:
+        -----------
+            key (int):
+                hash of the position (from screenshot_key or fen_key)
+
+        Returns:
+        --------
+            (list[tuple[int, int]]):
+                id of each game and round of the position, sorted by game
+        """
+        return self.database.connection.execute("SELECT game_id, ply FROM positions WHERE hash = ? ORDER BY game_id",
+                                                (key,)).fetchall()
+
+    def __create_tables(self) -> None:
+        """
+        Creates the tables of the index (if they do not exist), the positions of a game are deleted along with it
+        """
+        with self.database.connection as connection:
+            connection.executescript("""
+                CREATE TABLE IF NOT EXISTS positions (
+                    hash INTEGER NOT NULL,
+                    game_id INTEGER NOT NULL REFERENCES games (id) ON DELETE CASCADE,
+                    ply INTEGER NOT NULL,
+                    PRIMARY KEY (hash, game_id)) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS positions_game ON positions (game_id);
+                CREATE TABLE IF NOT EXISTS positions_indexed (
+                    game_id INTEGER PRIMARY KEY REFERENCES games (id) ON DELETE CASCADE);
+            """)
+
+
+if __name__ == "__main__":
+    # command line: python position_index.py update | python position_index.py search "FEN"
+    parser = ArgumentParser(description="Indexes the positions of the game database and finds the games reaching one")
+    parser.add_argument("command", choices=("update", "search"))
+    parser.add_argument("fen", nargs="?", help="position to search (FEN)")
+    parser.add_argument("--workers", type=int, help="number of processes")
+    args = parser.parse_args()
+
+    game_database = GameDatabase()
+    position_index = PositionIndex(game_database)
+    if args.command == "update":
+        print(f"{position_index.update(args.workers)} games indexed")
+    else:
+        found = position_index.search(PositionIndex.fen_key(args.fen or ""))
+        for (found_id, found_ply), header in zip(found, game_database.headers([game_id for game_id, _ in found])):
+            print(f'{header["White"]} vs {header["Black"]} ({header["Result"]}) {header["Date"]}, '
+                  f'move {found_ply // 2 + 1}')
@@ -0,0 +1,134 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# position_search.py: includes class PositionSearch                                                                    #
+# -------------------------------------------------------------------------------------------------------------------- #
+from tkinter import Toplevel, Button
+from virtual_listbox import VirtualListbox
+from game_database import GameDatabase
+
+
+class PositionSearch(Toplevel):
+    """
+    Opens a new window (Toplevel) with the games of the library that reached a position and the move they reached it
+    A game is opened at that move by double-clicking it or with the Open button
+
+    ...
+
+    Attributes:
+    -----------
+        database (GameDatabase):
+            database of the games
+
+        results (list[tuple[int, int]]):
+            id of each game and round it reached the position (from PositionIndex.search)
+
+        on_open (Callable[[int, int], None]):
+            called with the id of the game and the round to open it at
+
+        headers (dict[int, dict]):
+            header dictionaries of the games shown so far (by game id)
+
+        listbox (VirtualListbox):
+            list of the games
+
+        button_open (Button):
+            button to open the selected game
+
+    Methods:
+    --------
+        row_text(self, i: int) -> str:
+            returns the text of a row of the list
+
+        open_selected(self, event=None) -> None:
+            opens the selected game at the round it reached the position
+    """
+    def __init__(self, master, database: GameDatabase, results: list, on_open):
+        """
+        Initializes the window
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                window the search was started from
+
+            database (GameDatabase):
+                database of the games
+
+            results (list[tuple[int, int]]):
+                id of each game and round it reached the position
+
+            on_open (Callable[[int, int], None]):
+                called with the id of the game and the round to open it at
+        """
+        super().__init__(master=master)
+        self.title(f"[Position Search] {len(results)} games")
+        self.iconbitmap("icons\\stonk.ico")
+        self.config(background="light blue")
+        self.resizable(False, False)
+
+        self.database = database
+        self.results = results
+        self.on_open = on_open
+        self.headers = {}
+
+        # the headers of the games are read from the database only for the visible rows
+        self.listbox = VirtualListbox(self, row_text=self.row_text, width=80, height=15)
+        self.listbox.set_size(len(results))
+        for row in self.listbox.rows:
+            row.bind("<Double-Button-1>", self.open_selected)
+        self.listbox.bind("<Return>", self.open_selected)
+
+        self.button_open = Button(self,
+                                  text="Open",
+                                  font=("consolas", 12, "bold"),
+                                  background="light green",
+                                  activebackground="green",
+                                  width=12,
+                                  command=self.open_selected)
+
+        self.listbox.pack()
+        self.button_open.pack(side="right", padx=4, pady=4)
+
+    def row_text(self, i: int) -> str:
+        """
+        Returns the text of a row of the list (the header of the game is read the first time it is shown)
+
+        ...
+
+        Parameters:
+        -----------
+            i (int):
+                index of the row
+
+        Returns:
+        --------
+            (str):
+                text of the row
+        """
+        game_id, ply = self.results[i]
+        header = self.headers.get(game_id)
+        if header is None:
+            try:
+                header = self.database.get_header(game_id)
+            except KeyError:
+                # the file of the game has been imported again since the search
+                return f'{str(i + 1) + ".":5}game no longer in the library'
+            self.headers[game_id] = header
+        return f'{str(i + 1) + ".":5}{header["White"]} vs {header["Black"]} ({header["Result"]}) ' \
+               f'{header["Date"]}, move {ply // 2 + 1}'
+
+    def open_selected(self, event=None) -> None:
+        """
+        Opens the selected game at the round it reached the position
+
+        ...
+
+        Parameters:
+        -----------
+            event (<Double-Button-1> | <Return> | None) default=None:
+                method gets called when a row is double-clicked, Enter is pressed or the Open button is pressed
+        """
+        selection = self.listbox.curselection()
+        if selection:
+            self.on_open(*self.results[selection[0]])
@@ -0,0 +1,251 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# replay_cache.py: includes class ReplayCache                                                                          #
+# -------------------------------------------------------------------------------------------------------------------- #
+from hashlib import sha1
+from json import dump, load
+from os import listdir, makedirs, remove, replace, stat, utime
+from os.path import join
+from game_loader import GameLoader
+
+
+class ReplayCache:
+    """
+    Stores the results of a GameLoader replay (screenshots, captures, checks and tracers) in a local directory, so that
+    a game that has been replayed before can be displayed without replaying its moves again
+    Each game is stored in its own file, named after the hash of its moves list
+    The total size of the directory is capped, the least recently used files are removed first
+
+    ...
+
+    Attributes:
+    -----------
+        directory (str):
+            path of the cache directory
+
+        max_size (int):
+            maximum size of the cache directory in bytes
+
+        hits (int):
+            number of games found in the cache
+
+        misses (int):
+            number of games that were not found in the cache
+
+        __sizes (dict[str, int] | None):
+            size of each cache file (None until the directory is first scanned)
+
+    Methods:
+    --------
+        get_game_loader(self, list_of_moves: list) -> GameLoader:
+            returns a replayed GameLoader from the cache or a new (lazy) one
+
+        load(self, list_of_moves: list) -> GameLoader | None:
+            returns the cached GameLoader of the moves list
+
+        store(self, game_loader: GameLoader) -> None:
+            stores a fully replayed GameLoader in the cache
+
+        @staticmethod
+        key(list_of_moves: list) -> str:
+            returns the hash of a moves list
+
+        __evict(self) -> None:
+            removes the least recently used files until the cache fits in max_size
+    """
+
+    # format version of the stored files (files of other versions are ignored)
+    VERSION = 1
+
+    def __init__(self, directory: str = "replay_cache", max_size: int = 50 * 1024 * 1024):
+        """
+        Initializes the cache
+
+        ...
+
+        Parameters:
+        -----------
+            directory (str) default="replay_cache":
+                path of the cache directory (created if it does not exist)
+
+            max_size (int) default=50MB:
+                maximum size of the cache directory in bytes
+        """
+        self.directory = directory
+        self.max_size = max_size
+
+        # hit/miss counters
+        self.hits = 0
+        self.misses = 0
+
+        # sizes of the cache files (filled on first store)
+        self.__sizes: dict[str, int] | None = None
+
+    def get_game_loader(self, list_of_moves: list) -> GameLoader:
+        """
+        Returns the cached GameLoader of the moves list, or a new GameLoader (lazy) that has not replayed any moves yet
+
+        ...
+
+        Parameters:
+        -----------
+            list_of_moves (list):
+                list with the moves of the game
+
+        Returns:
+        --------
+            (GameLoader):
+                game loader object
+
+        Raises:
+        -------
+            NoMovesFound (Exception):
+                the current game has no moves
+        """
+        game_loader = self.load(list_of_moves)
+        if game_loader is None:
+            game_loader = GameLoader(list_of_moves, lazy=True)
+        return game_loader
+
+    def load(self, list_of_moves: list) -> GameLoader | None:
+        """
+        Returns a GameLoader restored from the cache without replaying the moves, or None if the game is not cached
+
+        ...
+
+        Parameters:
+        -----------
+            list_of_moves (list):
+                list with the moves of the game
+
+        Returns:
+        --------
+            (GameLoader | None):
+                restored game loader (None if the game was not found)
+
+        Raises:
+        -------
+            NoMovesFound (Exception):
+                the current game has no moves
+        """
+        file_path = join(self.directory, self.key(list_of_moves) + ".json")
+        try:
+            with open(file_path, "r") as file:
+                data = load(file)
+            # the file is marked as recently used
+            utime(file_path)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        if data.get("version") != self.VERSION or data.get("moves") != list_of_moves:
+            # file of an older version (or hash collision)
+            self.misses += 1
+            return None
+
+        # an empty loader is created and the stored results are assigned to it
+        game_loader = GameLoader(list_of_moves, lazy=True)
+        game_loader.screenshots_per_round = [
+            [{"name": screenshot[i:i + 2], "row": i // 16, "col": (i // 2) % 8} for i in range(0, 128, 2)]
+            for screenshot in data["screenshots"]
+        ]
+        game_loader.captures_per_round = data["captures"]
+        game_loader.check_per_round = data["checks"]
+        game_loader.background_tracers = [tuple(tuple(square) for square in tracer) for tracer in data["tracers"]]
+        game_loader.captured_diff_per_round = data["captured_diff"]
+
+        self.hits += 1
+        return game_loader
+
+    def store(self, game_loader: GameLoader) -> None:
+        """
+        Stores the results of a fully replayed GameLoader in the cache
+        Games that could not be replayed are not stored
+
+        ...
+
+        Parameters:
+        -----------
+            game_loader (GameLoader):
+                fully replayed game loader
+        """
+        if not game_loader.fully_loaded or game_loader.replay_error is not None:
+            return
+
+        # each screenshot is stored as a string with the 2 character name of the piece on each square (row by row)
+        screenshots = []
+        for screenshot in game_loader.screenshots_per_round:
+            squares = ["  "] * 64
+            for piece in screenshot:
+                squares[piece["row"] * 8 + piece["col"]] = piece["name"]
+            screenshots.append("".join(squares))
+
+        data = {"version": self.VERSION,
+                "moves": game_loader.moves,
+                "screenshots": screenshots,
+                "captures": game_loader.captures_per_round,
+                "checks": game_loader.check_per_round,
+                "tracers": game_loader.background_tracers,
+                "captured_diff": game_loader.captured_diff_per_round}
+
+        file_name = self.key(game_loader.moves) + ".json"
+        try:
+            makedirs(self.directory, exist_ok=True)
+            # the file is written under a temporary name first, so that a half written file is never loaded
+            with open(join(self.directory, file_name + ".tmp"), "w") as file:
+                dump(data, file, separators=(",", ":"))
+            replace(join(self.directory, file_name + ".tmp"), join(self.directory, file_name))
+            size = stat(join(self.directory, file_name)).st_size
+        except OSError:
+            # caching is optional, the game is simply replayed again next time
+            return
+
+        if self.__sizes is None:
+            # first store, the directory is scanned for the existing files
+            self.__sizes = {}
+            for name in listdir(self.directory):
+                if name.endswith(".json"):
+                    self.__sizes[name] = stat(join(self.directory, name)).st_size
+        self.__sizes[file_name] = size
+
+        if sum(self.__sizes.values()) > self.max_size:
+            self.__evict()
+
+    @staticmethod
+    def key(list_of_moves: list) -> str:
+        """
+        Returns the hash of a moves list, used as name of the cache file
+
+        ...
+
+        Parameters:
+        -----------
+            list_of_moves (list):
+                list with the moves of the game
+
+        Returns:
+        --------
+            (str):
+                hexadecimal hash of the moves
+        """
+        return sha1(" ".join(list_of_moves).encode()).hexdigest()
+
+    def __evict(self) -> None:
+        """
+        Removes the least recently used files (oldest modification time) until the cache fits in max_size
+        """
+        # files sorted from least to most recently used
+        access_times = {}
+        for name in self.__sizes:
+            try:
+                access_times[name] = stat(join(self.directory, name)).st_mtime
+            except OSError:
+                access_times[name] = 0
+        total = sum(self.__sizes.values())
+        for name in sorted(self.__sizes, key=access_times.get):
+            if total <= self.max_size:
+                break
+            try:
+                remove(join(self.directory, name))
+            except OSError:
+                pass
+            total -= self.__sizes.pop(name)
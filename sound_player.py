@@ -0,0 +1,97 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# sound_player.py: includes class SoundPlayer                                                                          #
+# -------------------------------------------------------------------------------------------------------------------- #
+from pygame import mixer, error
+
+
+class SoundPlayer:
+    """
+    Process-wide player of the sound effects
+    The pygame mixer is initialized on the first sound played (never, if sound is turned off), all the sound effects
+    are then decoded once into in-memory Sound objects and played through a small pool of channels, so that no file is
+    loaded or decoded while stepping through a game
+
+    ...
+
+    Attributes:
+    -----------
+        SOUND_FILES (dict[str, str]):
+            path of the file of each sound effect
+
+        CHANNELS (int):
+            number of channels in the pool
+
+        __sounds (dict[str, Sound] | None):
+            decoded sound effects (None until the mixer is initialized)
+
+        __channels (list[Channel]):
+            pool of channels (used in turn)
+
+        __next_channel (int):
+            index of the channel to use next
+
+    Methods:
+    --------
+        @classmethod
+        play(cls, name: str, fade_ms: int = 0) -> None:
+            plays a sound effect
+
+        @classmethod
+        __init_mixer(cls) -> None:
+            initializes the mixer and decodes the sound effects
+    """
+
+    # path of the file of each sound effect
+    SOUND_FILES = {"move": "sound_effects\\move_sound.mp3",
+                   "capture": "sound_effects\\capture_sound.mp3",
+                   "previous": "sound_effects\\previous_move.mp3",
+                   "restart": "sound_effects\\restart.mp3"}
+
+    # number of channels in the pool
+    CHANNELS = 4
+
+    __sounds = None
+    __channels = []
+    __next_channel = 0
+
+    @classmethod
+    def play(cls, name: str, fade_ms: int = 0) -> None:
+        """
+        Plays a sound effect (the mixer gets initialized the first time a sound is played)
+        If the mixer could not be initialized (e.g. no audio device), nothing is played
+
+        ...
+
+        Parameters:
+        -----------
+            name (str):
+                name of the sound effect ("move", "capture", "previous", "restart")
+
+            fade_ms (int) default=0:
+                fade-in time in milliseconds
+        """
+        if cls.__sounds is None:
+            cls.__init_mixer()
+        if not cls.__channels:
+            return
+
+        # the channels are used in turn, the oldest sound gets stopped if the channel is still busy
+        channel = cls.__channels[cls.__next_channel]
+        cls.__next_channel = (cls.__next_channel + 1) % len(cls.__channels)
+        channel.play(cls.__sounds[name], fade_ms=fade_ms)
+
+    @classmethod
+    def __init_mixer(cls) -> None:
+        """
+        Initializes the pygame mixer, decodes every sound effect and creates the pool of channels
+        """
+        cls.__sounds = {}
+        try:
+            mixer.init()
+            mixer.set_num_channels(cls.CHANNELS)
+            for name, path in cls.SOUND_FILES.items():
+                cls.__sounds[name] = mixer.Sound(path)
+        except (error, OSError):
+            # sound is not available, the app continues without it
+            return
+        cls.__channels = [mixer.Channel(i) for i in range(cls.CHANNELS)]
@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# test_file_loader.py: tests of class FileLoader                                                                       #
+# -------------------------------------------------------------------------------------------------------------------- #
+from os.path import join
+from tempfile import TemporaryDirectory
+from time import sleep
+from unittest import TestCase, main
+from file_loader import FileLoader
+from game_index import GameIndex
+from pgn import FilePGN
+
+
+class FakeMaster:
+    """
+    Stands in for a Tk widget: the callbacks scheduled through after() are run by run_pending
+    """
+    def __init__(self):
+        self.pending = []
+
+    def after(self, ms, function):
+        self.pending.append(function)
+        return str(len(self.pending))
+
+    def after_cancel(self, identifier):
+        pass
+
+    def run_pending(self):
+        pending, self.pending = self.pending, []
+        for function in pending:
+            function()
+
+
+class TestFileLoader(TestCase):
+
+    def test_reads_latin_1_file(self):
+        with TemporaryDirectory() as directory:
+            file_path = join(directory, "latin_1.pgn")
+            with open(file_path, "wb") as file:
+                for white in ("Müller", "Sørensen", "Gonçalves"):
+                    file.write(f'[Event "Test"]\n[White "{white}"]\n[Black "Test"]\n[Result "1-0"]\n\n'
+                               f'1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0\n\n'.encode("latin-1"))
+
+            master = FakeMaster()
+            pgn_file = FilePGN(file_path, load=False)
+            events = []
+            loader = FileLoader(master, file_path, on_batch=lambda blocks, tokens: pgn_file.add_blocks(blocks),
+                                on_done=lambda: events.append("done"), on_error=events.append,
+                                header_function=GameIndex.header_tokens)
+            loader.start()
+            for _ in range(200):
+                if events:
+                    break
+                sleep(0.01)
+                master.run_pending()
+
+        self.assertEqual(events, ["done"])
+        self.assertEqual(len(pgn_file.index_of_games), 3)
+        self.assertEqual(pgn_file.get_header(pgn_file.index_of_games[0])["Black"], "Test")
+
+
+if __name__ == "__main__":
+    main()
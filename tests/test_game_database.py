@@ -0,0 +1,62 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# test_game_database.py: tests of class GameDatabase                                                                   #
+# -------------------------------------------------------------------------------------------------------------------- #
+from os.path import join
+from tempfile import TemporaryDirectory
+from unittest import TestCase, main
+from game_database import GameDatabase
+
+
+def write_games(file_path: str, players: list[tuple[str, str]]) -> None:
+    """
+    Writes a pgn file with a short game for each pair of players
+    """
+    with open(file_path, "w") as file:
+        for white, black in players:
+            file.write(f'[Event "Test"]\n[White "{white}"]\n[Black "{black}"]\n[Result "1-0"]\n\n'
+                       f'1. e4 e5 2. Qh5 Nc6 3. Bc4 Nf6 4. Qxf7# 1-0\n\n')
+
+
+class TestGameDatabase(TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.database = GameDatabase(directory=self.directory.name)
+        self.pgn = join(self.directory.name, "games.pgn")
+
+    def tearDown(self):
+        self.database.close()
+        self.directory.cleanup()
+
+    def test_reimported_game_ids_are_not_reused(self):
+        write_games(self.pgn, [("Alpha", "Beta"), ("Gamma", "Delta")])
+        self.database.import_file("games.pgn", self.pgn)
+        old_ids = self.database.query()
+
+        write_games(self.pgn, [("Epsilon", "Zeta"), ("Eta", "Theta")])
+        self.database.import_file("games.pgn", self.pgn)
+        self.assertTrue(set(old_ids).isdisjoint(self.database.query()))
+        for game_id in old_ids:
+            with self.assertRaises(KeyError):
+                self.database.get_info(game_id)
+            with self.assertRaises(KeyError):
+                self.database.get_header(game_id)
+
+    def test_removed_game_ids_are_not_reused(self):
+        write_games(self.pgn, [("Alpha", "Beta")])
+        self.database.sync({"games.pgn": self.pgn})
+        old_ids = self.database.query()
+
+        # the file is dropped, then another one is imported
+        self.database.sync({})
+        other = join(self.directory.name, "other.pgn")
+        write_games(other, [("Gamma", "Delta")])
+        self.database.sync({"other.pgn": other})
+        for game_id in old_ids:
+            with self.assertRaises(KeyError):
+                self.database.get_header(game_id)
+        self.assertEqual(self.database.get_header(self.database.query()[0])["White"], "Gamma")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,319 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# thumbnail_cache.py: includes class ThumbnailCache                                                                    #
+# -------------------------------------------------------------------------------------------------------------------- #
+from base64 import b64encode
+from collections import OrderedDict
+from os import makedirs, replace
+from os.path import join, isfile
+from queue import Queue, LifoQueue, Empty
+from struct import pack
+from threading import Thread
+from tkinter import PhotoImage
+from zlib import compress, crc32
+from game_loader import GameLoader
+from replay_cache import ReplayCache
+from my_exceptions import FalseGame, FriendlyCapture
+
+
+class ThumbnailCache:
+    """
+    Small images of the final position of the games, shown next to the games in the game list
+    The thumbnails are rendered by a worker thread (the game is replayed there, never on the Tk thread) and stored as
+    PNG files in an on-disk cache, named by the hash of the moves of the game, so each game is replayed only once
+    The Tk thread only turns the finished PNG data into PhotoImages (polled through after()), the most recently
+    requested thumbnails are rendered first and the latest ones are kept in memory
+
+    ...
+
+    Attributes:
+    -----------
+        SQUARE (int):
+            size of each square of the thumbnails in pixels
+
+        SIZE (int):
+            width/height of the thumbnails in pixels
+
+        COLOURS (dict[str, bytes]):
+            RGB colour of the squares and the pieces
+
+        POLL_MS (int):
+            time between two polls of the finished thumbnails in milliseconds
+
+        master (Misc):
+            widget used for the images and the polling
+
+        directory (str):
+            directory of the cached thumbnails
+
+        on_update (Callable[[], None] | None):
+            called when new thumbnails are ready
+
+        max_images (int):
+            maximum number of thumbnails kept in memory
+
+        placeholder (PhotoImage):
+            blank image shown while a thumbnail is being rendered
+
+        __images (OrderedDict[object, PhotoImage]):
+            thumbnails kept in memory by key (least recently used first)
+
+        __requested (set):
+            keys of the thumbnails being rendered
+
+        __requests (LifoQueue):
+            thumbnails to render: (generation, key, function returning the moves of the game)
+
+        __results (Queue):
+            rendered thumbnails: (generation, key, base64 PNG data or None)
+
+        __generation (int):
+            increased when the pending requests get cancelled
+
+        __worker (Thread | None):
+            worker thread (started on the first request)
+
+        __poll_id (str | None):
+            id of the scheduled poll
+
+    Methods:
+    --------
+        get(self, key, load_moves) -> PhotoImage:
+            returns the thumbnail of a game (or the placeholder while it is being rendered)
+
+        cancel_pending(self) -> None:
+            drops the thumbnails that have been requested but not rendered yet
+
+        close(self) -> None:
+            stops the worker and the polling
+
+        @staticmethod
+        render(screenshot: list[dict]) -> bytes:
+            returns the PNG data of the thumbnail of a position
+
+        __work(self) -> None:
+            renders the requested thumbnails (worker thread)
+
+        __poll(self) -> None:
+            creates the images of the rendered thumbnails (Tk thread)
+    """
+
+    # size of each square of the thumbnails in pixels
+    SQUARE = 5
+
+    # width/height of the thumbnails in pixels
+    SIZE = 8 * SQUARE
+
+    # RGB colour of the squares (same as the board of the GUI window) and the pieces
+    COLOURS = {"light": bytes.fromhex("EEEED2"), "dark": bytes.fromhex("47473C"),
+               "w": bytes.fromhex("FFFFFF"), "b": bytes.fromhex("000000"), "k": bytes.fromhex("D22020")}
+
+    # time between two polls of the finished thumbnails in milliseconds
+    POLL_MS = 50
+
+    def __init__(self, master, directory: str = "thumbnail_cache", on_update=None, max_images: int = 500):
+        """
+        Initializes the cache (the worker is started on the first request)
+
+        ...
+
+        Parameters:
+        -----------
+            master (Misc):
+                widget used for the images and the polling
+
+            directory (str) default="thumbnail_cache":
+                directory of the cached thumbnails (created if it does not exist)
+
+            on_update (Callable[[], None] | None) default=None:
+                called when new thumbnails are ready (e.g. to redraw the list)
+
+            max_images (int) default=500:
+                maximum number of thumbnails kept in memory
+        """
+        self.master = master
+        self.directory = directory
+        self.on_update = on_update
+        self.max_images = max_images
+        makedirs(directory, exist_ok=True)
+
+        self.placeholder = PhotoImage(master=master, width=self.SIZE, height=self.SIZE)
+
+        self.__images: OrderedDict = OrderedDict()
+        self.__requested = set()
+        self.__requests = LifoQueue()
+        self.__results = Queue()
+        self.__generation = 0
+        self.__worker = None
+        self.__poll_id = None
+
+    def get(self, key, load_moves) -> PhotoImage:
+        """
+        Returns the thumbnail of a game, or the placeholder while the thumbnail is being rendered (on_update is called
+        once it is ready)
+
+        ...
+
+        Parameters:
+        -----------
+            key (Hashable):
+                key of the game in memory (e.g. file path and position of the game in the file)
+
+            load_moves (Callable[[], list]):
+                function returning the moves of the game (called by the worker thread)
+
+        Returns:
+        --------
+            (PhotoImage):
+                thumbnail of the final position of the game
+        """
+        image = self.__images.get(key)
+        if image is not None:
+            self.__images.move_to_end(key)
+            return image
+
+        if key not in self.__requested:
+            self.__requested.add(key)
+            self.__requests.put((self.__generation, key, load_moves))
+            if self.__worker is None:
+                self.__worker = Thread(target=self.__work, daemon=True)
+                self.__worker.start()
+            if self.__poll_id is None:
+                self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
+        return self.placeholder
+
+    def cancel_pending(self) -> None:
+        """
+        Drops the thumbnails that have been requested but not rendered yet (e.g. when another file is selected)
+        """
+        self.__generation += 1
+        self.__requested.clear()
+
+    def close(self) -> None:
+        """
+        Stops the worker and the polling (the cached files are kept)
+        """
+        self.cancel_pending()
+        if self.__poll_id is not None:
+            self.master.after_cancel(self.__poll_id)
+            self.__poll_id = None
+        if self.__worker is not None:
+            # the worker stops when it gets the empty request
+            self.__requests.put((self.__generation, None, None))
+            self.__worker = None
+
+    @staticmethod
+    def render(screenshot: list) -> bytes:
+        """
+        Returns the PNG data of the thumbnail of a position (the pieces are drawn as white/black blocks, the kings in
+        red with a white/black centre, the pawns as smaller crosses)
+
+        ...
+
+        Parameters:
+        -----------
+            screenshot (list[dict]):
+                list with the name, row and column of each piece (from GameLoader.screenshots_per_round)
+
+        Returns:
+        --------
+            (bytes):
+                PNG data
+        """
+        square = ThumbnailCache.SQUARE
+        colours = ThumbnailCache.COLOURS
+
+        # colour of every pixel, squares first
+        pixels = [[colours["light" if (row // square + col // square) % 2 == 0 else "dark"]
+                   for col in range(8 * square)] for row in range(8 * square)]
+
+        # pieces drawn in the centre of their squares
+        for piece in screenshot:
+            name = piece["name"]
+            if name == "  ":
+                continue
+            top = piece["row"] * square + 1
+            left = piece["col"] * square + 1
+            for y in range(square - 2):
+                for x in range(square - 2):
+                    edge = y in (0, square - 3) and x in (0, square - 3)
+                    if name[0] == "p" and edge:
+                        # pawns without the corners
+                        continue
+                    if name[0] == "k" and (y, x) != ((square - 3) // 2, (square - 3) // 2):
+                        pixels[top + y][left + x] = colours["k"]
+                    else:
+                        pixels[top + y][left + x] = colours[name[1]]
+
+        # PNG file: signature, header (8-bit RGB), compressed rows (filter 0) and end chunks
+        def chunk(tag: bytes, data: bytes) -> bytes:
+            return pack(">I", len(data)) + tag + data + pack(">I", crc32(tag + data) & 0xFFFFFFFF)
+
+        raw = b"".join(b"\x00" + b"".join(row) for row in pixels)
+        return b"\x89PNG\r\n\x1a\n" + \
+            chunk(b"IHDR", pack(">IIBBBBB", 8 * square, 8 * square, 8, 2, 0, 0, 0)) + \
+            chunk(b"IDAT", compress(raw)) + \
+            chunk(b"IEND", b"")
+
+    def __work(self) -> None:
+        """
+        Renders the requested thumbnails, the most recent requests first (runs in the worker thread)
+        The thumbnail is read from the on-disk cache, or the game is replayed and the thumbnail is rendered and saved
+        """
+        while True:
+            generation, key, load_moves = self.__requests.get()
+            if key is None:
+                return
+            if generation != self.__generation:
+                # cancelled request
+                continue
+
+            data = None
+            try:
+                list_of_moves = load_moves()
+                path = join(self.directory, ReplayCache.key(list_of_moves) + ".png")
+                if isfile(path):
+                    with open(path, "rb") as file:
+                        data = file.read()
+                else:
+                    game_loader = GameLoader(list_of_moves, lazy=True)
+                    try:
+                        game_loader.load_plies(game_loader.moves_length)
+                    except (FalseGame, FriendlyCapture):
+                        # the thumbnail shows the last position that could be replayed
+                        pass
+                    data = self.render(game_loader.screenshots_per_round[game_loader.plies_loaded])
+                    # the file is written under a temporary name first, so a half-written file is never read
+                    with open(path + ".tmp", "wb") as file:
+                        file.write(data)
+                    replace(path + ".tmp", path)
+            except Exception:
+                # no thumbnail for this game (the placeholder stays), e.g. NoMovesFound, OSError or a game that is not
+                # in the game database any more, the worker goes on with the next request
+                pass
+            self.__results.put((generation, key, None if data is None else b64encode(data).decode()))
+
+    def __poll(self) -> None:
+        """
+        Creates the images of the rendered thumbnails and calls on_update, then polls again while thumbnails are being
+        rendered (runs in the Tk thread)
+        """
+        self.__poll_id = None
+        updated = False
+        while True:
+            try:
+                generation, key, data = self.__results.get_nowait()
+            except Empty:
+                break
+            if generation != self.__generation:
+                continue
+            self.__requested.discard(key)
+            self.__images[key] = self.placeholder if data is None else PhotoImage(master=self.master, data=data)
+            updated = True
+            # the least recently used thumbnails are dropped
+            while len(self.__images) > self.max_images:
+                self.__images.popitem(last=False)
+
+        if updated and self.on_update is not None:
+            self.on_update()
+        if self.__requested:
+            self.__poll_id = self.master.after(self.POLL_MS, self.__poll)
@@ -0,0 +1,302 @@
+# -------------------------------------------------------------------------------------------------------------------- #
+# virtual_listbox.py: includes class VirtualListbox                                                                    #
+# -------------------------------------------------------------------------------------------------------------------- #
+from tkinter import Frame, Label, Scrollbar, PhotoImage
+from tkinter.font import Font
+
+
+class VirtualListbox(Frame):
+    """
+    Inherits from parent class Frame and shows a list of any size with a fixed number of row labels
+    Only the visible rows exist as widgets, their text is requested from the 'row_text' function whenever the list is
+    scrolled, so scrolling and filling the list take the same time for 10 or 100k rows
+    Optionally, every row shows an image at its left side, requested from the 'row_image' function
+
+    ...
+
+    Attributes:
+    -----------
+        row_text (Callable[[int], str]):
+            function returning the text of a row by its index
+
+        row_image (Callable[[int], PhotoImage] | None):
+            function returning the image of a row by its index (None for rows without images)
+
+        blank_image (PhotoImage | None):
+            image of the empty rows (keeps the height of the rows when they have images)
+
+        rows (list[Label]):
+            labels of the visible rows
+
+        scrollbar (Scrollbar):
+            scrollbar of the list
+
+        size (int):
+            number of rows in the list
+
+        offset (int):
+            index of the first visible row
+
+        selected (int | None):
+            index of the selected row (None if no row is selected)
+
+        bg (str):
+            background colour of the rows
+
+    Methods:
+    --------
+        set_size(self, size: int) -> None:
+            sets the number of rows (e.g. while a file is being loaded)
+
+        curselection(self) -> tuple:
+            returns the selected index in a tuple (same as Listbox.curselection)
+
+        select(self, index: int) -> None:
+            selects a row and scrolls it into view
+
+        see(self, index: int) -> None:
+            scrolls the list so that a row is visible
+
+        yview(self, *args) -> None:
+            scrolls the list (command of the scrollbar)
+
+        render(self) -> None:
+            shows the text (and images) of the visible rows
+
+        row_clicked(self, i: int) -> None:
+            selects the row shown by label 'i'
+
+        mouse_wheel(self, event) -> None:
+            scrolls the list with the mouse wheel
+
+        key_pressed(self, event) -> None:
+            moves the selection with the arrow/page keys
+    """
+    def __init__(self, master, row_text, width: int = 60, height: int = 20, bg: str = "#f7ffde",
+                 font: tuple = ("consolas", 10), row_image=None, image_size: int = 0):
+        """
+        Initializes the list
+
+        ...
+
+        Parameters:
+        -----------
+            master (Frame):
+                master of the list
+
+            row_text (Callable[[int], str]):
+                function returning the text of a row by its index
+
+            width (int) default=60:
+                width of the rows in characters
+
+            height (int) default=20:
+                number of visible rows
+
+            bg (str) default="#f7ffde":
+                background colour of the rows
+
+            font (tuple) default=("consolas", 10):
+                font of the rows
+
+            row_image (Callable[[int], PhotoImage] | None) default=None:
+                function returning the image of a row by its index
+
+            image_size (int) default=0:
+                width/height of the row images in pixels
+        """
+        # initialization of parent class (Frame)
+        super().__init__(master=master, bg=bg, bd=1, relief="sunken", takefocus=True)
+        self.row_text = row_text
+        self.row_image = row_image
+        self.blank_image = None
+        self.bg = bg
+
+        self.size = 0
+        self.offset = 0
+        self.selected = None
+
+        # visible rows and scrollbar -----------------------------------------------------------------------------------
+        self.rows = []
+        if row_image is not None:
+            # labels with images are measured in pixels, so the width of the text is kept by the column
+            self.blank_image = PhotoImage(master=self, width=image_size, height=image_size)
+            self.grid_columnconfigure(0, minsize=Font(root=self, font=font).measure("0" * width) + image_size + 8)
+        for i in range(height):
+            if row_image is None:
+                row = Label(self, bg=bg, font=font, width=width, anchor="w", padx=2, pady=0)
+            else:
+                row = Label(self, bg=bg, font=font, anchor="w", padx=2, pady=1, image=self.blank_image,
+                            compound="left")
+            row.grid(row=i, column=0, sticky="ew")
+            row.bind("<Button-1>", lambda event, i_=i: self.row_clicked(i_))
+            self.rows.append(row)
+        self.scrollbar = Scrollbar(master=self, command=self.yview)
+        self.scrollbar.grid(row=0, column=1, rowspan=height, sticky="ns")
+
+        # mouse wheel (Windows) and mouse buttons 4/5 (Linux) scroll the list, keys move the selection
+        for widget in [self] + self.rows:
+            widget.bind("<MouseWheel>", self.mouse_wheel)
+            widget.bind("<Button-4>", self.mouse_wheel)
+            widget.bind("<Button-5>", self.mouse_wheel)
+        self.bind("<Key>", self.key_pressed)
+
+        self.render()
+
+    def set_size(self, size: int) -> None:
+        """
+        Sets the number of rows of the list (rows can be added while a file is being loaded)
+
+        ...
+
+        Parameters:
+        -----------
+            size (int):
+                number of rows
+        """
+        self.size = size
+        if self.selected is not None and self.selected >= size:
+            self.selected = None
+        self.offset = max(0, min(self.offset, size - len(self.rows)))
+        self.render()
+
+    def curselection(self) -> tuple:
+        """
+        Returns the index of the selected row in a tuple (empty tuple if no row is selected), like Listbox.curselection
+
+        ...
+
+        Returns:
+        --------
+            (tuple):
+                index of the selected row
+        """
+        return () if self.selected is None else (self.selected,)
+
+    def select(self, index: int) -> None:
+        """
+        Selects a row, scrolls it into view and generates the <<ListboxSelect>> event
+
+        ...
+
+        Parameters:
+        -----------
+            index (int):
+                index of the row
+        """
+        if not 0 <= index < self.size:
+            return
+        self.selected = index
+        self.see(index)
+        self.render()
+        self.event_generate("<<ListboxSelect>>")
+
+    def see(self, index: int) -> None:
+        """
+        Scrolls the list so that a row is visible
+
+        ...
+
+        Parameters:
+        -----------
+            index (int):
+                index of the row
+        """
+        if index < self.offset:
+            self.offset = index
+        elif index >= self.offset + len(self.rows):
+            self.offset = index - len(self.rows) + 1
+        self.render()
+
+    def yview(self, *args) -> None:
+        """
+        Scrolls the list (command of the scrollbar: 'moveto fraction' or 'scroll number units/pages')
+
+        ...
+
+        Parameters:
+        -----------
+            *args (str):
+                arguments given by the scrollbar
+        """
+        if args[0] == "moveto":
+            offset = round(float(args[1]) * self.size)
+        else:
+            step = int(args[1]) * (len(self.rows) if args[2] == "pages" else 1)
+            offset = self.offset + step
+        self.offset = max(0, min(offset, self.size - len(self.rows)))
+        self.render()
+
+    def render(self) -> None:
+        """
+        Shows the text (and images) of the visible rows and updates the scrollbar
+        """
+        for i, row in enumerate(self.rows):
+            index = self.offset + i
+            if index < self.size:
+                text = self.row_text(index)
+            else:
+                text = ""
+            colour = "#a6d1ff" if index == self.selected else self.bg
+            if row.cget("text") != text or row.cget("bg") != colour:
+                row.config(text=text, bg=colour)
+            if self.row_image is not None:
+                image = self.row_image(index) if index < self.size else self.blank_image
+                if row.cget("image") != str(image):
+                    row.config(image=image)
+
+        # visible part of the list as fractions
+        if self.size:
+            self.scrollbar.set(self.offset / self.size, min(1.0, (self.offset + len(self.rows)) / self.size))
+        else:
+            self.scrollbar.set(0.0, 1.0)
+
+    def row_clicked(self, i: int) -> None:
+        """
+        Selects the row shown by label 'i'
+
+        ...
+
+        Parameters:
+        -----------
+            i (int):
+                index of the label
+        """
+        self.focus_set()
+        self.select(self.offset + i)
+
+    def mouse_wheel(self, event) -> None:
+        """
+        Scrolls the list with the mouse wheel
+
+        ...
+
+        Parameters:
+        -----------
+            event (<MouseWheel> | <Button-4> | <Button-5>):
+                mouse wheel event
+        """
+        if event.num == 4 or event.delta > 0:
+            self.yview("scroll", -3, "units")
+        else:
+            self.yview("scroll", 3, "units")
+
+    def key_pressed(self, event) -> None:
+        """
+        Moves the selection with the Up/Down/Prior/Next/Home/End keys
+
+        ...
+
+        Parameters:
+        -----------
+            event (<Key>):
+                key event
+        """
+        current = -1 if self.selected is None else self.selected
+        steps = {"Up": -1, "Down": 1, "Prior": -len(self.rows), "Next": len(self.rows)}
+        if event.keysym in steps:
+            self.select(max(0, min(current + steps[event.keysym], self.size - 1)))
+        elif event.keysym == "Home":
+            self.select(0)
+        elif event.keysym == "End":
+            self.select(self.size - 1)